@@ -5,7 +5,6 @@ Creates and configures the Flask application
 
 import os
 from flask import Flask
-from flask_mail import Mail
 from flask_migrate import Migrate
 from flask_babel import Babel
 from flask_login import LoginManager
@@ -53,6 +52,18 @@ def create_app(config_name=None):
     # Register blueprints
     register_blueprints(app)
     
+    # Content-hashed static URLs, served with far-future caching (after blueprints, for their static folders)
+    from utils.assets import init_assets
+    init_assets(app)
+    
+    # Serve the .br/.gz variants written by build_assets.py when the client accepts them
+    from utils.asset_pipeline import init_precompressed
+    init_precompressed(app)
+    
+    # gzip/brotli for dynamic HTML and JSON responses (utils/compression.py)
+    from utils.compression import init_compression
+    init_compression(app)
+    
     # Register error handlers
     register_error_handlers(app)
     
@@ -62,6 +73,9 @@ def create_app(config_name=None):
     # Initialize database
     initialize_database(app)
     
+    # The outbox worker is started by the server entry points (flask_app.py), not here, so
+    # migrations and maintenance scripts that build the app never send emails or SMS
+    
     return app
 
 
@@ -71,14 +85,23 @@ def initialize_extensions(app):
     # Database
     db.init_app(app)
     
+    # Keep slot_occupancy in step with booking writes
+    from utils.slot_occupancy import init_slot_occupancy
+    init_slot_occupancy()
+    
+    # Bump content version counters on model writes
+    from utils.content_versions import init_content_versions
+    init_content_versions()
+    
     # Migration
     migrate = Migrate(app, db)
     
     # Babel for internationalization
     babel = Babel(app)
     
-    # Mail
-    mail = Mail(app)
+    # Mail (pooled SMTP sessions)
+    from utils.mail_pool import PooledMail
+    mail = PooledMail(app)
     app.mail = mail  # Make mail available globally for blueprints
     
     # Login Manager
@@ -166,7 +189,15 @@ def register_error_handlers(app):
 
 def register_template_filters(app):
     """Register custom template filters"""
-    pass
+    from utils.asset_pipeline import bundle_urls
+    from utils.images import image_sources, srcset
+    
+    # Responsive image helpers (utils/images.py)
+    app.add_template_global(srcset)
+    app.add_template_global(image_sources)
+    
+    # Minified CSS/JS bundles, falling back to the source files until they're built (utils/asset_pipeline.py)
+    app.add_template_global(bundle_urls)
 
 
 def initialize_database(app):
@@ -183,6 +214,9 @@ def initialize_database(app):
             # Check and fix database schema if needed
             check_database_schema()
             
+            # Backfill slot occupancy for databases created before the table existed
+            backfill_slot_occupancy()
+            
             # Insert default data
             insert_default_data()
             
@@ -205,7 +239,7 @@ def check_database_schema():
     """Check and fix database schema issues"""
     
     from sqlalchemy import inspect
-    from db.models import Booking
+    from db.models import Booking, Testimonial
     
     inspector = inspect(db.engine)
     if 'booking' in inspector.get_table_names():
@@ -217,6 +251,32 @@ def check_database_schema():
             db.drop_all()
             db.create_all()
             print("✅ Database recreated with service_id column")
+        elif 'updated_at' not in column_names:
+            print("⚠️ Missing booking.updated_at column. Adding it...")
+            with db.engine.begin() as connection:
+                connection.exec_driver_sql('ALTER TABLE booking ADD COLUMN updated_at DATETIME')
+                connection.exec_driver_sql('UPDATE booking SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)')
+            print("✅ booking.updated_at column added")
+        
+        # create_all() skips indexes on tables that already exist
+        for index in Booking.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
+    
+    if 'testimonials' in inspector.get_table_names():
+        for index in Testimonial.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
+
+
+def backfill_slot_occupancy():
+    """Populate slot_occupancy from existing bookings if it is still empty"""
+    
+    from db.models import Booking, SlotOccupancy
+    from utils.slot_occupancy import rebuild_slot_occupancy, INACTIVE_STATUSES
+    
+    if not SlotOccupancy.query.first() and Booking.query.filter(Booking.status.notin_(INACTIVE_STATUSES)).first():
+        slot_count = rebuild_slot_occupancy()
+        db.session.commit()
+        print(f"✅ Slot occupancy backfilled ({slot_count} slots)")
 
 
 def insert_default_data():
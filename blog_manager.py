@@ -9,7 +9,9 @@ import os
 from datetime import datetime
 from typing import Dict, List, Optional
 
-BLOG_DATA_FILE = 'blog_data.json'
+from config import Config
+
+BLOG_DATA_FILE = Config.BLOG_DATA_FILE  # Same file the blog reads (BLOG_DATA_FILE environment variable)
 
 def load_blog_data() -> Dict:
     """Load blog posts from JSON file"""
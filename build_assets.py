@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Static Asset Build
+Minifies each page's CSS/JS into a bundle under static/dist/, writes .gz (and, with the
+Brotli package installed, .br) variants of every stylesheet and script, then fingerprints
+every static file (app and blueprint static folders) into the asset manifest, so a fresh
+process serves hashed URLs without hashing files on first use.
+Run after each deploy; files changed later are re-hashed automatically.
+
+Usage:
+    python build_assets.py
+    python build_assets.py --no-bundles     # Precompress and fingerprint only
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app_factory import create_app
+from utils.asset_pipeline import brotli, build_bundles, precompress_folder
+from utils.assets import build_asset_manifest, manifest_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bundle, precompress and fingerprint static assets')
+    parser.add_argument('--no-bundles', action='store_true', help="Don't write the minified bundles")
+    args = parser.parse_args()
+
+    app = create_app()
+
+    if not args.no_bundles:
+        for name, (source_size, bundle_size) in build_bundles(app.static_folder).items():
+            print(f"📦 {name}: {source_size:,} -> {bundle_size:,} bytes")
+
+    if not brotli:
+        print("⚠️ Brotli not installed, writing gzip variants only (pip install Brotli)")
+    folders = {app.static_folder} | {bp.static_folder for bp in app.blueprints.values() if bp.static_folder}
+    count = sum(precompress_folder(folder) for folder in sorted(f for f in folders if f and os.path.isdir(f)))
+    print(f"🗜️ Precompressed {count} files")
+
+    # Last, so the manifest covers the bundles and variants just written
+    count = build_asset_manifest(app)
+    print(f"✅ Fingerprinted {count} static files -> {manifest_path(app)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
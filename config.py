@@ -33,6 +33,8 @@ class Config:
     
     # Database
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Wait for SQLite's write lock instead of failing when bookings arrive together
+    SQLALCHEMY_ENGINE_OPTIONS = {'connect_args': {'timeout': 30}}
     
     # Session
     SESSION_COOKIE_HTTPONLY = True
@@ -48,6 +50,34 @@ class Config:
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER', 'noreply@holisticweb.com')
     MAIL_TIMEOUT = 10
+    MAIL_POOL_SIZE = int(os.environ.get('MAIL_POOL_SIZE', 2))  # Persistent SMTP sessions (utils/mail_pool.py)
+    MAIL_POOL_MAX_IDLE_SECONDS = 120
+    
+    # Notification outbox (utils/notifications.py)
+    NOTIFICATION_WORKER_ENABLED = os.environ.get('NOTIFICATION_WORKER_ENABLED', 'True').lower() == 'true'
+    NOTIFICATION_WORKERS = int(os.environ.get('NOTIFICATION_WORKERS', 4))
+    NOTIFICATION_MAX_ATTEMPTS = 5
+    NOTIFICATION_RETRY_BASE_SECONDS = 30
+    
+    # SMS reminder stages in minutes before the appointment (utils/reminders.py)
+    REMINDER_OFFSETS_MINUTES = [int(m) for m in os.environ.get('REMINDER_OFFSETS_MINUTES', '1440,120,30').split(',')]
+    
+    # Blog post store (utils/blog_store.py): 'json' reads BLOG_DATA_FILE, 'sqlite' reads BLOG_DB_FILE
+    BLOG_STORE = os.environ.get('BLOG_STORE', 'json')
+    BLOG_DATA_FILE = os.environ.get('BLOG_DATA_FILE', 'blog_data.json')
+    BLOG_DB_FILE = os.environ.get('BLOG_DB_FILE', 'blog.sqlite')
+    
+    # Static asset fingerprints (utils/assets.py); built by build_assets.py, defaults to instance/asset_manifest.json
+    ASSET_MANIFEST = os.environ.get('ASSET_MANIFEST')
+    
+    # Serve the minified bundles from static/dist/ once build_assets.py has written them (utils/asset_pipeline.py)
+    ASSET_BUNDLES = os.environ.get('ASSET_BUNDLES', 'true').lower() == 'true'
+    
+    # Response compression middleware (utils/compression.py): smaller bodies are sent as-is,
+    # compressed bodies with a strong ETag are cached (most recently used entries)
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))
+    COMPRESS_CACHE_ENTRIES = int(os.environ.get('COMPRESS_CACHE_ENTRIES', 256))
     
     # Facebook Configuration - Load from environment variables or creds.json
     @property
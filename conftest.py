@@ -0,0 +1,96 @@
+"""
+Shared pytest fixtures
+Builds a minimal app around the booking routes with a throwaway SQLite database
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Flask app with the booking blueprint and a fresh file-backed database"""
+    from flask import Flask
+    from utils.mail_pool import PooledMail
+    from db import db
+    from routes.booking import booking_bp
+    from utils.slot_occupancy import init_slot_occupancy
+    from utils.content_versions import init_content_versions
+    from utils.asset_pipeline import bundle_urls
+
+    app = Flask(__name__, template_folder='templates')
+    app.config.update(
+        TESTING=True,
+        SECRET_KEY='test',
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'test.sqlite'}",
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        SQLALCHEMY_ENGINE_OPTIONS={'connect_args': {'timeout': 30}},
+    )
+    db.init_app(app)
+    init_slot_occupancy()
+    init_content_versions()
+    app.mail = PooledMail(app)
+    app.register_blueprint(booking_bp)
+    app.add_template_global(bundle_urls)
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Test client for the app fixture"""
+    return app.test_client()
+
+
+@pytest.fixture
+def record_queries(app):
+    """
+    Context manager factory collecting every SQL statement the app sends
+
+    Yields a list of (statement, parameters) tuples, filled while the block runs.
+    """
+    from sqlalchemy import event
+    from db import db
+
+    @contextmanager
+    def recorder():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+    return recorder
+
+
+@pytest.fixture
+def assert_num_queries(record_queries):
+    """
+    Context manager factory asserting a block sends exactly `expected` SQL statements
+
+    Usage: with assert_num_queries(1): client.get(...)
+    """
+    @contextmanager
+    def checker(expected):
+        with record_queries() as statements:
+            yield statements
+        assert len(statements) == expected, (
+            f"expected {expected} queries, got {len(statements)}:\n" +
+            "\n".join(statement for statement, _ in statements)
+        )
+
+    return checker
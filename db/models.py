@@ -71,16 +71,24 @@ class GeneratedContent(db.Model):
         return f"<GeneratedContent id={self.id} topic={self.topic}>"
 
 class Booking(db.Model):
+    __table_args__ = (
+        db.Index('ix_booking_start_time_end_time', 'start_time', 'end_time'),  # Slot, range and calendar window scans
+        db.Index('ix_booking_email_start_time', 'email', 'start_time'),  # My-bookings search, newest first
+        db.Index('ix_booking_service_id_start_time', 'service_id', 'start_time'),  # Bookings per service
+        db.Index('ix_booking_status_start_time', 'status', 'start_time'),  # Bookings in one status by date
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120), nullable=False)
     phone_number = db.Column(db.String(20), nullable=True)  # Added for SMS reminders
     start_time = db.Column(db.DateTime, nullable=False)
     end_time = db.Column(db.DateTime, nullable=False)
-    status = db.Column(db.String(20), default='pending')  # pending, confirmed, cancelled
+    status = db.Column(db.String(20), default='pending')  # pending, confirmed, cancelled, waitlist
     admin_notes = db.Column(db.String(255), nullable=True)
     num_people = db.Column(db.Integer, default=1, nullable=False)  # Number of people in the booking (1-10)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)  # Last change to this booking
 
     def __repr__(self):
         return f"<Booking {self.user_name} ({self.num_people} people) {self.start_time}>"
@@ -88,6 +96,73 @@ class Booking(db.Model):
     service = db.relationship("Service", backref="bookings")
     
 
+class SlotOccupancy(db.Model):
+    """Materialized people/booking totals per 30-minute slot, kept in sync with Booking writes"""
+    __tablename__ = "slot_occupancy"
+
+    slot_start = db.Column(db.DateTime, primary_key=True)
+    total_people = db.Column(db.Integer, nullable=False, default=0)
+    booking_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<SlotOccupancy {self.slot_start} ({self.total_people} people)>"
+
+
+class ContentVersion(db.Model):
+    """Change counter per content type (e.g. 'bookings'), bumped in the same transaction as the change"""
+    __tablename__ = "content_versions"
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<ContentVersion {self.name} v{self.version}>"
+
+
+class NotificationJob(db.Model):
+    """Outbound email/SMS waiting in the outbox; drained by utils.notifications"""
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        db.Index('ix_notification_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    dedup_key = db.Column(db.String(255), nullable=False, unique=True)  # Same key is only ever enqueued once
+    channel = db.Column(db.String(10), nullable=False)  # email or sms
+    payload = db.Column(db.Text, nullable=False)  # JSON message fields for the channel
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, sending, sent, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_until = db.Column(db.DateTime, nullable=True)  # Claim expiry for jobs being sent
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<NotificationJob {self.dedup_key} ({self.status})>"
+
+
+class ImageDerivative(db.Model):
+    """A resized, re-encoded copy of an uploaded image; generated by utils.images"""
+    __tablename__ = "image_derivatives"
+    __table_args__ = (
+        db.UniqueConstraint('source_path', 'format', 'width', name='uq_image_derivatives_source_format_width'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    source_path = db.Column(db.String(255), nullable=False)  # Original, relative to the static folder
+    format = db.Column(db.String(10), nullable=False)  # avif, webp or jpeg
+    width = db.Column(db.Integer, nullable=False)
+    height = db.Column(db.Integer, nullable=False)
+    path = db.Column(db.String(255), nullable=False)  # Derivative, relative to the static folder
+    file_size = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ImageDerivative {self.path} ({self.width}x{self.height})>"
+
+
 class Service(db.Model):
     __tablename__ = "services"
 
@@ -137,6 +212,10 @@ class EmailTemplate(db.Model):
 
 class Testimonial(db.Model):
     __tablename__ = "testimonials"
+    __table_args__ = (
+        db.Index('ix_testimonials_approved_featured_created_at', 'is_approved', 'is_featured', 'created_at'),  # Featured pages
+        db.Index('ix_testimonials_approved_created_at', 'is_approved', 'created_at'),  # All-published pages
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     client_name = db.Column(db.String(100), nullable=False)
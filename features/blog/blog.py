@@ -3,11 +3,12 @@ Standalone Blog Feature
 Professional AI blog system with human-focused design
 """
 
-from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for, current_app
+from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for, current_app, has_app_context
 from datetime import datetime, timedelta
 import os
 import json
 from werkzeug.utils import secure_filename
+from utils.blog_store import create_blog_store
 
 # Create blueprint with custom template and static folders
 blog_bp = Blueprint(
@@ -19,7 +20,7 @@ blog_bp = Blueprint(
     static_url_path='/blog/static'
 )
 
-# Mock data storage (replace with database in production)
+# Mock data storage (replace with database in production); the BLOG_DATA_FILE setting overrides it
 BLOG_DATA_FILE = 'blog_data.json'
 
 # Blog categories with descriptions
@@ -134,11 +135,22 @@ BLOG_CATEGORIES = {
     }
 }
 
+def blog_data_file():
+    """Path of the JSON post file: the app's BLOG_DATA_FILE setting, so readers and writers agree"""
+    if has_app_context():
+        return current_app.config.get('BLOG_DATA_FILE', BLOG_DATA_FILE)
+    return os.environ.get('BLOG_DATA_FILE', BLOG_DATA_FILE)
+
 def load_blog_data():
     """Load blog posts from JSON file"""
-    if os.path.exists(BLOG_DATA_FILE):
-        with open(BLOG_DATA_FILE, 'r') as f:
+    path = blog_data_file()
+    if os.path.exists(path):
+        with open(path, 'r') as f:
             return json.load(f)
+    return default_blog_data()
+
+def default_blog_data():
+    """Sample posts served until a blog_data.json exists"""
     return {
         "posts": [
             {
@@ -277,61 +289,48 @@ def load_blog_data():
 
 def save_blog_data(data):
     """Save blog posts to JSON file"""
-    with open(BLOG_DATA_FILE, 'w') as f:
+    with open(blog_data_file(), 'w') as f:
         json.dump(data, f, indent=2)
 
+def get_blog_store():
+    """This app's indexed post store (see utils/blog_store.py), created on first use"""
+    store = current_app.extensions.get('blog_store')
+    if store is None:
+        config = {**current_app.config, 'BLOG_DATA_FILE': blog_data_file()}
+        store = current_app.extensions.setdefault('blog_store', create_blog_store(config, default_blog_data))
+    return store
+
 @blog_bp.route('/')
 def index():
     """Main blog page with all published posts"""
-    data = load_blog_data()
-    published_posts = [post for post in data['posts'] if post.get('published', False)]
-    
-    # Sort by published date (newest first)
-    published_posts.sort(key=lambda x: x['published_date'], reverse=True)
-    
-    return render_template('blog.html', posts=published_posts, categories=BLOG_CATEGORIES)
+    blog = get_blog_store().get_index()
+    return render_template('blog.html', posts=blog.published, categories=BLOG_CATEGORIES)
 
 @blog_bp.route('/post/<slug>')
 def post_detail(slug):
     """Individual blog post page"""
-    data = load_blog_data()
-    post = next((p for p in data['posts'] if p['slug'] == slug and p.get('published', False)), None)
+    blog = get_blog_store().get_index()
+    post = blog.get_post(slug)
     
     if not post:
         flash("Blog post not found.", "error")
         return redirect(url_for('blog.index'))
     
-    # Get related posts (same tags, excluding current post)
-    related_posts = []
-    for p in data['posts']:
-        if p['id'] != post['id'] and p.get('published', False):
-            common_tags = set(p['tags']) & set(post['tags'])
-            if common_tags:
-                related_posts.append(p)
-    
-    # Limit to 3 related posts
-    related_posts = related_posts[:3]
+    # Top 3 by tag overlap and category, precomputed when the posts were indexed
+    related_posts = blog.related_posts(post)
     
     return render_template('blog_post.html', post=post, related_posts=related_posts, categories=BLOG_CATEGORIES)
 
 @blog_bp.route('/category/<category>')
 def posts_by_category(category):
     """Posts filtered by category"""
-    data = load_blog_data()
-    
     # Get category info
     category_info = BLOG_CATEGORIES.get(category)
     if not category_info:
         flash("Category not found.", "error")
         return redirect(url_for('blog.index'))
     
-    # Filter posts by category
-    category_posts = [
-        post for post in data['posts'] 
-        if post.get('category') == category and post.get('published', False)
-    ]
-    
-    category_posts.sort(key=lambda x: x['published_date'], reverse=True)
+    category_posts = get_blog_store().get_index().posts_in_category(category)
     
     return render_template('blog_category.html', 
                          posts=category_posts, 
@@ -342,13 +341,7 @@ def posts_by_category(category):
 @blog_bp.route('/tag/<tag>')
 def posts_by_tag(tag):
     """Posts filtered by tag"""
-    data = load_blog_data()
-    tagged_posts = [
-        post for post in data['posts'] 
-        if tag.lower() in [t.lower() for t in post['tags']] and post.get('published', False)
-    ]
-    
-    tagged_posts.sort(key=lambda x: x['published_date'], reverse=True)
+    tagged_posts = get_blog_store().get_index().posts_tagged(tag)
     
     return render_template('blog_tag.html', posts=tagged_posts, tag=tag, categories=BLOG_CATEGORIES)
 
@@ -360,42 +353,16 @@ def search():
     if not query:
         return redirect(url_for('blog.index'))
     
-    data = load_blog_data()
-    results = []
-    
-    for post in data['posts']:
-        if post.get('published', False):
-            # Search in title, excerpt, and content
-            searchable_text = f"{post['title']} {post['excerpt']} {post['content']}".lower()
-            if query.lower() in searchable_text:
-                results.append(post)
-    
-    results.sort(key=lambda x: x['published_date'], reverse=True)
+    # Ranked full-text search over title, tags, excerpt and content
+    results = get_blog_store().get_index().search(query)
     
     return render_template('blog_search.html', posts=results, query=query, categories=BLOG_CATEGORIES)
 
 @blog_bp.route('/api/posts')
 def api_posts():
     """API endpoint for blog posts"""
-    data = load_blog_data()
-    published_posts = [post for post in data['posts'] if post.get('published', False)]
-    
-    # Remove content for API response (just metadata)
-    api_posts = []
-    for post in published_posts:
-        api_post = {
-            'id': post['id'],
-            'title': post['title'],
-            'slug': post['slug'],
-            'excerpt': post['excerpt'],
-            'author': post['author'],
-            'published_date': post['published_date'],
-            'tags': post['tags'],
-            'read_time': post['read_time']
-        }
-        api_posts.append(api_post)
-    
-    return jsonify({'posts': api_posts})
+    # Metadata only (no content), prepared when the posts were indexed
+    return jsonify({'posts': list(get_blog_store().get_index().api_posts)})
 
 def get_feature_info():
     """Return information about this feature"""
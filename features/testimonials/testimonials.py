@@ -8,6 +8,7 @@ from flask_mail import Message
 from flask_login import current_user
 from db import db
 from db.models import Testimonial
+from utils.testimonials import get_testimonial_page, more_testimonials_response, testimonial_page_response
 from functools import wraps
 from datetime import datetime
 
@@ -76,42 +77,21 @@ def submit_testimonial():
 
 # API: Get approved testimonials
 @testimony_bp.route('/api/approved')
-def get_approved_testimonials():
-    """API endpoint to get approved testimonials"""
-    testimonials = Testimonial.query.filter_by(is_approved=True).order_by(Testimonial.created_at.desc()).all()
-    
-    testimonials_data = []
-    for t in testimonials:
-        testimonials_data.append({
-            'id': t.id,
-            'client_name': t.client_name,
-            'client_title': t.client_title or '',
-            'testimonial_text': t.testimonial_text,
-            'rating': t.rating,
-            'is_featured': t.is_featured,
-            'created_at': t.created_at.strftime('%Y-%m-%d')
-        })
-    
-    return jsonify(testimonials_data)
+def get_approved_testimonials_api():
+    """API endpoint to get approved testimonials (paginated when ?limit= or ?after= is given)"""
+    return testimonial_page_response()
 
 # API: Get featured testimonials
 @testimony_bp.route('/api/featured')
-def get_featured_testimonials():
-    """API endpoint to get featured testimonials only"""
-    testimonials = Testimonial.query.filter_by(is_approved=True, is_featured=True).order_by(Testimonial.created_at.desc()).all()
-    
-    testimonials_data = []
-    for t in testimonials:
-        testimonials_data.append({
-            'id': t.id,
-            'client_name': t.client_name,
-            'client_title': t.client_title or '',
-            'testimonial_text': t.testimonial_text,
-            'rating': t.rating,
-            'created_at': t.created_at.strftime('%Y-%m-%d')
-        })
-    
-    return jsonify(testimonials_data)
+def get_featured_testimonials_api():
+    """API endpoint to get featured testimonials only (paginated when ?limit= or ?after= is given)"""
+    return testimonial_page_response(featured_only=True)
+
+# API: Next carousel page
+@testimony_bp.route('/api/more')
+def more_testimonials():
+    """Lazy-loading endpoint for the home page carousel"""
+    return more_testimonials_response()
 
 # Admin: List all testimonials
 @testimony_bp.route('/admin')
@@ -192,13 +172,13 @@ Status: {'Approved' if testimonial.is_approved else 'Pending Approval'}
     except Exception as e:
         current_app.logger.error(f"Failed to send admin notification: {e}")
 
-def get_approved_testimonials():
-    """Helper function to get approved testimonials for other parts of the app"""
-    return Testimonial.query.filter_by(is_approved=True).order_by(Testimonial.created_at.desc()).all()
+def get_approved_testimonials(limit=None):
+    """Helper function to get approved testimonials (all, or the newest `limit`) for other parts of the app"""
+    return get_testimonial_page(limit=limit)[0]
 
-def get_featured_testimonials():
-    """Helper function to get featured testimonials for other parts of the app"""
-    return Testimonial.query.filter_by(is_approved=True, is_featured=True).order_by(Testimonial.created_at.desc()).all()
+def get_featured_testimonials(limit=None):
+    """Helper function to get featured testimonials (all, or the newest `limit`) for other parts of the app"""
+    return get_testimonial_page(limit=limit, featured_only=True)[0]
 
 def get_feature_info():
     """Return information about this feature"""
@@ -211,6 +191,7 @@ def get_feature_info():
             "/testimonials/submit",
             "/testimonials/api/approved",
             "/testimonials/api/featured",
+            "/testimonials/api/more",
             "/testimonials/admin",
             "/testimonials/admin/<id>/approve",
             "/testimonials/admin/<id>/feature",
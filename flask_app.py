@@ -8,6 +8,7 @@ for better organization and testing capabilities.
 
 import os
 from app_factory import create_app
+from utils.notifications import init_notifications
 from utils.scheduler import init_scheduler
 
 
@@ -16,6 +17,9 @@ app = create_app()
 
 # Initialize SMS reminder scheduler
 if __name__ == '__main__':
+    # Start delivering queued emails and SMS (including any left from a previous run)
+    init_notifications(app)
+    
     with app.app_context():
         # Initialize SMS reminder scheduler
         try:
@@ -0,0 +1,40 @@
+"""Add composite booking indexes and content_versions table
+
+Revision ID: add_booking_indexes
+Revises: add_booking_updated_at
+Create Date: 2025-10-22 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_booking_indexes'
+down_revision = 'add_booking_updated_at'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('booking', schema=None) as batch_op:
+        batch_op.create_index('ix_booking_email_start_time', ['email', 'start_time'], unique=False)
+        batch_op.create_index('ix_booking_service_id_start_time', ['service_id', 'start_time'], unique=False)
+        batch_op.create_index('ix_booking_status_start_time', ['status', 'start_time'], unique=False)
+
+    op.create_table(
+        'content_versions',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('content_versions')
+
+    with op.batch_alter_table('booking', schema=None) as batch_op:
+        batch_op.drop_index('ix_booking_status_start_time')
+        batch_op.drop_index('ix_booking_service_id_start_time')
+        batch_op.drop_index('ix_booking_email_start_time')
@@ -0,0 +1,33 @@
+"""Add updated_at and time range index to bookings
+
+Revision ID: add_booking_updated_at
+Revises: add_slot_occupancy
+Create Date: 2025-10-21 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_booking_updated_at'
+down_revision = 'add_slot_occupancy'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('booking', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_booking_updated_at', ['updated_at'], unique=False)
+        batch_op.create_index('ix_booking_start_time_end_time', ['start_time', 'end_time'], unique=False)
+
+    # Creation time is the best change timestamp available for existing rows
+    op.execute('UPDATE booking SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)')
+
+
+def downgrade():
+    with op.batch_alter_table('booking', schema=None) as batch_op:
+        batch_op.drop_index('ix_booking_start_time_end_time')
+        batch_op.drop_index('ix_booking_updated_at')
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,36 @@
+"""Add image_derivatives table
+
+Revision ID: add_image_derivatives
+Revises: add_testimonial_indexes
+Create Date: 2025-10-25 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_image_derivatives'
+down_revision = 'add_testimonial_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'image_derivatives',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('source_path', sa.String(length=255), nullable=False),
+        sa.Column('format', sa.String(length=10), nullable=False),
+        sa.Column('width', sa.Integer(), nullable=False),
+        sa.Column('height', sa.Integer(), nullable=False),
+        sa.Column('path', sa.String(length=255), nullable=False),
+        sa.Column('file_size', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('source_path', 'format', 'width', name='uq_image_derivatives_source_format_width')
+    )
+
+
+def downgrade():
+    op.drop_table('image_derivatives')
@@ -0,0 +1,63 @@
+"""Add slot_occupancy table
+
+Revision ID: add_slot_occupancy
+Revises: 0eecf507f274
+Create Date: 2025-10-20 09:00:00.000000
+
+"""
+from collections import Counter
+from datetime import timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_slot_occupancy'
+down_revision = '0eecf507f274'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    slot_occupancy = op.create_table(
+        'slot_occupancy',
+        sa.Column('slot_start', sa.DateTime(), nullable=False),
+        sa.Column('total_people', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('booking_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('slot_start')
+    )
+
+    # Backfill from existing non-cancelled bookings on the 30-minute grid
+    booking = sa.table(
+        'booking',
+        sa.column('start_time', sa.DateTime()),
+        sa.column('end_time', sa.DateTime()),
+        sa.column('num_people', sa.Integer()),
+        sa.column('status', sa.String())
+    )
+    rows = op.get_bind().execute(
+        sa.select(booking.c.start_time, booking.c.end_time, booking.c.num_people)
+        .where(booking.c.status != 'cancelled')
+    ).fetchall()
+
+    people = Counter()
+    counts = Counter()
+    for start_time, end_time, num_people in rows:
+        slot = start_time.replace(minute=start_time.minute - start_time.minute % 30, second=0, microsecond=0)
+        if slot < start_time:
+            slot += timedelta(minutes=30)
+        while slot < end_time:
+            people[slot] += num_people
+            counts[slot] += 1
+            slot += timedelta(minutes=30)
+
+    if counts:
+        op.bulk_insert(slot_occupancy, [
+            {'slot_start': slot, 'total_people': people[slot], 'booking_count': counts[slot]}
+            for slot in counts
+        ])
+
+
+def downgrade():
+    op.drop_table('slot_occupancy')
@@ -0,0 +1,27 @@
+"""Add testimonial keyset pagination indexes
+
+Revision ID: add_testimonial_indexes
+Revises: add_notification_outbox
+Create Date: 2025-10-24 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_testimonial_indexes'
+down_revision = 'add_notification_outbox'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('testimonials', schema=None) as batch_op:
+        batch_op.create_index('ix_testimonials_approved_featured_created_at', ['is_approved', 'is_featured', 'created_at'], unique=False)
+        batch_op.create_index('ix_testimonials_approved_created_at', ['is_approved', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('testimonials', schema=None) as batch_op:
+        batch_op.drop_index('ix_testimonials_approved_created_at')
+        batch_op.drop_index('ix_testimonials_approved_featured_created_at')
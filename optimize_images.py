@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Image Library Optimizer
+Writes resized AVIF/WebP/JPEG derivatives for every image under static/images and
+static/uploads, skipping files unchanged since the last run, and reports the bytes saved.
+Derivatives are recorded in the database so the srcset() template helpers pick them up;
+those of originals deleted since the last run are removed, files and rows.
+
+Usage:
+    python optimize_images.py                    # Both trees, one worker per CPU
+    python optimize_images.py --trees uploads --workers 2
+    python optimize_images.py --no-db            # Files and manifest only
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.image_batch import DEFAULT_TREES, format_report, run_batch
+from utils.images import FORMATS, available_formats
+
+STATIC_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+DEFAULT_MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'image_manifest.json')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Create responsive derivatives for the static image library')
+    parser.add_argument('--trees', nargs='+', default=list(DEFAULT_TREES),
+                        help='Directories under static/ to process (default: images uploads)')
+    parser.add_argument('--workers', type=int, default=None, help='Encoder processes (default: CPU count)')
+    parser.add_argument('--formats', nargs='+', choices=list(FORMATS), default=None,
+                        help='Output formats (default: every format this Pillow build supports)')
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST, help='Content-hash manifest path')
+    parser.add_argument('--no-db', action='store_true', help="Don't record derivatives in the database")
+    args = parser.parse_args()
+
+    formats = args.formats or available_formats()
+    print(f"🔧 Optimizing {', '.join(args.trees)} as {', '.join(formats)} ({args.workers or os.cpu_count()} workers)")
+
+    if args.no_db:
+        report = run_batch(STATIC_FOLDER, args.manifest, args.trees, formats=formats, workers=args.workers)
+    else:
+        from app_factory import create_app
+        from db import db
+        from db.models import ImageDerivative
+        from utils.images import delete_derivatives, record_derivatives
+
+        app = create_app()
+        with app.app_context():
+            def record(source_path, status, entry):
+                # Skipped files are re-recorded only if their rows are missing (e.g. a fresh database)
+                if status == 'encoded' or not ImageDerivative.query.filter_by(source_path=source_path).first():
+                    record_derivatives(source_path, entry['derivatives'])
+                    db.session.commit()
+
+            def remove(source_path):
+                delete_derivatives(source_path)
+                db.session.commit()
+
+            report = run_batch(app.static_folder, args.manifest, args.trees, formats=formats,
+                               workers=args.workers, on_result=record, on_removed=remove)
+
+    print(format_report(report))
+    return 1 if report['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,7 +3,7 @@ from flask_login import login_required, current_user
 from db import db
 from db.models import Service, SiteSetting, EmailTemplate, User, Testimonial, AboutImage
 from werkzeug.utils import secure_filename
-from utils.site_settings import get_settings_by_language
+from utils.site_settings import get_settings_by_language, invalidate_site_settings
 import os
 from functools import wraps
 from datetime import datetime
@@ -264,6 +264,7 @@ def update_settings():
                 setting.value = f"uploads/home/{filename}"
         
         db.session.commit()
+        invalidate_site_settings()
         flash(f'Settings updated successfully for {selected_language}!', 'success')
         
     except Exception as e:
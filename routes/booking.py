@@ -1,13 +1,20 @@
 from flask import Blueprint, render_template, request, jsonify, current_app, flash, redirect, url_for
-from flask_mail import Message, Mail
 from db import db
-from db.models import Booking, Service, EmailTemplate
-from datetime import datetime
-import threading
+from db.models import Booking, Service
+from datetime import datetime, timezone
 import pytz
-from .send_sms import send_booking_confirmation_sms, format_local_time as sms_format_local_time
+from sqlalchemy.orm import joinedload, load_only
+from werkzeug.http import generate_etag
+from .send_sms import format_booking_confirmation_sms, format_booking_waitlist_sms, get_sms_status
+from utils.slot_occupancy import reserve_booking, SLOT_CAPACITY
+from utils.content_versions import get_content_version
+from utils.notifications import enqueue_email, enqueue_sms, wake_notification_worker
+from utils.scheduler import notify_reminder_scheduler
+from utils.email_templates import render_email_template
+from utils.slot_availability import get_day_availability, get_range_availability, MAX_RANGE_DAYS
 
 LOCAL_TZ = pytz.timezone("America/New_York")  # change to your timezone
+ADMIN_NOTIFICATION_EMAIL = "dambazolbayar@gmail.com"  # replace with your admin email
 
 def format_local_time(utc_time):
     """Convert UTC datetime to local timezone and format nicely"""
@@ -47,20 +54,202 @@ def get_services():
     ]
     return jsonify(services_data)
 
-# 📅 API: Get all bookings (for FullCalendar)
+def parse_window_bound(value):
+    """Parse a FullCalendar start/end parameter into a naive datetime (or None)"""
+    if not value:
+        return None
+    moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return moment.replace(tzinfo=None) if moment.tzinfo else moment
+
+
+# 📅 API: Get bookings (for FullCalendar), optionally limited to the visible start/end window
 @booking_bp.route("/events")
 def booking_events():
-    bookings = Booking.query.all()
-    events = [
-        {
-            "id": b.id,
-            "title": f"{b.user_name} ({b.num_people} {'person' if b.num_people == 1 else 'people'}) - {b.status}",  # Show name + people count + status
-            "start": b.start_time.isoformat(),
-            "end": b.end_time.isoformat(),
-        }
-        for b in bookings
-    ]
-    return jsonify(events)
+    try:
+        window_start = parse_window_bound(request.args.get('start'))
+        window_end = parse_window_bound(request.args.get('end'))
+    except ValueError as e:
+        return jsonify({"error": f"Invalid date format: {str(e)}"}), 400
+    
+    # Revalidate against the bookings version counter before loading any bookings
+    version, last_modified = get_content_version('bookings')
+    etag = generate_etag(f"{version}|{window_start}|{window_end}".encode())
+    
+    not_modified = request.if_none_match.contains(etag) if request.if_none_match else (
+        last_modified is not None and request.if_modified_since is not None
+        and last_modified.replace(microsecond=0, tzinfo=timezone.utc) <= request.if_modified_since
+    )
+    if not_modified:
+        response = current_app.response_class(status=304)
+    else:
+        # Only the columns the calendar event needs
+        query = Booking.query.options(load_only(
+            Booking.id, Booking.user_name, Booking.num_people, Booking.status,
+            Booking.start_time, Booking.end_time
+        ))
+        if window_start:
+            query = query.filter(Booking.end_time > window_start)
+        if window_end:
+            query = query.filter(Booking.start_time < window_end)
+        bookings = query.order_by(Booking.start_time).all()
+        
+        events = [
+            {
+                "id": b.id,
+                "title": f"{b.user_name} ({b.num_people} {'person' if b.num_people == 1 else 'people'}) - {b.status}",  # Show name + people count + status
+                "start": b.start_time.isoformat(),
+                "end": b.end_time.isoformat(),
+            }
+            for b in bookings
+        ]
+        response = jsonify(events)
+    
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response
+
+def build_confirmation_email(booking, service):
+    """Build the customer confirmation (subject, body), using the booking_confirmation template if present"""
+    # Use the custom template if the studio has one
+    rendered = render_email_template('booking_confirmation', {
+        'user_name': booking.user_name,
+        'email': booking.email,
+        'service_name': service.name if service else 'Unknown',
+        'service_price': str(service.price) if service else 'N/A',
+        'num_people': str(booking.num_people),
+        'people_text': 'person' if booking.num_people == 1 else 'people',
+        'start_time': format_local_time(booking.start_time.replace(tzinfo=pytz.UTC)),
+        'end_time': format_local_time(booking.end_time.replace(tzinfo=pytz.UTC))
+    })
+    if rendered:
+        return rendered
+    
+    # Fallback to default template
+    people_text = "person" if booking.num_people == 1 else "people"
+    subject = f"🌟 Booking Confirmation - {service.name if service else 'HolisticWeb'}"
+    body = f"""Hello {booking.user_name},
+
+Thank you for booking with HolisticWeb! ✨
+
+📌 Service: {service.name if service else "Unknown"}
+👥 Number of People: {booking.num_people} {people_text}
+💰 Price: ${service.price if service else "N/A"}
+🕒 Start: {format_local_time(booking.start_time.replace(tzinfo=pytz.UTC))}
+🕒 End:   {format_local_time(booking.end_time.replace(tzinfo=pytz.UTC))}
+
+{service.description if service else ""}
+
+We look forward to seeing you and your group!
+
+Best regards,
+- Serenity Wellness Studio
+
+If you need to reschedule or have any questions, please contact us.
+"""
+    return subject, body
+
+
+def build_waitlist_email(booking, service):
+    """Build the customer notice (subject, body) for a booking placed on the waitlist"""
+    people_text = "person" if booking.num_people == 1 else "people"
+    subject = f"⏳ Waitlist - {service.name if service else 'HolisticWeb'}"
+    body = f"""Hello {booking.user_name},
+
+Thank you for booking with HolisticWeb! This time slot is already full, so your
+booking has been added to the waitlist. It is not confirmed yet.
+
+📌 Service: {service.name if service else "Unknown"}
+👥 Number of People: {booking.num_people} {people_text}
+🕒 Start: {format_local_time(booking.start_time.replace(tzinfo=pytz.UTC))}
+🕒 End:   {format_local_time(booking.end_time.replace(tzinfo=pytz.UTC))}
+
+We will contact you if a spot opens up.
+
+Best regards,
+- Serenity Wellness Studio
+"""
+    return subject, body
+
+
+def build_admin_notification_email(booking, service):
+    """Build the new-booking notification (subject, body) sent to the studio"""
+    people_text = "person" if booking.num_people == 1 else "people"
+    waitlisted = booking.status == 'waitlist'
+    body = f"""A new {"waitlist " if waitlisted else ""}booking was created!
+
+📌 Service: {service.name if service else "Unknown"} (ID: {booking.service_id})
+📅 Date: {format_local_time(booking.start_time.replace(tzinfo=pytz.UTC))} - {format_local_time(booking.end_time.replace(tzinfo=pytz.UTC))}
+👤 Customer: {booking.user_name}
+📧 Email: {booking.email}
+👥 Number of People: {booking.num_people} {people_text}
+💰 Price: ${service.price if service else "N/A"}
+
+Booking ID: {booking.id}
+
+Login to admin panel to manage this booking.
+"""
+    return "📩 New Waitlist Booking Received" if waitlisted else "📩 New Booking Received", body
+
+
+def enqueue_booking_notifications(booking):
+    """
+    Queue confirmation email, admin notice and SMS for a new booking in the durable outbox
+
+    Bookings saved on the waitlist (their slot was full) get waitlist wording instead
+    of a confirmation. Runs inside reserve_booking's transaction, so the jobs commit (or roll back)
+    together with the booking; the notification worker sends them.
+    """
+    service = Service.query.get(booking.service_id) if booking.service_id else None
+    notice = 'waitlist' if booking.status == 'waitlist' else 'confirmation'
+    
+    if current_app.config.get("MAIL_USERNAME") and current_app.config.get("MAIL_PASSWORD"):
+        build_email = build_waitlist_email if notice == 'waitlist' else build_confirmation_email
+        subject, body = build_email(booking, service)
+        enqueue_email(f"booking:{booking.id}:{notice}:email", subject, [booking.email], body)
+        
+        subject, body = build_admin_notification_email(booking, service)
+        enqueue_email(f"booking:{booking.id}:admin:email", subject, [ADMIN_NOTIFICATION_EMAIL], body)
+        
+        print(f"📧 Email {notice} queued for {booking.email}")
+    else:
+        print("📧 Email credentials not configured")
+        print(f"📧 MAIL_USERNAME: {current_app.config.get('MAIL_USERNAME')}")
+        print(f"📧 MAIL_PASSWORD: {'***' if current_app.config.get('MAIL_PASSWORD') else 'Not set'}")
+
+    if booking.phone_number and get_sms_status()['client_configured']:
+        format_sms = format_booking_waitlist_sms if notice == 'waitlist' else format_booking_confirmation_sms
+        message = format_sms(
+            booking.user_name,
+            service.name if service else 'HolisticWeb Service',
+            booking.start_time
+        )
+        enqueue_sms(f"booking:{booking.id}:{notice}:sms", booking.phone_number, message)
+        print(f"📱 SMS {notice} queued for {booking.phone_number}")
+    else:
+        print("📱 No phone number or SMS service for SMS confirmation")
+
+
+def build_cancellation_email(booking, service):
+    """Build the customer cancellation (subject, body)"""
+    people_text = "person" if booking.num_people == 1 else "people"
+    subject = f"🚫 Booking Cancellation - {service.name if service else 'HolisticWeb'}"
+    body = f"""Hello {booking.user_name},
+
+Your booking has been cancelled.
+
+📌 Service: {service.name if service else "Unknown"}
+👥 Number of People: {booking.num_people} {people_text}
+🕒 Original Time: {format_local_time(booking.start_time.replace(tzinfo=pytz.UTC))} - {format_local_time(booking.end_time.replace(tzinfo=pytz.UTC))}
+🆔 Booking ID: {booking.id}
+
+If you did not request this cancellation or have any questions, please contact us immediately.
+
+Best regards,
+- Serenity Wellness Studio
+"""
+    return subject, body
 
 # 📅 API: Add new booking (enhanced with email confirmation)
 @booking_bp.route("/events", methods=["POST"])
@@ -96,21 +285,6 @@ def add_booking():
         elif num_people > 10:
             num_people = 10
         
-        # Check current capacity for this time slot
-        existing_bookings = Booking.query.filter(
-            Booking.start_time <= start_time,
-            Booking.end_time > start_time,
-            Booking.status != 'cancelled'
-        ).all()
-        
-        # Calculate total people already booked
-        total_existing_people = sum(booking.num_people for booking in existing_bookings)
-        
-        # Check if adding this booking would exceed capacity
-        new_total = total_existing_people + num_people
-        is_fully_booked = new_total > 10
-        
-        # Allow booking but warn if over capacity
         booking = Booking(
             user_name=data["user_name"],
             email=data["email"],
@@ -118,177 +292,26 @@ def add_booking():
             service_id=data.get("service_id"),
             num_people=num_people,  # Add number of people
             start_time=start_time,
-            end_time=end_time,
-            status="pending"
+            end_time=end_time
         )
-        db.session.add(booking)
-        db.session.commit()
-
-        # Send confirmation email (non-blocking)
-        if current_app.config.get("MAIL_USERNAME") and current_app.config.get("MAIL_PASSWORD"):
-            service = Service.query.get(booking.service_id) if booking.service_id else None
-            
-            # Capture the app instance for use in the background thread
-            app = current_app._get_current_object()
-            
-            def send_email_async():
-                """Send email in background thread to avoid blocking the request"""
-                try:
-                    with app.app_context():
-                        # Get the mail instance from the app
-                        mail = app.mail
-                        
-                        # Send confirmation email to customer
-                        print(f"📧 [Background] Sending confirmation email to {booking.email}")
-                        print(f"📧 [Background] SMTP Config: {app.config['MAIL_SERVER']}:{app.config['MAIL_PORT']}")
-                        print(f"📧 [Background] From: {app.config.get('MAIL_DEFAULT_SENDER')}")
-                        
-                        # Get email template
-                        email_template = EmailTemplate.query.filter_by(name='booking_confirmation').first()
-                        
-                        if email_template:
-                            # Use custom template
-                            subject = email_template.subject
-                            body = email_template.body
-                            
-                            # Replace variables in template
-                            variables = {
-                                '{user_name}': booking.user_name,
-                                '{email}': booking.email,
-                                '{service_name}': service.name if service else 'Unknown',
-                                '{service_price}': str(service.price) if service else 'N/A',
-                                '{num_people}': str(booking.num_people),
-                                '{people_text}': 'person' if booking.num_people == 1 else 'people',
-                                '{start_time}': format_local_time(booking.start_time.replace(tzinfo=pytz.UTC)),
-                                '{end_time}': format_local_time(booking.end_time.replace(tzinfo=pytz.UTC))
-                            }
-                            
-                            for variable, value in variables.items():
-                                subject = subject.replace(variable, value)
-                                body = body.replace(variable, value)
-                        else:
-                            # Fallback to default template
-                            people_text = "person" if booking.num_people == 1 else "people"
-                            subject = f"🌟 Booking Confirmation - {service.name if service else 'HolisticWeb'}"
-                            body = f"""Hello {booking.user_name},
-
-Thank you for booking with HolisticWeb! ✨
-
-📌 Service: {service.name if service else "Unknown"}
-� Number of People: {booking.num_people} {people_text}
-�💰 Price: ${service.price if service else "N/A"}
-🕒 Start: {format_local_time(booking.start_time.replace(tzinfo=pytz.UTC))}
-🕒 End:   {format_local_time(booking.end_time.replace(tzinfo=pytz.UTC))}
-
-{service.description if service else ""}
-
-We look forward to seeing you and your group!
-
-Best regards,
-- Serenity Wellness Studio
-
-If you need to reschedule or have any questions, please contact us.
-"""
-                        
-                        msg = Message(
-                            subject=subject,
-                            recipients=[booking.email],
-                            sender=app.config.get('MAIL_DEFAULT_SENDER'),
-                            body=body
-                        )
-                        
-                        mail.send(msg)
-                        print(f"✅ [Background] Confirmation email sent successfully to {booking.email}")
-                        
-                        # Send notification email to admin
-                        try:
-                            people_text = "person" if booking.num_people == 1 else "people"
-                            admin_msg = Message(
-                                subject="📩 New Booking Received",
-                                recipients=["dambazolbayar@gmail.com"],   # replace with your admin email
-                                sender=app.config.get('MAIL_DEFAULT_SENDER'),
-                                body=f"""A new booking was created!
-
-📌 Service: {service.name if service else "Unknown"} (ID: {booking.service_id})
-📅 Date: {format_local_time(booking.start_time.replace(tzinfo=pytz.UTC))} - {format_local_time(booking.end_time.replace(tzinfo=pytz.UTC))}
-👤 Customer: {booking.user_name}
-📧 Email: {booking.email}
-👥 Number of People: {booking.num_people} {people_text}
-💰 Price: ${service.price if service else "N/A"}
-
-Booking ID: {booking.id}
-
-Login to admin panel to manage this booking.
-"""
-                            )
-                            mail.send(admin_msg)
-                            print("✅ [Background] Admin notification sent successfully")
-                        except Exception as admin_email_error:
-                            print(f"❌ [Background] Admin email failed: {admin_email_error}")
-                        
-                except Exception as email_error:
-                    print(f"❌ [Background] Failed to send customer email: {email_error}")
-                    print(f"❌ Error type: {type(email_error).__name__}")
-                    print(f"❌ Error details: {str(email_error)}")
-                    if "authentication" in str(email_error).lower():
-                        print("❌ Authentication failed - check Gmail app password")
-                    elif "timeout" in str(email_error).lower():
-                        print("❌ Connection timeout - check network/firewall")
-                    # Print full traceback for debugging
-                    import traceback
-                    traceback.print_exc()
-            
-            # Start email sending in background
-            email_thread = threading.Thread(target=send_email_async, daemon=True)
-            email_thread.start()
-            
-            print(f"📧 Email confirmation being sent to {booking.email}")
-        else:
-            print("📧 Email credentials not configured")
-            print(f"📧 MAIL_USERNAME: {current_app.config.get('MAIL_USERNAME')}")
-            print(f"📧 MAIL_PASSWORD: {'***' if current_app.config.get('MAIL_PASSWORD') else 'Not set'}")
-
-        # Send SMS confirmation (non-blocking)
-        if hasattr(booking, 'phone_number') and booking.phone_number:
-            service = Service.query.get(booking.service_id) if booking.service_id else None
-            
-            def send_sms_async():
-                """Send SMS in background thread to avoid blocking the request"""
-                try:
-                    print(f"📱 [Background] Sending SMS confirmation to {booking.phone_number}")
-                    
-                    success = send_booking_confirmation_sms(
-                        booking.phone_number,
-                        booking.user_name,
-                        service.name if service else 'HolisticWeb Service',
-                        booking.start_time
-                    )
-                    
-                    if success:
-                        print(f"✅ [Background] SMS confirmation sent successfully to {booking.phone_number}")
-                    else:
-                        print(f"❌ [Background] Failed to send SMS confirmation to {booking.phone_number}")
-                        
-                except Exception as sms_error:
-                    print(f"❌ [Background] SMS sending error: {sms_error}")
-            
-            # Start SMS sending in background
-            sms_thread = threading.Thread(target=send_sms_async, daemon=True)
-            sms_thread.start()
-            
-            print(f"📱 SMS confirmation being sent to {booking.phone_number}")
-        else:
-            print("📱 No phone number provided for SMS confirmation")
+        
+        # Check capacity, insert and queue the notifications in one write transaction;
+        # bookings that do not fit are saved on the waitlist instead of overfilling the slot
+        fits, new_total = reserve_booking(booking, before_commit=enqueue_booking_notifications)
+        is_fully_booked = not fits
+        wake_notification_worker(current_app)
+        notify_reminder_scheduler(current_app, booking)
 
         return jsonify({
             "success": True, 
             "id": booking.id,
+            "status": booking.status,
             "num_people": num_people,
             "isFullyBooked": is_fully_booked,
             "totalPeople": new_total,
-            "availableSpots": max(0, 10 - new_total),
+            "availableSpots": max(0, SLOT_CAPACITY - new_total),
             "message": f"Booking created successfully for {num_people} {'person' if num_people == 1 else 'people'}! Confirmation email and SMS being sent." + 
-                      (f" Note: This time slot now has {new_total}/10 people." if new_total > 10 else f" ({new_total}/10 spots filled)")
+                      (f" Note: This time slot is full ({new_total}/{SLOT_CAPACITY} people), so you have been added to the waitlist." if is_fully_booked else f" ({new_total}/{SLOT_CAPACITY} spots filled)")
         }), 201
         
     except ValueError as ve:
@@ -317,47 +340,8 @@ def get_available_slots():
         # Parse the date
         selected_date = datetime.fromisoformat(date_str).date()
         
-        # Generate time slots (8:30 AM to 2:00 PM, 30-minute intervals)
-        slots = []
-        start_hour = 8
-        end_hour = 15  # Set to 15 to include 2:00 PM (14:00)
-        
-        for hour in range(start_hour, end_hour):
-            for minutes in [0, 30]:
-                # Skip 8:00 AM slot, start from 8:30 AM
-                if hour == 8 and minutes == 0:
-                    continue
-                # Stop after 2:00 PM (don't include 2:30 PM)
-                if hour == 14 and minutes == 30:
-                    break
-                    break  # Don't go past 2:00 PM
-                
-                # Create datetime for this slot
-                slot_datetime = datetime.combine(selected_date, datetime.min.time().replace(hour=hour, minute=minutes))
-                
-                # Get existing bookings for this time slot (overlapping bookings)
-                existing_bookings = Booking.query.filter(
-                    Booking.start_time <= slot_datetime,
-                    Booking.end_time > slot_datetime,
-                    Booking.status != 'cancelled'
-                ).all()
-                
-                # Calculate total people booked for this slot
-                total_people = sum(booking.num_people for booking in existing_bookings)
-                available_spots = max(0, 10 - total_people)
-                
-                # Format time string
-                time_str = slot_datetime.strftime("%I:%M %p").lstrip('0')
-                
-                slots.append({
-                    "time": slot_datetime.isoformat(),
-                    "timeString": time_str,
-                    "totalPeople": total_people,
-                    "availableSpots": available_spots,
-                    "isFullyBooked": total_people >= 10,
-                    "bookingCount": len(existing_bookings),  # Number of individual bookings
-                    "available": True  # Always true - we still allow overbooking
-                })
+        # Compute every slot (8:30 AM to 2:00 PM, 30-minute intervals) from one query
+        slots = get_day_availability(selected_date)
         
         return jsonify(slots)
         
@@ -365,6 +349,37 @@ def get_available_slots():
         print(f"❌ Error getting available slots: {e}")
         return jsonify({"error": str(e)}), 400
 
+# 📅 API: Get available time slots for every day in a date range (e.g. a whole month)
+@booking_bp.route("/available-range")
+def get_available_range():
+    start_str = request.args.get('start')
+    end_str = request.args.get('end')
+    service_id = request.args.get('service_id')
+    
+    if not start_str or not end_str:
+        return jsonify({"error": "Start and end parameters are required"}), 400
+    
+    try:
+        start_date = datetime.fromisoformat(start_str).date()
+        end_date = datetime.fromisoformat(end_str).date()
+        
+        if end_date < start_date:
+            return jsonify({"error": "End date must not be before start date"}), 400
+        if (end_date - start_date).days >= MAX_RANGE_DAYS:
+            return jsonify({"error": f"Date range cannot exceed {MAX_RANGE_DAYS} days"}), 400
+        
+        # Capacity is shared by all services, so service_id only scopes the request
+        return jsonify({
+            "start": start_date.isoformat(),
+            "end": end_date.isoformat(),
+            "service_id": service_id,
+            "days": get_range_availability(start_date, end_date)
+        })
+        
+    except Exception as e:
+        print(f"❌ Error getting available range: {e}")
+        return jsonify({"error": str(e)}), 400
+
 # 📅 Form-based booking (for backwards compatibility)
 @booking_bp.route("/new", methods=["GET", "POST"])
 def create_booking():
@@ -386,8 +401,9 @@ def create_booking():
                 start_time=datetime.fromisoformat(request.form["start_time"]),
                 end_time=datetime.fromisoformat(request.form["end_time"]),
             )
-            db.session.add(new_booking)
-            db.session.commit()
+            reserve_booking(new_booking, before_commit=enqueue_booking_notifications)
+            wake_notification_worker(current_app)
+            notify_reminder_scheduler(current_app, new_booking)
 
             # Redirect to the new booking page
             flash(f"Booking created successfully for {num_people} {'person' if num_people == 1 else 'people'}!", "success")
@@ -418,56 +434,16 @@ def cancel_booking(booking_id):
         
         # Update booking status to cancelled
         booking.status = 'cancelled'
-        db.session.commit()
         
-        # Send cancellation email notification
+        # Queue cancellation email in the same transaction as the status change
         if current_app.config.get("MAIL_USERNAME") and current_app.config.get("MAIL_PASSWORD"):
             service = Service.query.get(booking.service_id) if booking.service_id else None
-            
-            # Capture the app instance for use in the background thread
-            app = current_app._get_current_object()
-            
-            def send_cancellation_email_async():
-                """Send cancellation email in background thread"""
-                try:
-                    with app.app_context():
-                        mail = app.mail
-                        
-                        # Send cancellation email to customer
-                        people_text = "person" if booking.num_people == 1 else "people"
-                        subject = f"🚫 Booking Cancellation - {service.name if service else 'HolisticWeb'}"
-                        body = f"""Hello {booking.user_name},
-
-Your booking has been cancelled.
-
-📌 Service: {service.name if service else "Unknown"}
-👥 Number of People: {booking.num_people} {people_text}
-🕒 Original Time: {format_local_time(booking.start_time.replace(tzinfo=pytz.UTC))} - {format_local_time(booking.end_time.replace(tzinfo=pytz.UTC))}
-🆔 Booking ID: {booking.id}
-
-If you did not request this cancellation or have any questions, please contact us immediately.
-
-Best regards,
-- Serenity Wellness Studio
-"""
-                        
-                        from flask_mail import Message
-                        msg = Message(
-                            subject=subject,
-                            recipients=[booking.email],
-                            sender=app.config.get('MAIL_DEFAULT_SENDER'),
-                            body=body
-                        )
-                        
-                        mail.send(msg)
-                        print(f"✅ [Background] Cancellation email sent to {booking.email}")
-                        
-                except Exception as email_error:
-                    print(f"❌ [Background] Failed to send cancellation email: {email_error}")
-            
-            # Start email sending in background
-            email_thread = threading.Thread(target=send_cancellation_email_async, daemon=True)
-            email_thread.start()
+            subject, body = build_cancellation_email(booking, service)
+            enqueue_email(f"booking:{booking.id}:cancellation:email", subject, [booking.email], body)
+        
+        db.session.commit()
+        wake_notification_worker(current_app)
+        notify_reminder_scheduler(current_app, booking)
         
         return jsonify({
             "success": True,
@@ -493,12 +469,18 @@ def search_my_bookings():
         return jsonify({"error": "Email parameter is required"}), 400
     
     try:
-        # Get all bookings for this email
-        bookings = Booking.query.filter_by(email=email).order_by(Booking.start_time.desc()).all()
+        # Get all bookings for this email with their services in one query
+        bookings = Booking.query.options(
+            load_only(
+                Booking.id, Booking.user_name, Booking.email, Booking.phone_number, Booking.num_people,
+                Booking.start_time, Booking.end_time, Booking.status, Booking.created_at
+            ),
+            joinedload(Booking.service).load_only(Service.name, Service.price, Service.duration)
+        ).filter_by(email=email).order_by(Booking.start_time.desc()).all()
         
         bookings_data = []
         for booking in bookings:
-            service = Service.query.get(booking.service_id) if booking.service_id else None
+            service = booking.service
             
             bookings_data.append({
                 "id": booking.id,
@@ -3,15 +3,19 @@ Main application routes
 Contains core routes like home, health check, etc.
 """
 
-from flask import Blueprint, render_template, redirect, url_for, send_from_directory, current_app, request, jsonify, flash
+from flask import Blueprint, render_template, redirect, url_for, send_from_directory, current_app, request, jsonify, flash, session
 from flask_mail import Message
 import os
+import uuid
 from datetime import datetime
 
+from db import db
 from db.models import Service, SiteSetting, AboutImage
-from routes.testimony import get_approved_testimonials
+from routes.testimony import get_approved_testimonial_page
 from routes.send_sms import get_sms_status, test_sms_connection, check_and_send_reminders
 from utils.site_settings import get_site_settings
+from utils.notifications import enqueue_email, get_notification_statuses, wake_notification_worker
+from utils.page_cache import get_cached_page, cached_page_response
 
 # Facebook integration - try to import, set availability flag
 FACEBOOK_AVAILABLE = False
@@ -27,6 +31,12 @@ except ImportError:
 # Create main blueprint
 main_bp = Blueprint('main', __name__)
 
+# Emails queued per contact form submission
+CONTACT_EMAIL_KINDS = ('admin', 'confirmation')
+
+# Content versions the cached home page depends on
+HOME_CONTENT = ('services', 'site_settings', 'testimonials', 'about_images', 'image_derivatives')
+
 
 @main_bp.route('/')
 def home():
@@ -37,13 +47,31 @@ def home():
     if current_language not in ['ENG', 'MON']:
         current_language = 'ENG'
     
+    # Logged-in users (admin link) and pending flash messages change the page, so skip the cache
+    if session.get('_user_id') or session.get('_flashes'):
+        return render_home(current_language)
+    
+    page = get_cached_page(('home', current_language), HOME_CONTENT, lambda: render_home(current_language))
+    return cached_page_response(page)
+
+
+def testimonials_more_url():
+    """Carousel page URL from whichever testimonials blueprint is registered (feature or fallback)"""
+    for endpoint in ('testimonials.more_testimonials', 'testimony.more_testimonials'):
+        if endpoint in current_app.view_functions:
+            return url_for(endpoint)
+    return None
+
+
+def render_home(current_language):
+    """Render the home page for one language"""
     # Filter services by current language
     services = Service.query.filter_by(language=current_language).all()
     
     settings = get_site_settings(current_language)
     
-    # Get approved testimonials for display
-    testimonials = get_approved_testimonials()
+    # Get the first page of approved testimonials; the carousel loads the rest on demand
+    testimonials, testimonials_next = get_approved_testimonial_page()
     
     # Get active about images ordered by sort_order
     about_images = AboutImage.query.filter_by(is_active=True).order_by(AboutImage.sort_order).all()
@@ -52,6 +80,8 @@ def home():
                          services=services, 
                          settings=settings, 
                          testimonials=testimonials, 
+                         testimonials_next=testimonials_next,
+                         testimonials_more_url=testimonials_more_url() if testimonials_next else None,
                          about_images=about_images,
                          current_language=current_language)
 
@@ -80,9 +110,9 @@ def contact_form():
                 'message': 'Please enter a valid email address.'
             }), 400
         
-        # Send email notification to admin
+        # Queue both emails; the notification worker delivers them after we respond
         try:
-            mail = current_app.mail
+            submission_id = uuid.uuid4().hex
             
             # Email to admin
             admin_subject = f"New Contact Form Submission from {name}"
@@ -98,15 +128,10 @@ Message:
 ---
 This message was sent via the contact form on your website.
 """
+            admin_email = current_app.config.get('MAIL_USERNAME') or 'admin@example.com'
+            enqueue_email(f"contact:{submission_id}:admin:email", admin_subject, [admin_email], admin_body)
             
-            admin_msg = Message(
-                subject=admin_subject,
-                recipients=[current_app.config.get('MAIL_USERNAME', 'admin@example.com')],
-                body=admin_body
-            )
-            mail.send(admin_msg)
-            
-            # Send confirmation email to user
+            # Confirmation email to user
             user_subject = "Thank you for contacting us - Holistic Therapy"
             user_body = f"""
 Dear {name},
@@ -121,21 +146,20 @@ If you have any urgent concerns, please feel free to call us directly.
 Best regards,
 Holistic Therapy Team
 """
-            
-            user_msg = Message(
-                subject=user_subject,
-                recipients=[email],
-                body=user_body
-            )
-            mail.send(user_msg)
+            enqueue_email(f"contact:{submission_id}:confirmation:email", user_subject, [email], user_body)
+            db.session.commit()
+            wake_notification_worker(current_app)
             
             return jsonify({
                 'status': 'success',
-                'message': 'Thank you for your message! We will get back to you soon. Please check your email for confirmation.'
-            }), 200
+                'message': 'Thank you for your message! We will get back to you soon. Please check your email for confirmation.',
+                'submission_id': submission_id,
+                'status_url': url_for('main.contact_status', submission_id=submission_id)
+            }), 202
             
         except Exception as e:
-            current_app.logger.error(f"Failed to send contact form email: {e}")
+            db.session.rollback()
+            current_app.logger.error(f"Failed to queue contact form email: {e}")
             return jsonify({
                 'status': 'error',
                 'message': 'There was an error sending your message. Please try again or contact us directly.'
@@ -149,6 +173,31 @@ Holistic Therapy Team
         }), 500
 
 
+
+@main_bp.route('/contact/status/<submission_id>')
+def contact_status(submission_id):
+    """Report delivery progress of a contact form submission's emails"""
+    keys = {kind: f"contact:{submission_id}:{kind}:email" for kind in CONTACT_EMAIL_KINDS}
+    jobs = get_notification_statuses(keys.values())
+    if not jobs:
+        return jsonify({'status': 'error', 'message': 'Unknown submission'}), 404
+    
+    messages = {kind: jobs.get(key, {'status': 'missing', 'attempts': 0, 'sent_at': None})
+                for kind, key in keys.items()}
+    statuses = {job['status'] for job in messages.values()}
+    if statuses == {'sent'}:
+        delivery = 'delivered'
+    elif 'failed' in statuses or 'missing' in statuses:
+        delivery = 'failed'
+    else:
+        delivery = 'pending'
+    
+    return jsonify({
+        'submission_id': submission_id,
+        'delivery': delivery,
+        'messages': messages
+    })
+
 @main_bp.route('/book')
 def book_redirect():
     """Redirect to the booking page for easy access"""
@@ -1,8 +1,13 @@
 
 import os
+import re
 import json
-from datetime import datetime, timedelta
+import threading
+import time
+from functools import lru_cache
+
 import pytz
+import requests
 
 try:
     from twilio.rest import Client
@@ -56,57 +61,154 @@ def format_local_time(utc_time):
     """Convert UTC datetime to local timezone and format nicely"""
     return utc_time.astimezone(LOCAL_TZ).strftime("%Y-%m-%d %I:%M %p")
 
-def send_sms_reminder(to_number, message):
-    """Send SMS reminder using Twilio"""
-    if not client:
-        print("Twilio client not configured. SMS not sent.")
-        return False
+# Batch sending (Twilio REST API over one keep-alive HTTP session)
+TWILIO_API_BASE = os.environ.get('TWILIO_API_BASE', 'https://api.twilio.com')
+TWILIO_MESSAGES_PER_SECOND = float(os.environ.get('TWILIO_MESSAGES_PER_SECOND', 1))  # Twilio's long-code limit
+TWILIO_TIMEOUT = 10
+
+NON_DIGITS = re.compile(r'\D')
+
+@lru_cache(maxsize=4096)
+def normalize_phone_number(number):
+    """Normalize a phone number to E.164 (+1 assumed for 10-digit numbers); None if invalid"""
+    if not number:
+        return None
+    number = str(number).strip()
+    if number.startswith('+'):
+        digits = NON_DIGITS.sub('', number)
+        return '+' + digits if 8 <= len(digits) <= 15 else None
     
-    try:
-        # Validate phone number format
-        if not to_number:
-            print("❌ No phone number provided")
-            return False
-            
-        # Format phone number properly (add +1 if not present)
-        formatted_phone = str(to_number).strip()
-        if not formatted_phone.startswith('+'):
-            # Remove any non-digit characters first
-            import re
-            digits_only = re.sub(r'\D', '', formatted_phone)
-            if len(digits_only) == 10:
-                formatted_phone = '+1' + digits_only
-            elif len(digits_only) == 11 and digits_only.startswith('1'):
-                formatted_phone = '+' + digits_only
-            else:
-                print(f"❌ Invalid phone number format: {to_number}")
-                return False
-        
-        # Send SMS using Twilio
-        sms_message = client.messages.create(
-            body=message,
-            from_=TWILIO_PHONE,
-            to=formatted_phone
+    digits = NON_DIGITS.sub('', number)
+    if len(digits) == 10:
+        return '+1' + digits
+    if len(digits) == 11 and digits.startswith('1'):
+        return '+' + digits
+    return None
+
+class TokenBucket:
+    """Thread-safe token bucket: allows `rate` operations per second with bursts up to `capacity`"""
+    
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping until one is available"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class TwilioBatchSender:
+    """Sends SMS through Twilio's REST API with one reusable HTTP session and a shared rate limit"""
+    
+    def __init__(self, account_sid, auth_token, from_number, api_base=TWILIO_API_BASE,
+                 messages_per_second=TWILIO_MESSAGES_PER_SECOND, timeout=TWILIO_TIMEOUT):
+        if not messages_per_second > 0:
+            raise ValueError(f"messages_per_second must be positive, got {messages_per_second!r}")
+        self.from_number = from_number
+        self.url = f"{api_base.rstrip('/')}/2010-04-01/Accounts/{account_sid}/Messages.json"
+        self.timeout = timeout
+        self.bucket = TokenBucket(messages_per_second)
+        self.session = requests.Session()
+        self.session.auth = (account_sid, auth_token)
+    
+    def send_one(self, to_number, body):
+        """Send one already-normalized message; returns the message SID or raises"""
+        self.bucket.acquire()
+        response = self.session.post(
+            self.url,
+            data={'To': to_number, 'From': self.from_number, 'Body': body},
+            timeout=self.timeout
         )
-        print(f"✅ SMS sent successfully. SID: {sms_message.sid}")
-        print(f"📱 Sent to: {formatted_phone}")
-        return True
+        data = response.json() if response.content else {}
+        if response.status_code >= 400:
+            raise RuntimeError(f"Twilio error {data.get('code', response.status_code)}: {data.get('message', response.text)}")
+        return data.get('sid')
+    
+    def send_batch(self, messages):
+        """Send many (number, body) pairs
         
-    except Exception as e:
-        print(f"❌ Error sending SMS: {e}")
-        return False
+        Numbers are normalized and exact repeats of the same body to the same
+        number are sent once. Failures don't stop the batch.
+        
+        Returns:
+            list: One outcome dict per input pair, in order:
+                {'to', 'normalized', 'status': sent|failed|invalid|duplicate, 'sid', 'error'}
+        """
+        outcomes = []
+        seen = set()
+        for to_number, body in messages:
+            normalized = normalize_phone_number(to_number)
+            outcome = {'to': to_number, 'normalized': normalized, 'status': None, 'sid': None, 'error': None}
+            outcomes.append(outcome)
+            
+            if not normalized:
+                outcome.update(status='invalid', error='Invalid phone number format')
+                continue
+            if (normalized, body) in seen:
+                outcome['status'] = 'duplicate'
+                continue
+            seen.add((normalized, body))
+            
+            try:
+                outcome.update(status='sent', sid=self.send_one(normalized, body))
+            except Exception as e:
+                outcome.update(status='failed', error=str(e))
+        
+        sent = sum(1 for outcome in outcomes if outcome['status'] == 'sent')
+        print(f"📱 SMS batch: {sent}/{len(outcomes)} sent")
+        return outcomes
 
-def send_booking_confirmation_sms(to_number, user_name, service_name, start_time):
-    """Send booking confirmation SMS"""
+_batch_sender = None
+_batch_sender_lock = threading.Lock()
+
+def get_batch_sender():
+    """Shared sender for this process, so every caller reuses one session and one rate limit"""
+    global _batch_sender
+    with _batch_sender_lock:
+        if _batch_sender is None:
+            _batch_sender = TwilioBatchSender(TWILIO_SID, TWILIO_AUTH_TOKEN, TWILIO_PHONE)
+        return _batch_sender
+
+def send_sms_batch(messages):
+    """Send many (number, body) pairs; see TwilioBatchSender.send_batch for the outcomes"""
     if not client:
         print("Twilio client not configured. SMS not sent.")
+        return [{'to': to_number, 'normalized': None, 'status': 'failed', 'sid': None,
+                 'error': 'Twilio client not configured'} for to_number, _ in messages]
+    return get_batch_sender().send_batch(messages)
+
+def send_sms_reminder(to_number, message):
+    """Send SMS reminder using Twilio"""
+    if not to_number:
+        print("❌ No phone number provided")
         return False
     
-    try:
-        # Format appointment time in local timezone
-        local_time = format_local_time(start_time.replace(tzinfo=pytz.UTC))
-        
-        message = f"""Hello {user_name}! 
+    outcome = send_sms_batch([(to_number, message)])[0]
+    if outcome['status'] == 'sent':
+        print(f"✅ SMS sent successfully. SID: {outcome['sid']}")
+        print(f"📱 Sent to: {outcome['normalized']}")
+        return True
+    
+    print(f"❌ Error sending SMS to {to_number}: {outcome['error']}")
+    return False
+
+def format_booking_confirmation_sms(user_name, service_name, start_time):
+    """Build the booking confirmation SMS text"""
+    # Format appointment time in local timezone
+    local_time = format_local_time(start_time.replace(tzinfo=pytz.UTC))
+    
+    return f"""Hello {user_name}! 
 
 Your booking has been confirmed:
 📅 Service: {service_name}
@@ -115,78 +217,77 @@ Your booking has been confirmed:
 We look forward to seeing you!
 
 - Serenity Wellness Studio"""
-        
-        return send_sms_reminder(to_number, message)
-        
-    except Exception as e:
-        print(f"❌ Error sending booking confirmation SMS: {e}")
-        return False
 
-def send_booking_reminder_sms(to_number, user_name, start_time, minutes_before=30):
-    """Send booking reminder SMS"""
+def format_booking_waitlist_sms(user_name, service_name, start_time):
+    """Build the SMS text for a booking placed on the waitlist of a full slot"""
+    local_time = format_local_time(start_time.replace(tzinfo=pytz.UTC))
+
+    return f"""Hello {user_name}! 
+
+This time slot is full, so you have been added to the waitlist:
+📅 Service: {service_name}
+🕒 Time: {local_time}
+
+We will contact you if a spot opens up.
+
+- Serenity Wellness Studio"""
+
+def send_booking_confirmation_sms(to_number, user_name, service_name, start_time):
+    """Send booking confirmation SMS"""
     if not client:
         print("Twilio client not configured. SMS not sent.")
         return False
     
     try:
-        # Format appointment time in local timezone
-        local_time = format_local_time(start_time.replace(tzinfo=pytz.UTC))
+        message = format_booking_confirmation_sms(user_name, service_name, start_time)
+        return send_sms_reminder(to_number, message)
         
-        message = f"""Hello {user_name}, 
+    except Exception as e:
+        print(f"❌ Error sending booking confirmation SMS: {e}")
+        return False
+
+def format_booking_reminder_sms(user_name, start_time):
+    """Build the booking reminder SMS text"""
+    # Format appointment time in local timezone
+    local_time = format_local_time(start_time.replace(tzinfo=pytz.UTC))
+    
+    return f"""Hello {user_name}, 
 
 This is a reminder: your appointment is at {local_time}.
 
 See you soon!
 
 - Serenity Wellness Studio"""
-        
+
+def send_booking_reminder_sms(to_number, user_name, start_time, minutes_before=30):
+    """Send booking reminder SMS"""
+    if not client:
+        print("Twilio client not configured. SMS not sent.")
+        return False
+    
+    try:
+        message = format_booking_reminder_sms(user_name, start_time)
         return send_sms_reminder(to_number, message)
         
     except Exception as e:
         print(f"❌ Error sending booking reminder SMS: {e}")
         return False
 
-def check_and_send_reminders(app, Booking):
-    """Check for bookings that need reminders and send SMS
+def check_and_send_reminders(app, Booking=None):
+    """Queue SMS reminders for bookings that are due one
+    
+    Kept for the scheduler and the /send-reminders route; the work is done by
+    utils.reminders.dispatch_due_reminders, which never queues a reminder twice.
     
     Args:
         app: Flask application instance
-        Booking: Booking model class
+        Booking: Unused, accepted for backwards compatibility
+    
+    Returns:
+        int: Number of reminders queued
     """
-    if not client:
-        print("Twilio client not configured. Skipping reminder check.")
-        return
-    
-    with app.app_context():
-        now = datetime.utcnow()
-        reminder_time = now + timedelta(minutes=30)  # Send reminders 30 minutes before
-
-        # Get bookings 30 minutes from now (within 5-minute window for more flexibility)
-        bookings = Booking.query.filter(
-            Booking.start_time.between(reminder_time, reminder_time + timedelta(minutes=5))
-        ).all()
-
-        print(f"🔍 Checking for reminders at {now}")
-        print(f"📅 Looking for bookings between {reminder_time} and {reminder_time + timedelta(minutes=5)}")
-        print(f"📋 Found {len(bookings)} bookings needing reminders")
-
-        for booking in bookings:
-            # Check if booking has a phone number field
-            phone_number = getattr(booking, 'phone_number', None)
-            if phone_number:
-                print(f"📱 Sending reminder to {booking.user_name} at {phone_number}")
-                success = send_booking_reminder_sms(
-                    phone_number, 
-                    booking.user_name, 
-                    booking.start_time
-                )
-                
-                if success:
-                    print(f"✅ Reminder sent successfully to {booking.user_name}")
-                else:
-                    print(f"❌ Failed to send reminder to {booking.user_name}")
-            else:
-                print(f"⚠️ No phone number for booking {booking.id} - {booking.user_name}")
+    from utils.reminders import dispatch_due_reminders
+    return dispatch_due_reminders(app)
 
 def get_sms_status():
     """Get SMS service status"""
@@ -3,6 +3,7 @@ from flask_mail import Message
 from flask_login import current_user
 from db import db
 from db.models import Testimonial
+from utils.testimonials import TESTIMONIAL_PAGE_SIZE, get_testimonial_page, more_testimonials_response
 from functools import wraps
 from datetime import datetime
 
@@ -84,7 +85,21 @@ This notification was sent automatically.
     
     return render_template('testimony.html')
 
+# API: Next carousel page (same contract as the testimonials feature's /api/more)
+@testimony_bp.route('/api/more')
+def more_testimonials():
+    """Lazy-loading endpoint for the home page carousel"""
+    return more_testimonials_response()
+
 # Helper function to get approved testimonials for home page
-def get_approved_testimonials():
-    """Get approved testimonials for display on home page"""
-    return Testimonial.query.filter_by(is_approved=True).order_by(Testimonial.created_at.desc()).all()
+def get_approved_testimonials(limit=None):
+    """Get approved testimonials (all, or the newest `limit`) for display on home page"""
+    return get_testimonial_page(limit=limit)[0]
+
+def get_approved_testimonial_page(after=None, limit=TESTIMONIAL_PAGE_SIZE):
+    """Get one page of approved testimonials for the home page carousel
+    
+    Returns:
+        tuple: (list of Testimonial, cursor for /testimonials/api/more or None)
+    """
+    return get_testimonial_page(after, limit)
@@ -3,7 +3,9 @@ from flask_login import login_required, current_user
 from db import db
 from db.models import Service, SiteSetting, EmailTemplate, User, Testimonial, AboutImage
 from werkzeug.utils import secure_filename
-from utils.site_settings import get_settings_by_language
+from utils.site_settings import get_settings_by_language, invalidate_site_settings
+from utils.email_templates import invalidate_email_templates
+from utils.images import process_upload
 import os
 from functools import wraps
 from datetime import datetime
@@ -152,6 +154,7 @@ def edit_email_template(template_id):
             template.description = request.form.get('description')
             
             db.session.commit()
+            invalidate_email_templates()
             flash('Email template updated successfully!', 'success')
             return redirect(url_for('web_admin_panel.admin_emails'))
             
@@ -176,6 +179,7 @@ def create_email_template():
             
             db.session.add(template)
             db.session.commit()
+            invalidate_email_templates()
             flash('Email template created successfully!', 'success')
             return redirect(url_for('web_admin_panel.admin_emails'))
             
@@ -193,6 +197,7 @@ def delete_email_template(template_id):
         template = EmailTemplate.query.get_or_404(template_id)
         db.session.delete(template)
         db.session.commit()
+        invalidate_email_templates()
         flash('Email template deleted successfully!', 'success')
         
     except Exception as e:
@@ -291,6 +296,9 @@ def update_settings():
                     relative_path = f"uploads/home/{filename}"
                     setting.value = relative_path
                     
+                    # Resized AVIF/WebP/JPEG copies for the hero's srcset
+                    process_upload(current_app.static_folder, relative_path)
+                    
                     current_app.logger.info(f"Successfully uploaded home image: {relative_path} for language: {selected_language}")
                     
                 except Exception as upload_error:
@@ -300,6 +308,7 @@ def update_settings():
                     return redirect(url_for('web_admin_panel.admin_settings'))
         
         db.session.commit()
+        invalidate_site_settings()
         flash(f'Settings updated successfully for {selected_language}!', 'success')
         
     except Exception as e:
@@ -332,9 +341,17 @@ def upload_image():
             
             image_url = f"uploads/{upload_type}/{filename}"
             
+            # Resized AVIF/WebP/JPEG copies for srcset
+            derivatives = process_upload(current_app.static_folder, image_url)
+            db.session.commit()
+            
             return jsonify({
                 'success': True,
                 'image_url': image_url,
+                'derivatives': [
+                    {'format': d.format, 'width': d.width, 'height': d.height, 'path': d.path}
+                    for d in derivatives
+                ],
                 'message': 'Image uploaded successfully'
             })
             
@@ -493,6 +510,8 @@ def create_about_image():
                     file_path = os.path.join(upload_dir, filename)
                     file.save(file_path)
                     image.image_path = f"uploads/about_images/{filename}"
+                    if image.media_type == 'image':
+                        process_upload(current_app.static_folder, image.image_path)
                 else:
                     flash('Media file is required.', 'error')
                     return render_template('admin/edit_about_image.html')
@@ -541,6 +560,8 @@ def edit_about_image(image_id):
                     file_path = os.path.join(upload_dir, filename)
                     file.save(file_path)
                     image.image_path = f"uploads/about_images/{filename}"
+                    if image.media_type == 'image':
+                        process_upload(current_app.static_folder, image.image_path)
             
             db.session.commit()
             flash('About image updated successfully!', 'success')
@@ -770,6 +791,7 @@ def upload_home_image():
             setting.value = relative_path
             
             db.session.commit()
+            invalidate_site_settings()
             current_app.logger.info(f"Database updated with home image: {relative_path} for {language}")
             
             return jsonify({
@@ -8,6 +8,7 @@ import sys
 sys.path.append(os.getcwd())
 
 from flask_app import app
+from utils.notifications import init_notifications
 
 if __name__ == "__main__":
     print("🚀 Starting Flask application...")
@@ -16,6 +17,9 @@ if __name__ == "__main__":
     print("💡 Check the console output for any errors")
     print()
     
+    # Start delivering queued emails and SMS (including any left from a previous run)
+    init_notifications(app)
+    
     try:
         app.run(debug=True, host='0.0.0.0', port=5000)
     except Exception as e:
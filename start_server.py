@@ -7,6 +7,7 @@ Run this script to start the web server
 import os
 import sys
 from flask_app import app
+from utils.notifications import init_notifications
 
 if __name__ == '__main__':
     print("🌟 Starting Serenity Wellness Studio Web Application")
@@ -18,6 +19,9 @@ if __name__ == '__main__':
     print("Press Ctrl+C to stop the server")
     print()
     
+    # Start delivering queued emails and SMS (including any left from a previous run)
+    init_notifications(app)
+    
     try:
         app.run(
             host='127.0.0.1',
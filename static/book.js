@@ -8,6 +8,7 @@ class BookingApp {
         this.selectedTime = null;
         this.services = [];
         this.availableSlots = [];
+        this.dayAvailability = {}; // Slots per YYYY-MM-DD, prefetched a month at a time
         
         this.init();
     }
@@ -192,6 +193,8 @@ class BookingApp {
         const firstDayOfWeek = firstDay.getDay();
         const daysInMonth = lastDay.getDate();
         
+        this.loadMonthAvailability(firstDay, lastDay);
+        
         const monthNames = [
             'January', 'February', 'March', 'April', 'May', 'June',
             'July', 'August', 'September', 'October', 'November', 'December'
@@ -288,12 +291,38 @@ class BookingApp {
         display.textContent = this.selectedDate.toLocaleDateString('en-US', options);
     }
 
+    // Prefetch slot availability for a whole month in one request
+    async loadMonthAvailability(firstDay, lastDay) {
+        try {
+            const start = firstDay.toISOString().split('T')[0];
+            const end = lastDay.toISOString().split('T')[0];
+            const serviceId = this.selectedService ? this.selectedService.id : '';
+            
+            const response = await fetch(`/booking/available-range?start=${start}&end=${end}&service_id=${serviceId}`);
+            if (response.ok) {
+                const range = await response.json();
+                range.days.forEach(day => {
+                    this.dayAvailability[day.date] = day.slots;
+                });
+            }
+        } catch (error) {
+            console.error('Error loading month availability:', error);
+        }
+    }
+
     async loadAvailableSlots(date) {
         try {
             // Fetch available slots from the backend API
             const formattedDate = date.toISOString().split('T')[0]; // YYYY-MM-DD format
             const serviceId = this.selectedService ? this.selectedService.id : '';
             
+            // Use the prefetched month when available
+            if (this.dayAvailability[formattedDate]) {
+                this.availableSlots = this.dayAvailability[formattedDate];
+                this.renderTimeSlots();
+                return;
+            }
+            
             const response = await fetch(`/booking/available-slots?date=${formattedDate}&service_id=${serviceId}`);
             
             if (response.ok) {
@@ -622,6 +651,9 @@ class BookingApp {
             if (response.ok) {
                 const result = await response.json();
                 
+                // Prefetched availability no longer reflects this booking
+                this.dayAvailability = {};
+                
                 // Show special message if the slot was fully booked
                 if (result.isFullyBooked) {
                     this.showFullyBookedSuccess(result);
@@ -715,7 +747,7 @@ class BookingApp {
             <div class="booking-details">
                 <div class="fully-booked-notice">
                     <i class="fas fa-exclamation-triangle"></i>
-                    <strong>Notice:</strong> This time slot is fully booked (${result.bookingCount} people), 
+                    <strong>Notice:</strong> This time slot is fully booked (${result.totalPeople} people), 
                     but your booking has been saved and you will be contacted if a spot becomes available.
                 </div>
                 <h4><i class="fas fa-info-circle"></i> Booking Details</h4>
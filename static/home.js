@@ -540,15 +540,74 @@ class TestimonialsCarousel {
         this.cards = this.grid ? this.grid.querySelectorAll('.testimonial-card') : [];
         this.currentIndex = 0;
         this.cardsToShow = window.innerWidth <= 768 ? 1 : window.innerWidth <= 1024 ? 2 : 3;
+        // Further pages are fetched as the carousel nears its last card
+        this.moreUrl = this.grid ? this.grid.dataset.moreUrl : null;
+        this.nextCursor = this.grid ? this.grid.dataset.nextCursor : null;
+        this.loading = null;
         
         if (this.grid && this.cards.length > 0) {
             this.init();
         }
     }
     
+    hasMore() {
+        return Boolean(this.moreUrl && this.nextCursor);
+    }
+    
+    loadMore() {
+        if (!this.hasMore()) return Promise.resolve();
+        if (this.loading) return this.loading;
+        
+        const url = `${this.moreUrl}?after=${encodeURIComponent(this.nextCursor)}`;
+        this.loading = fetch(url)
+            .then(response => response.ok ? response.json() : Promise.reject(response.status))
+            .then(data => {
+                data.testimonials.forEach(testimonial => this.grid.appendChild(this.buildCard(testimonial)));
+                this.nextCursor = data.next_cursor;
+                this.cards = this.grid.querySelectorAll('.testimonial-card');
+                this.updateButtons();
+            })
+            .catch(error => {
+                console.error('Error loading testimonials:', error);
+                this.nextCursor = null;
+                this.updateButtons();
+            })
+            .finally(() => {
+                this.loading = null;
+            });
+        return this.loading;
+    }
+    
+    buildCard(testimonial) {
+        const card = document.createElement('div');
+        card.className = 'testimonial-card';
+        const content = document.createElement('div');
+        content.className = 'testimonial-content';
+        
+        const stars = document.createElement('div');
+        stars.className = 'stars';
+        stars.textContent = testimonial.stars;
+        const text = document.createElement('p');
+        text.textContent = `"${testimonial.testimonial_text}"`;
+        const author = document.createElement('div');
+        author.className = 'testimonial-author';
+        const name = document.createElement('h4');
+        name.textContent = testimonial.client_name;
+        author.appendChild(name);
+        if (testimonial.client_title) {
+            const title = document.createElement('span');
+            title.textContent = testimonial.client_title;
+            author.appendChild(title);
+        }
+        
+        content.append(stars, text, author);
+        card.appendChild(content);
+        return card;
+    }
+    
     init() {
         // Only show carousel if there are more cards than the display limit
-        if (this.cards.length <= this.cardsToShow) {
+        if (this.cards.length <= this.cardsToShow && !this.hasMore()) {
             this.hideCarouselButtons();
             return;
         }
@@ -567,7 +626,7 @@ class TestimonialsCarousel {
                 this.updateButtons();
                 
                 // Show/hide buttons based on card count
-                if (this.cards.length <= this.cardsToShow) {
+                if (this.cards.length <= this.cardsToShow && !this.hasMore()) {
                     this.hideCarouselButtons();
                 } else {
                     this.showCarouselButtons();
@@ -599,6 +658,14 @@ class TestimonialsCarousel {
             this.currentIndex++;
             this.updateCarousel();
             this.updateButtons();
+            // Prefetch while there is still a full view of cards left
+            if (maxIndex - this.currentIndex < this.cardsToShow) {
+                this.loadMore();
+            }
+        } else if (this.hasMore()) {
+            this.loadMore().then(() => {
+                if (this.currentIndex < this.cards.length - this.cardsToShow) this.next();
+            });
         }
     }
     
@@ -618,7 +685,7 @@ class TestimonialsCarousel {
         const maxIndex = this.cards.length - this.cardsToShow;
         
         this.prevBtn.disabled = this.currentIndex === 0;
-        this.nextBtn.disabled = this.currentIndex >= maxIndex;
+        this.nextBtn.disabled = this.currentIndex >= maxIndex && !this.hasMore();
     }
     
     hideCarouselButtons() {
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tests for asset minification, bundling and precompressed static serving
+"""
+
+import gzip
+import os
+import shutil
+import subprocess
+
+import pytest
+from flask import render_template_string
+
+from utils.asset_pipeline import (
+    BUNDLES, accepted_encodings, build_bundles, bundle_urls, init_precompressed, minify_css, minify_js,
+    precompress
+)
+
+STATIC = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
+
+def test_minify_css():
+    source = """
+    /* header */
+    .a  >  .b , .c {
+        color: red;
+        content: "  keep  /* this */  ";
+    }
+    .e::after { content: ";}"; color: blue; /* last */ }
+    /*! licence */
+    @media (max-width: 600px) { .d { margin: 0 auto; } }
+    """
+    assert minify_css(source) == (
+        '.a>.b,.c{color:red;content:"  keep  /* this */  "}.e::after{content:";}";color:blue}/*! licence */ '
+        '@media (max-width:600px){.d{margin:0 auto}}'
+    )
+
+
+def test_minify_js_keeps_literals():
+    source = """
+    // comment
+    const url = "http://example.com"; /* block */
+    const re = /\\/\\*not a comment*\\//g, half = total / 2 / count;
+    const msg = `a  ${ items.map(i => `<b>${i}</b>`).join('  ') }  b`;
+    if (x) return /[/]+/.test(s);
+    let y = a - -b + +c;
+    """
+    assert minify_js(source) == (
+        'const url="http://example.com";\n'
+        'const re=/\\/\\*not a comment*\\//g,half=total/2/count;\n'
+        "const msg=`a  ${ items.map(i => `<b>${i}</b>`).join('  ') }  b`;\n"
+        'if(x)return/[/]+/.test(s);\n'
+        'let y=a- -b+ +c;\n'
+    )
+
+
+def test_minify_js_keeps_line_breaks_for_asi():
+    assert minify_js('let a = 1\nlet b = a\n++b\n') == 'let a=1\nlet b=a\n++b\n'
+
+
+@pytest.mark.skipif(not shutil.which('node'), reason='node not installed')
+def test_minified_bundles_parse(tmp_path):
+    for name, sources in BUNDLES.items():
+        if name.endswith('.js'):
+            bundle = tmp_path / name
+            bundle.write_text(';\n'.join(minify_js(open(os.path.join(STATIC, s)).read()) for s in sources))
+            result = subprocess.run(['node', '--check', str(bundle)], capture_output=True, text=True)
+            assert result.returncode == 0, result.stderr
+
+
+@pytest.fixture
+def static_app(app, tmp_path):
+    static = tmp_path / 'static'
+    static.mkdir()
+    (static / 'styles.css').write_text('body {\n    color: black;\n}\n' * 50)
+    (static / 'auth.js').write_text('// auth\nfunction login() {\n    return true;\n}\n')
+    (static / 'home.js').write_text('// home\nlogin()\n')
+    app.static_folder = str(static)
+    init_precompressed(app)
+    return app
+
+
+def test_build_bundles(static_app, tmp_path):
+    bundles = {'home.bundle.js': ['auth.js', 'home.js'], 'site.bundle.css': ['styles.css']}
+    results = build_bundles(str(tmp_path / 'static'), bundles)
+    dist = tmp_path / 'static' / 'dist'
+    assert (dist / 'home.bundle.js').read_text() == 'function login(){\nreturn true;\n}\n;\nlogin()\n'
+    assert (dist / 'site.bundle.css').read_text() == 'body{color:black}' * 50
+    assert results['site.bundle.css'][1] < results['site.bundle.css'][0]
+
+
+def test_bundle_urls_fall_back_to_sources(static_app, tmp_path):
+    template = "{% for url in bundle_urls('home.bundle.js') %}{{ url }} {% endfor %}"
+    with static_app.test_request_context():
+        assert render_template_string(template).split() == ['/static/auth.js', '/static/home.js']
+
+        build_bundles(str(tmp_path / 'static'), {'home.bundle.js': BUNDLES['home.bundle.js']})
+        assert bundle_urls('home.bundle.js') == ['/static/dist/home.bundle.js']
+
+        # An edited source outdates the bundle until the next build
+        home = tmp_path / 'static' / 'home.js'
+        home.write_text('login();\n')
+        os.utime(home, ns=(os.stat(home).st_atime_ns, os.stat(home).st_mtime_ns + 10**9))
+        assert bundle_urls('home.bundle.js') == ['/static/auth.js', '/static/home.js']
+
+        static_app.config['ASSET_BUNDLES'] = False
+        build_bundles(str(tmp_path / 'static'), {'home.bundle.js': BUNDLES['home.bundle.js']})
+        assert bundle_urls('home.bundle.js') == ['/static/auth.js', '/static/home.js']
+
+
+def test_accepted_encodings():
+    assert accepted_encodings('gzip, deflate, br') == {'gzip', 'deflate', 'br'}
+    assert accepted_encodings('br;q=0, gzip;q=0.5') == {'gzip'}
+    assert accepted_encodings(None) == set()
+
+
+def test_serves_precompressed_variant(static_app, tmp_path):
+    css = tmp_path / 'static' / 'styles.css'
+    precompress(str(css))
+    client = static_app.test_client()
+
+    response = client.get('/static/styles.css', headers={'Accept-Encoding': 'gzip, deflate'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.mimetype == 'text/css'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert gzip.decompress(response.data) == css.read_bytes()
+
+    response = client.get('/static/styles.css')
+    assert 'Content-Encoding' not in response.headers
+    assert response.data == css.read_bytes()
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+
+def test_prefers_brotli(static_app, tmp_path):
+    css = tmp_path / 'static' / 'styles.css'
+    precompress(str(css))
+    (tmp_path / 'static' / 'styles.css.br').write_bytes(b'brotli bytes')
+    response = static_app.test_client().get('/static/styles.css', headers={'Accept-Encoding': 'gzip, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert response.data == b'brotli bytes'
+
+
+def test_ignores_stale_variant(static_app, tmp_path):
+    css = tmp_path / 'static' / 'styles.css'
+    precompress(str(css))
+    css.write_text('body { color: navy; }')
+    os.utime(css, ns=(os.stat(css).st_atime_ns, os.stat(css).st_mtime_ns + 10**9))
+
+    response = static_app.test_client().get('/static/styles.css', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    assert response.data == b'body { color: navy; }'
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for static asset fingerprinting
+"""
+
+import json
+import os
+
+import pytest
+from flask import Blueprint, url_for
+
+from utils.assets import IMMUTABLE_CACHE_CONTROL, build_asset_manifest, init_assets
+
+
+@pytest.fixture
+def assets_app(app, tmp_path):
+    static = tmp_path / 'static'
+    static.mkdir()
+    (static / 'styles.css').write_text('body { color: black; }')
+    blog_static = tmp_path / 'blog_static'
+    blog_static.mkdir()
+    (blog_static / 'blog.js').write_text('console.log("blog");')
+
+    app.static_folder = str(static)
+    app.config['ASSET_MANIFEST'] = str(tmp_path / 'asset_manifest.json')
+    app.register_blueprint(Blueprint('blog', __name__, static_folder=str(blog_static), static_url_path='/blog/static'))
+    init_assets(app)
+    return app
+
+
+def static_url(app, filename, endpoint='static'):
+    with app.test_request_context():
+        return url_for(endpoint, filename=filename)
+
+
+def test_urls_carry_a_content_hash(assets_app, tmp_path):
+    url = static_url(assets_app, 'styles.css')
+    assert url.startswith('/static/styles.css?v=')
+    assert static_url(assets_app, 'styles.css') == url
+    assert static_url(assets_app, 'blog.js', 'blog.static').startswith('/blog/static/blog.js?v=')
+    assert static_url(assets_app, 'missing.css') == '/static/missing.css'
+
+    # New content, new URL
+    (tmp_path / 'static' / 'styles.css').write_text('body { color: navy; }')
+    assert static_url(assets_app, 'styles.css') != url
+
+
+def test_fingerprinted_responses_are_immutable(assets_app, tmp_path):
+    client = assets_app.test_client()
+    url = static_url(assets_app, 'styles.css')
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == IMMUTABLE_CACHE_CONTROL
+    assert client.get(static_url(assets_app, 'blog.js', 'blog.static')).headers['Cache-Control'] == IMMUTABLE_CACHE_CONTROL
+
+    # Plain and outdated URLs keep revalidating
+    assert client.get('/static/styles.css').headers.get('Cache-Control') != IMMUTABLE_CACHE_CONTROL
+    (tmp_path / 'static' / 'styles.css').write_text('body { color: navy; }')
+    assert client.get(url).headers.get('Cache-Control') != IMMUTABLE_CACHE_CONTROL
+
+
+def test_manifest_round_trip(assets_app, tmp_path):
+    assert build_asset_manifest(assets_app) == 2
+    with open(tmp_path / 'asset_manifest.json') as f:
+        entries = json.load(f)
+    assert {os.path.basename(path) for path in entries} == {'styles.css', 'blog.js'}
+
+    # A new process seeds its hashes from the manifest instead of reading the files
+    fingerprints = init_assets(assets_app)
+    css_path = os.path.realpath(tmp_path / 'static' / 'styles.css')
+    assert fingerprints.entries()[css_path] == entries[css_path]
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for blog full-text search
+"""
+
+import time
+
+import pytest
+
+from utils.blog_search import SearchIndex, analyze, stem
+from utils.blog_store import BlogIndex
+
+
+def make_post(post_id, title, content='', excerpt='', tags=(), date='2025-11-01'):
+    return {'id': post_id, 'title': title, 'slug': f'post-{post_id}', 'category': 'wellness',
+            'excerpt': excerpt, 'content': content, 'author': 'Team', 'published_date': date,
+            'tags': list(tags), 'read_time': 3, 'published': True}
+
+
+POSTS = [
+    make_post(1, 'Sound healing for sleep', '<p>Gongs and bowls help the body heal.</p>', date='2025-11-01'),
+    make_post(2, 'Breathwork basics', '<p>Breathing exercises and sound healing sessions.</p>', date='2025-11-03'),
+    make_post(3, 'Meditation guide', '<p>Meditating daily reduces stress. Healing takes time.</p>',
+              excerpt='Why we meditate', tags=('Mindfulness',), date='2025-11-02'),
+]
+
+
+@pytest.mark.parametrize('word, expected', [
+    ('healing', 'heal'), ('heals', 'heal'), ('meditation', 'medit'), ('meditating', 'medit'),
+    ('relaxation', 'relax'), ('ponies', 'poni'), ('running', 'run'), ('happy', 'happi'),
+])
+def test_stemming(word, expected):
+    assert stem(word) == expected
+
+
+def test_analyze_strips_html_and_entities():
+    assert analyze('<h3>Sound &amp; Healing</h3>') == ['sound', 'heal']
+
+
+def ids(index, query):
+    return [post['id'] for post in index.search(query)]
+
+
+def test_title_matches_rank_first():
+    index = BlogIndex(POSTS)
+    assert ids(index, 'healing') == [1, 2, 3]  # Title match beats body matches
+    assert ids(index, 'heals') == [1, 2, 3]  # Same stem
+    assert ids(index, 'mindfulness') == [3]  # Tags are searchable
+
+
+def test_every_term_must_match():
+    index = BlogIndex(POSTS)
+    assert ids(index, 'sound sleep') == [1]
+    assert ids(index, 'sound unicorn') == []
+
+
+def test_phrase_queries():
+    index = BlogIndex(POSTS)
+    assert set(ids(index, 'healing sound')) == {1, 2}
+    assert ids(index, '"healing sound"') == []
+    assert ids(index, '"sound healing sessions"') == [2]
+
+
+def test_prefix_matches_partial_words():
+    index = BlogIndex(POSTS)
+    assert ids(index, 'medit') == [3]
+    assert ids(index, 'breath') == [2]
+    # The typed word is matched too, not only its stem
+    assert ids(index, 'breathin') == [2]
+    assert ids(index, 'meditati') == [3]
+
+
+def test_prefix_matches_alongside_exact_stems():
+    index = BlogIndex(POSTS + [make_post(4, 'Eating healthy', date='2025-10-01')])
+    assert set(ids(index, 'heal')) == {1, 2, 3, 4}
+
+
+def test_quoted_words_match_exactly():
+    index = BlogIndex(POSTS)
+    assert ids(index, '"medit"') == []  # Shares meditation's stem, but isn't a word of the post
+    assert ids(index, '"meditation"') == [3]
+    assert ids(index, '"meditating daily"') == [3]
+
+
+def test_ties_are_newest_first():
+    index = BlogIndex([make_post(1, 'Gong', date='2025-01-01'), make_post(2, 'Gong', date='2025-02-01')])
+    assert ids(index, 'gong') == [2, 1]
+
+
+def test_rebuild_only_reanalyses_changed_posts(monkeypatch):
+    first = SearchIndex.build(POSTS)
+
+    analysed = []
+    import utils.blog_search as blog_search
+    real_analyze_post = blog_search.analyze_post
+    monkeypatch.setattr(blog_search, 'analyze_post', lambda post: analysed.append(post['id']) or real_analyze_post(post))
+
+    edited = [POSTS[0], dict(POSTS[1], title='Crystal bowls'), make_post(4, 'Reiki')]
+    second = SearchIndex.build(edited, first)
+    assert analysed == [2, 4]
+    assert second.documents[1] is first.documents[1]
+
+    assert set(second.postings['bowl']) == {1, 2}
+    assert 'reiki' in second.postings
+    assert 3 not in second.postings.get('medit', {})
+    assert 'breathwork' not in second.postings
+    # The previous version is untouched
+    assert 'breathwork' in first.postings and 3 in first.postings['medit']
+    assert first.word_counts['healing'] == 3 and second.word_counts['healing'] == 2
+    assert 'breathwork' not in second.words and 'crystal' in second.words
+
+
+def test_search_is_fast_on_a_large_archive():
+    words = [f'word{i}' for i in range(5000)]
+    posts = [
+        make_post(i, f'{words[i % 5000]} {words[(i * 7) % 5000]}',
+                  ' '.join(words[(i * j) % 5000] for j in range(200)))
+        for i in range(1, 1001)
+    ]
+    index = BlogIndex(posts)
+    index.search('word42 word7')  # Warm up
+
+    start = time.perf_counter()
+    for _ in range(100):
+        index.search('word42 word7')
+        index.search('"word3 word6"')
+    assert (time.perf_counter() - start) / 200 < 0.005
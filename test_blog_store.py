@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Tests for the indexed blog post store
+"""
+
+import json
+import os
+
+import pytest
+
+from features.blog.blog import blog_bp, default_blog_data
+from utils.blog_store import BlogIndex, JsonBlogStore, SqliteBlogStore, create_blog_store, write_posts_to_sqlite
+
+
+def make_post(post_id, date, category='science', tags=('Sound',), published=True):
+    return {
+        'id': post_id, 'title': f'Post {post_id}', 'slug': f'post-{post_id}', 'category': category,
+        'excerpt': f'Excerpt {post_id}', 'content': f'<p>Body of post {post_id}</p>', 'author': 'Team',
+        'published_date': date, 'tags': list(tags), 'read_time': 3, 'published': published,
+        'featured_image': 'blogg.png'
+    }
+
+
+POSTS = [
+    make_post(1, '2025-11-01', tags=('Sound', 'Sleep')),
+    make_post(2, '2025-11-05', category='wellness', tags=('sound',)),
+    make_post(3, '2025-11-03', published=False),
+    make_post(4, '2025-11-05', category='wellness', tags=('Breath',)),
+]
+
+
+def write_json(path, posts, mtime_ns=None):
+    with open(path, 'w') as f:
+        json.dump({'posts': posts}, f)
+    if mtime_ns:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_index_matches_the_old_filters():
+    index = BlogIndex(POSTS)
+    # Newest first, ties in file order, unpublished left out
+    assert [p['id'] for p in index.published] == [2, 4, 1]
+    assert index.get_post('post-4')['id'] == 4
+    assert index.get_post('post-3') is None
+    assert [p['id'] for p in index.posts_in_category('wellness')] == [2, 4]
+    assert index.posts_in_category('unknown') == ()
+    assert [p['id'] for p in index.posts_tagged('SOUND')] == [2, 1]
+    assert [p['id'] for p in index.api_posts] == [1, 2, 4]
+    assert 'content' not in index.api_posts[0]
+
+
+def test_json_store_reloads_only_when_the_file_changes(tmp_path):
+    path = tmp_path / 'blog_data.json'
+    write_json(path, POSTS[:2], mtime_ns=1_000_000_000)
+    store = JsonBlogStore(str(path))
+
+    first = store.get_index()
+    assert store.get_index() is first
+    assert len(first.published) == 2
+
+    write_json(path, POSTS, mtime_ns=2_000_000_000)
+    second = store.get_index()
+    assert second is not first
+    assert len(second.published) == 3
+
+
+def test_missing_json_file_serves_the_default(tmp_path):
+    store = JsonBlogStore(str(tmp_path / 'missing.json'), default_blog_data)
+    assert len(store.get_index().published) == len(default_blog_data()['posts'])
+    assert JsonBlogStore(str(tmp_path / 'missing.json')).get_index().published == ()
+
+
+def test_sqlite_store(tmp_path):
+    path = str(tmp_path / 'blog.sqlite')
+    store = create_blog_store({'BLOG_STORE': 'sqlite', 'BLOG_DB_FILE': path})
+    assert isinstance(store, SqliteBlogStore)
+    assert store.get_index().published == ()
+
+    write_posts_to_sqlite(path, POSTS)
+    index = store.get_index()
+    assert [p['id'] for p in index.posts] == [1, 2, 3, 4]
+    assert store.get_index() is index
+
+    write_posts_to_sqlite(path, POSTS[:1])
+    os.utime(path, ns=(3_000_000_000, 3_000_000_000))
+    assert [p['id'] for p in store.get_index().published] == [1]
+
+
+@pytest.fixture
+def blog_client(app, tmp_path):
+    path = tmp_path / 'blog_data.json'
+    write_json(path, POSTS)
+    app.config['BLOG_DATA_FILE'] = str(path)
+    app.register_blueprint(blog_bp)
+    return app.test_client()
+
+
+def test_writers_use_the_configured_file(app, blog_client, tmp_path):
+    from features.blog.blog import load_blog_data, save_blog_data
+
+    data = load_blog_data()
+    assert [post['id'] for post in data['posts']] == [1, 2, 3, 4]
+    data['posts'].append(make_post(5, '2025-11-09'))
+    save_blog_data(data)
+
+    assert len(json.loads((tmp_path / 'blog_data.json').read_text())['posts']) == 5
+    assert blog_client.get('/blog/post/post-5').status_code == 200
+
+
+def test_routes_use_the_index(blog_client, monkeypatch):
+    # Parsing happens once, on the first request
+    loads = []
+    real_load = json.load
+    monkeypatch.setattr(json, 'load', lambda f: loads.append(1) or real_load(f))
+
+    assert blog_client.get('/blog/').status_code == 200
+    assert blog_client.get('/blog/post/post-2').status_code == 200
+    assert blog_client.get('/blog/post/post-3').status_code == 302
+    assert blog_client.get('/blog/tag/sound').status_code == 200
+    assert blog_client.get('/blog/category/wellness').status_code == 200
+    posts = blog_client.get('/blog/api/posts').get_json()['posts']
+    assert [p['slug'] for p in posts] == ['post-1', 'post-2', 'post-4']
+    assert len(loads) == 1
+
+
+def test_related_posts_are_ranked_by_tag_overlap_and_category():
+    posts = [
+        make_post(1, '2025-11-01', category='wellness', tags=('Sound', 'Sleep', 'Gong')),
+        make_post(2, '2025-11-02', category='science', tags=('Sound',)),  # Shares only a common tag
+        make_post(3, '2025-11-03', category='science', tags=('Sleep', 'Gong')),  # Shares two rarer tags
+        make_post(4, '2025-11-04', category='wellness', tags=('Breath',)),  # Same category only
+        make_post(5, '2025-11-05', category='science', tags=('Sound',)),
+        make_post(6, '2025-11-06', category='ai', tags=('Robots',)),  # Unrelated
+        make_post(7, '2025-11-07', category='science', tags=('Sound', 'Sleep', 'Gong'), published=False),
+    ]
+    index = BlogIndex(posts)
+
+    # Two rarer shared tags beat one common tag, which beats a shared category alone
+    assert [p['id'] for p in index.related_posts(index.get_post('post-1'))] == [3, 5, 2]
+    assert [p['id'] for p in index.related_posts(index.get_post('post-4'))] == [1]
+    assert [p['id'] for p in index.related_posts(index.get_post('post-2'))] == [5, 1, 3]
+    # Posts 5 and 2 tie on category alone; the newer one comes first
+    assert [p['id'] for p in index.related_posts(index.get_post('post-3'))] == [1, 5, 2]
+    assert index.related_posts(index.get_post('post-6')) == ()
+    assert all(p['id'] != 7 for related in index.related.values() for p in related)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for the windowed, conditional /booking/events feed
+"""
+
+from datetime import datetime
+
+from db import db
+from db.models import Booking
+
+
+def add_booking(start, end, name='Test'):
+    booking = Booking(user_name=name, email='test@example.com', start_time=start, end_time=end)
+    db.session.add(booking)
+    db.session.commit()
+    return booking
+
+
+def test_events_window_filters_overlapping_bookings(client):
+    add_booking(datetime(2025, 8, 31, 23, 0), datetime(2025, 9, 1, 1, 0), 'Overlaps start')
+    add_booking(datetime(2025, 9, 15, 9, 0), datetime(2025, 9, 15, 10, 0), 'Inside')
+    add_booking(datetime(2025, 10, 6, 9, 0), datetime(2025, 10, 6, 10, 0), 'After')
+    add_booking(datetime(2025, 8, 1, 9, 0), datetime(2025, 8, 1, 10, 0), 'Before')
+
+    response = client.get('/booking/events?start=2025-09-01T00:00:00Z&end=2025-10-06T00:00:00Z')
+    assert response.status_code == 200
+    titles = [event['title'].split(' (')[0] for event in response.get_json()]
+    assert titles == ['Overlaps start', 'Inside']
+
+    # Without a window the full feed is still served
+    assert len(client.get('/booking/events').get_json()) == 4
+
+
+def test_events_etag_revalidation(client):
+    booking = add_booking(datetime(2025, 9, 15, 9, 0), datetime(2025, 9, 15, 10, 0))
+    url = '/booking/events?start=2025-09-01&end=2025-10-01'
+
+    first = client.get(url)
+    etag = first.headers['ETag']
+    assert first.headers['Last-Modified']
+    assert 'no-cache' in first.headers['Cache-Control']
+
+    cached = client.get(url, headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.data == b''
+
+    # A different window is a different representation
+    assert client.get('/booking/events?start=2025-10-01&end=2025-11-01', headers={'If-None-Match': etag}).status_code == 200
+
+    # Cancelling changes the feed, so the old ETag no longer matches
+    client.post(f'/booking/events/{booking.id}/cancel')
+    changed = client.get(url, headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+    assert changed.get_json()[0]['title'].endswith('cancelled')
+
+
+def test_events_etag_changes_on_delete(client):
+    booking = add_booking(datetime(2025, 9, 15, 9, 0), datetime(2025, 9, 15, 10, 0))
+    add_booking(datetime(2025, 9, 16, 9, 0), datetime(2025, 9, 16, 10, 0))
+    etag = client.get('/booking/events').headers['ETag']
+
+    db.session.delete(booking)
+    db.session.commit()
+    assert client.get('/booking/events', headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_events_if_modified_since(client):
+    add_booking(datetime(2025, 9, 15, 9, 0), datetime(2025, 9, 15, 10, 0))
+    last_modified = client.get('/booking/events').headers['Last-Modified']
+
+    assert client.get('/booking/events', headers={'If-Modified-Since': last_modified}).status_code == 304
+    assert client.get('/booking/events', headers={'If-Modified-Since': 'Mon, 01 Jan 2001 00:00:00 GMT'}).status_code == 200
+
+
+def test_events_rejects_bad_window(client):
+    assert client.get('/booking/events?start=not-a-date').status_code == 400
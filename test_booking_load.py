@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Load test: concurrent booking POSTs must never push a slot past capacity
+"""
+
+import random
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from db.models import Booking
+from utils.slot_occupancy import SLOT_CAPACITY, INACTIVE_STATUSES, occupied_slot_times, get_slots_occupancy
+
+REQUESTS = 300
+WORKERS = 32
+ONE_HOUR_BOOKINGS = {
+    '2025-09-10T09:00:00': '2025-09-10T10:00:00',
+    '2025-09-10T09:30:00': '2025-09-10T10:30:00',
+    '2025-09-10T10:00:00': '2025-09-10T11:00:00',
+}
+
+
+def test_parallel_posts_never_exceed_capacity(app):
+    rng = random.Random(42)
+    payloads = []
+    for i in range(REQUESTS):
+        start = rng.choice(list(ONE_HOUR_BOOKINGS))
+        payloads.append({
+            "user_name": f"Load {i}",
+            "email": f"load{i}@example.com",
+            "start_time": start,
+            "end_time": ONE_HOUR_BOOKINGS[start],
+            "num_people": rng.randint(1, 4)
+        })
+
+    def post(payload):
+        with app.test_client() as client:
+            response = client.post('/booking/events', json=payload)
+            return response.status_code, response.get_json()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        results = list(pool.map(post, payloads))
+    elapsed = time.perf_counter() - started
+
+    assert all(status == 201 for status, _ in results), [r for r in results if r[0] != 201][:3]
+    print(f"\n⚡ {REQUESTS} bookings in {elapsed:.2f}s ({REQUESTS / elapsed:.0f} req/s)")
+
+    # Recount from the booking rows themselves, independent of slot_occupancy
+    people = Counter()
+    for booking in Booking.query.filter(Booking.status.notin_(INACTIVE_STATUSES)):
+        for slot_time in occupied_slot_times(booking.start_time, booking.end_time):
+            people[slot_time] += booking.num_people
+
+    assert people, "no booking was accepted"
+    assert max(people.values()) <= SLOT_CAPACITY
+    assert {slot: total for slot, (total, _) in get_slots_occupancy(list(people)).items()} == dict(people)
+    assert Booking.query.count() == REQUESTS
+    assert Booking.query.filter_by(status='waitlist').count() > 0
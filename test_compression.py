@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests for the response compression middleware
+"""
+
+import gzip
+import types
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Response, jsonify, make_response, request, stream_with_context
+
+import utils.compression
+from db import db
+from db.models import Booking
+from utils.compression import choose_coding, init_compression, with_app_etags
+
+PAGE = '<p>' + 'Sound healing session. ' * 200 + '</p>'
+
+
+@pytest.fixture
+def compressed_app(app):
+    @app.route('/page')
+    def page():
+        return PAGE
+
+    @app.route('/small')
+    def small():
+        return '<p>tiny</p>'
+
+    @app.route('/tagged')
+    def tagged():
+        response = make_response(jsonify(items=[PAGE]))
+        response.set_etag('v1')
+        return response.make_conditional(request)
+
+    @app.route('/stream')
+    def stream():
+        return Response(stream_with_context(iter([PAGE, PAGE])), mimetype='text/html')
+
+    @app.route('/encoded')
+    def encoded():
+        response = make_response(gzip.compress(PAGE.encode()))
+        response.content_type = 'text/html; charset=utf-8'
+        response.content_encoding = 'gzip'
+        return response
+
+    @app.route('/image')
+    def image():
+        return Response(b'\0' * 5000, mimetype='image/png')
+
+    init_compression(app)
+    return app
+
+
+def test_choose_coding(monkeypatch):
+    assert choose_coding('gzip, deflate, br') == 'gzip'
+    assert choose_coding('gzip;q=0') is None
+    assert choose_coding('*') == 'gzip'
+    assert choose_coding(None) is None
+    monkeypatch.setattr(utils.compression, 'brotli', types.SimpleNamespace(compress=lambda data, quality: b'br'))
+    assert choose_coding('gzip, br') == 'br'
+    assert choose_coding('gzip, br;q=0') == 'gzip'
+
+
+def test_compresses_large_text_responses(compressed_app):
+    client = compressed_app.test_client()
+    response = client.get('/page', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert int(response.headers['Content-Length']) == len(response.data) < len(PAGE)
+    assert gzip.decompress(response.data).decode() == PAGE
+
+    plain = client.get('/page')
+    assert 'Content-Encoding' not in plain.headers
+    assert plain.headers['Vary'] == 'Accept-Encoding'
+    assert plain.get_data(as_text=True) == PAGE
+
+
+def test_passes_through_ineligible_responses(compressed_app):
+    client = compressed_app.test_client()
+    headers = {'Accept-Encoding': 'gzip'}
+
+    assert 'Content-Encoding' not in client.get('/small', headers=headers).headers
+    assert 'Content-Encoding' not in client.get('/image', headers=headers).headers
+
+    streamed = client.get('/stream', headers=headers)
+    assert 'Content-Encoding' not in streamed.headers
+    assert streamed.get_data(as_text=True) == PAGE * 2
+
+    # Already encoded by the view: sent exactly as it was, not compressed twice
+    encoded = client.get('/encoded', headers=headers)
+    assert encoded.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(encoded.data).decode() == PAGE
+
+    head = client.head('/page', headers=headers)
+    assert 'Content-Encoding' not in head.headers
+
+
+def test_tagged_bodies_are_compressed_once(compressed_app, monkeypatch):
+    calls = []
+    original = utils.compression.compress
+    monkeypatch.setattr(utils.compression, 'compress', lambda *args: calls.append(args) or original(*args))
+    client = compressed_app.test_client()
+
+    first = client.get('/tagged', headers={'Accept-Encoding': 'gzip'})
+    second = client.get('/tagged', headers={'Accept-Encoding': 'gzip'})
+    assert first.headers['ETag'] == '"v1-gzip"'
+    assert second.data == first.data
+    assert len(calls) == 1
+
+    # Untagged bodies may differ between requests, so they're never cached
+    client.get('/page', headers={'Accept-Encoding': 'gzip'})
+    client.get('/page', headers={'Accept-Encoding': 'gzip'})
+    assert len(calls) == 3
+
+
+def test_revalidating_a_compressed_copy(compressed_app):
+    client = compressed_app.test_client()
+    response = client.get('/tagged', headers={'Accept-Encoding': 'gzip', 'If-None-Match': '"v1-gzip"'})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == '"v1-gzip"'
+
+    # The uncompressed copy keeps its own ETag
+    response = client.get('/tagged', headers={'If-None-Match': '"v1"'})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == '"v1"'
+    response = client.get('/tagged', headers={'Accept-Encoding': 'gzip', 'If-None-Match': '"v1"'})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == '"v1"'
+
+
+def test_with_app_etags():
+    assert with_app_etags('"a-gzip", "b"', 'gzip') == '"a-gzip", "b", "a"'
+    assert with_app_etags('"a-gzip"', 'br') == '"a-gzip"'
+
+
+def test_booking_events_are_compressed(compressed_app):
+    start = datetime(2030, 1, 1, 10)
+    for day in range(30):
+        db.session.add(Booking(user_name=f"Guest {day}", email='test@example.com',
+                               start_time=start + timedelta(days=day), end_time=start + timedelta(days=day, hours=1)))
+    db.session.commit()
+    client = compressed_app.test_client()
+
+    response = client.get('/booking/events', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert len(gzip.decompress(response.data)) > len(response.data)
+
+    # The events view's own version ETag still short-circuits revalidation
+    etag = response.headers['ETag']
+    assert etag.endswith('-gzip"')
+    assert client.get('/booking/events', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag}).status_code == 304
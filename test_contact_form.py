@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the queued contact form
+"""
+
+import json
+
+import pytest
+
+import utils.notifications as notifications
+from db.models import NotificationJob
+from utils.notifications import drain_outbox
+
+
+@pytest.fixture
+def contact_client(app):
+    from routes.main import main_bp
+
+    app.register_blueprint(main_bp)
+    return app.test_client()
+
+
+def submit(client, **overrides):
+    form = {'name': 'Ana', 'email': 'ana@example.com', 'phone': '', 'message': 'Do you have evening classes?'}
+    form.update(overrides)
+    return client.post('/contact', data=form)
+
+
+def test_contact_form_returns_202_without_sending(app, contact_client, monkeypatch):
+    def fail_if_called(app, payload):
+        raise AssertionError('mail must not be sent inside the request')
+
+    monkeypatch.setitem(notifications.SENDERS, 'email', fail_if_called)
+    app.config['MAIL_USERNAME'] = 'studio@example.com'
+
+    response = submit(contact_client)
+    data = response.get_json()
+    assert response.status_code == 202
+    assert data['status'] == 'success'
+
+    recipients = sorted(json.loads(job.payload)['recipients'][0] for job in NotificationJob.query.all())
+    assert recipients == ['ana@example.com', 'studio@example.com']
+
+    status = contact_client.get(data['status_url']).get_json()
+    assert status['delivery'] == 'pending'
+    assert {job['status'] for job in status['messages'].values()} == {'pending'}
+
+
+def test_contact_status_reports_delivery(app, contact_client, monkeypatch):
+    sent = []
+    monkeypatch.setitem(notifications.SENDERS, 'email', lambda app, payload: sent.append(payload['recipients']))
+
+    status_url = submit(contact_client).get_json()['status_url']
+    assert drain_outbox(app) == 2
+
+    status = contact_client.get(status_url).get_json()
+    assert status['delivery'] == 'delivered'
+    assert status['messages']['confirmation']['attempts'] == 1
+    assert ['ana@example.com'] in sent
+
+
+def test_contact_status_reports_failure(app, contact_client, monkeypatch):
+    app.config['NOTIFICATION_MAX_ATTEMPTS'] = 1
+
+    def broken(app, payload):
+        raise ConnectionError('SMTP down')
+
+    monkeypatch.setitem(notifications.SENDERS, 'email', broken)
+    status_url = submit(contact_client).get_json()['status_url']
+    drain_outbox(app)
+
+    assert contact_client.get(status_url).get_json()['delivery'] == 'failed'
+
+
+def test_contact_form_validation_and_unknown_status(contact_client):
+    assert submit(contact_client, email='not-an-email').status_code == 400
+    assert NotificationJob.query.count() == 0
+    assert contact_client.get('/contact/status/unknown').status_code == 404
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for compiled, cached email template rendering
+"""
+
+import pytest
+
+import utils.email_templates as email_templates
+from db import db
+from db.models import EmailTemplate, NotificationJob
+from utils.email_templates import compile_template, invalidate_email_templates, render_compiled, render_email_template
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    invalidate_email_templates()
+    yield
+    invalidate_email_templates()
+
+
+def add_template(subject='Booked: {service_name}', body='Hello {user_name}, see you at {start_time}.'):
+    template = EmailTemplate(name='booking_confirmation', subject=subject, body=body)
+    db.session.add(template)
+    db.session.commit()
+    return template
+
+
+def test_compiled_render_matches_placeholders():
+    plan = compile_template('Hi {user_name} ({num_people} {people_text}) {unknown} {not-a-var}')
+    assert plan[1] == ('user_name', 'num_people', 'people_text', 'unknown')
+
+    rendered = render_compiled(plan, {'user_name': 'Ana', 'num_people': 2, 'people_text': 'people'})
+    assert rendered == 'Hi Ana (2 people) {unknown} {not-a-var}'
+
+
+def test_values_are_not_re_substituted():
+    # A value that looks like a placeholder is inserted literally, not expanded again
+    plan = compile_template('{user_name} <{email}>')
+    assert render_compiled(plan, {'user_name': '{email}', 'email': 'a@example.com'}) == '{email} <a@example.com>'
+
+
+def test_cached_render_only_checks_the_version(app, record_queries):
+    add_template()
+    values = {'user_name': 'Ana', 'service_name': 'Sound Bath', 'start_time': '9:00'}
+
+    assert render_email_template('booking_confirmation', values) == (
+        'Booked: Sound Bath', 'Hello Ana, see you at 9:00.'
+    )
+    with record_queries() as statements:
+        render_email_template('booking_confirmation', values)
+    assert len(statements) == 1
+    assert 'content_versions' in statements[0][0]
+
+
+def test_edits_invalidate_the_cache(app, monkeypatch):
+    template = add_template()
+    compiles = []
+    original = email_templates.CompiledEmailTemplate
+
+    def counting(template):
+        compiles.append(template.id)
+        return original(template)
+
+    monkeypatch.setattr(email_templates, 'CompiledEmailTemplate', counting)
+    render_email_template('booking_confirmation', {})
+    render_email_template('booking_confirmation', {})
+    assert compiles == [template.id]
+
+    # Edited within the same second, so updated_at may not change
+    template.body = 'Updated for {user_name}'
+    db.session.commit()
+    assert render_email_template('booking_confirmation', {'user_name': 'Ana'})[1] == 'Updated for Ana'
+    assert compiles == [template.id, template.id]
+
+    db.session.delete(template)
+    db.session.commit()
+    assert render_email_template('booking_confirmation', {}) is None
+
+
+def test_booking_confirmation_uses_the_template(app, client):
+    app.config.update(MAIL_USERNAME='studio@example.com', MAIL_PASSWORD='secret')
+    add_template(body='Dear {user_name}, {num_people} {people_text} booked.')
+
+    client.post('/booking/events', json={
+        "user_name": "Ana", "email": "ana@example.com", "num_people": 2,
+        "start_time": "2025-09-10T09:00:00", "end_time": "2025-09-10T10:00:00"
+    })
+    job = NotificationJob.query.filter(NotificationJob.dedup_key.like('%:confirmation:email')).one()
+    assert 'Dear Ana, 2 people booked.' in job.payload
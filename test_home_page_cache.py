@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the cached, pre-compressed home page
+"""
+
+import gzip
+
+import pytest
+
+import routes.main as main
+from db import db
+from db import models
+from db.models import AboutImage, Service, SiteSetting
+from utils.page_cache import invalidate_page_cache
+
+
+@pytest.fixture
+def home_client(app, monkeypatch):
+    app.register_blueprint(main.main_bp)
+    invalidate_page_cache()
+
+    renders = []
+
+    def fake_render(template, services, settings, testimonials, about_images, current_language, **kwargs):
+        renders.append(current_language)
+        names = ', '.join(service.name for service in services)
+        return (f"<html>{current_language}: {settings.get('site_title')} | {names} | "
+                f"{len(testimonials)} | {len(about_images)}</html>")
+
+    monkeypatch.setattr(main, 'render_template', fake_render)
+    db.session.add_all([
+        Service(name='Sound Bath', description='Gongs', price=40, duration=60, language='ENG'),
+        Service(name='Дууны эмчилгээ', description='Гонг', price=40, duration=60, language='MON'),
+        SiteSetting(key='site_title', value='Serenity', language='ENG'),
+    ])
+    db.session.commit()
+
+    client = app.test_client()
+    client.renders = renders
+    yield client
+    invalidate_page_cache()
+
+
+def test_repeat_visits_are_served_from_cache(home_client, record_queries):
+    first = home_client.get('/')
+    assert first.status_code == 200
+    assert first.get_data(as_text=True) == '<html>ENG: Serenity | Sound Bath | 0 | 0</html>'
+
+    with record_queries() as statements:
+        second = home_client.get('/')
+    assert second.get_data() == first.get_data()
+    assert second.headers['ETag'] == first.headers['ETag']
+    assert home_client.renders == ['ENG']
+    assert len(statements) == 1
+    assert 'content_versions' in statements[0][0]
+
+
+def test_languages_are_cached_separately(home_client):
+    assert 'Дууны эмчилгээ' in home_client.get('/?lang=MON').get_data(as_text=True)
+    assert 'Sound Bath' in home_client.get('/?lang=ENG').get_data(as_text=True)
+    home_client.get('/?lang=MON')
+    assert home_client.renders == ['MON', 'ENG']
+
+
+def test_gzip_and_conditional_requests(home_client):
+    plain = home_client.get('/')
+    compressed = home_client.get('/', headers={'Accept-Encoding': 'gzip, deflate'})
+
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(compressed.get_data()) == plain.get_data()
+    assert compressed.headers['ETag'] != plain.headers['ETag']
+    assert 'Accept-Encoding' in compressed.headers['Vary']
+    assert 'no-cache' in compressed.headers['Cache-Control']
+
+    not_modified = home_client.get('/', headers={'Accept-Encoding': 'gzip',
+                                                 'If-None-Match': compressed.headers['ETag']})
+    assert not_modified.status_code == 304
+    assert not_modified.get_data() == b''
+
+
+@pytest.mark.parametrize('change', ['service', 'setting', 'testimonial', 'about_image'])
+def test_content_changes_invalidate(home_client, change):
+    etag = home_client.get('/').headers['ETag']
+
+    if change == 'service':
+        Service.query.filter_by(name='Sound Bath').one().name = 'Gong Bath'
+    elif change == 'setting':
+        SiteSetting.query.filter_by(key='site_title').one().value = 'Serenity Studio'
+    elif change == 'testimonial':
+        db.session.add(models.Testimonial(client_name='Ana', testimonial_text='Lovely', is_approved=True))
+    else:
+        db.session.add(AboutImage(title='Studio', image_path='uploads/a.jpg'))
+    db.session.commit()
+
+    response = home_client.get('/', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert home_client.renders == ['ENG', 'ENG']
+
+
+def test_logged_in_and_flash_sessions_bypass_the_cache(home_client):
+    home_client.get('/')
+    with home_client.session_transaction() as session:
+        session['_user_id'] = '1'
+
+    response = home_client.get('/')
+    assert response.status_code == 200
+    assert 'ETag' not in response.headers
+    assert home_client.renders == ['ENG', 'ENG']
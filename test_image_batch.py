@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the batch image re-encoding job
+"""
+
+import os
+import random
+
+import pytest
+from PIL import Image
+
+from utils.image_batch import find_images, format_report, load_manifest, run_batch
+
+FORMATS = ['webp', 'jpeg']
+
+
+def noisy_png(path, size):
+    """A PNG that compresses badly, like a photo saved as PNG"""
+    random.seed(str(path))
+    image = Image.frombytes('RGB', size, random.randbytes(size[0] * size[1] * 3))
+    image.save(path)
+
+
+@pytest.fixture
+def static_folder(tmp_path):
+    folder = tmp_path / 'static'
+    (folder / 'images' / 'derivatives').mkdir(parents=True)
+    (folder / 'uploads' / 'home').mkdir(parents=True)
+    noisy_png(folder / 'images' / 'hero.png', (1000, 600))
+    noisy_png(folder / 'uploads' / 'home' / 'bowl.png', (600, 400))
+    Image.new('RGB', (600, 400), 'white').save(folder / 'uploads' / 'home' / 'bowl.jpg')
+    (folder / 'images' / 'derivatives' / 'old-480w.webp').write_bytes(b'')  # Never an input
+    (folder / 'images' / 'notes.txt').write_text('not an image')
+    return folder
+
+
+def run(static_folder, tmp_path, **kwargs):
+    return run_batch(str(static_folder), str(tmp_path / 'manifest.json'), formats=FORMATS, workers=2, **kwargs)
+
+
+def test_finds_originals_only(static_folder):
+    assert find_images(str(static_folder)) == ['images/hero.png', 'uploads/home/bowl.jpg', 'uploads/home/bowl.png']
+
+
+def test_encodes_then_skips_unchanged_files(static_folder, tmp_path):
+    report = run(static_folder, tmp_path)
+    assert report['encoded'] == ['images/hero.png', 'uploads/home/bowl.jpg', 'uploads/home/bowl.png']
+    assert os.path.exists(static_folder / 'images' / 'derivatives' / 'hero-png-768w.webp')
+    # Same name, different source extension: no collision
+    assert os.path.exists(static_folder / 'uploads' / 'home' / 'derivatives' / 'bowl-jpg-480w.jpg')
+    assert os.path.exists(static_folder / 'uploads' / 'home' / 'derivatives' / 'bowl-png-480w.jpg')
+    assert report['saved_bytes'] > 0
+    assert 'Saved' in format_report(report)
+
+    derivative = static_folder / 'images' / 'derivatives' / 'hero-png-480w.webp'
+    mtime = os.stat(derivative).st_mtime_ns
+    report = run(static_folder, tmp_path)
+    assert report['encoded'] == []
+    assert len(report['skipped']) == 3
+    assert os.stat(derivative).st_mtime_ns == mtime
+
+    # Only the edited file is re-encoded
+    noisy_png(static_folder / 'images' / 'hero.png', (900, 600))
+    assert run(static_folder, tmp_path)['encoded'] == ['images/hero.png']
+
+
+def test_missing_derivatives_or_new_settings_re_encode(static_folder, tmp_path):
+    run(static_folder, tmp_path)
+    os.remove(static_folder / 'uploads' / 'home' / 'derivatives' / 'bowl-png-480w.webp')
+    assert run(static_folder, tmp_path)['encoded'] == ['uploads/home/bowl.png']
+
+    report = run_batch(str(static_folder), str(tmp_path / 'manifest.json'), formats=['jpeg'], workers=1)
+    assert len(report['encoded']) == 3
+
+
+def test_manifest_tracks_the_current_tree(static_folder, tmp_path):
+    run(static_folder, tmp_path)
+    os.remove(static_folder / 'uploads' / 'home' / 'bowl.jpg')
+    (static_folder / 'images' / 'broken.jpg').write_bytes(b'not really a jpeg')
+
+    report = run(static_folder, tmp_path)
+    assert list(report['failed']) == ['images/broken.jpg']
+    files = load_manifest(str(tmp_path / 'manifest.json'))['files']
+    assert sorted(files) == ['images/hero.png', 'uploads/home/bowl.png']
+
+
+def test_deleted_originals_lose_their_derivatives(static_folder, tmp_path):
+    run(static_folder, tmp_path)
+    derivatives = static_folder / 'uploads' / 'home' / 'derivatives'
+    os.remove(static_folder / 'uploads' / 'home' / 'bowl.jpg')
+
+    removed = []
+    report = run(static_folder, tmp_path, on_removed=removed.append)
+    assert report['removed'] == removed == ['uploads/home/bowl.jpg']
+    assert not any(name.startswith('bowl-jpg-') for name in os.listdir(derivatives))
+    assert os.path.exists(derivatives / 'bowl-png-480w.jpg')
+    assert '1 removed' in format_report(report)
+
+    # Originals outside the processed trees are neither removed nor forgotten
+    report = run_batch(str(static_folder), str(tmp_path / 'manifest.json'), trees=['uploads'], formats=FORMATS,
+                       workers=1, on_removed=removed.append)
+    assert report['removed'] == [] and report['skipped'] == ['uploads/home/bowl.png']
+    assert os.path.exists(static_folder / 'images' / 'derivatives' / 'hero-png-480w.webp')
+    assert 'images/hero.png' in load_manifest(str(tmp_path / 'manifest.json'))['files']
+
+
+def test_results_are_reported_in_the_parent(static_folder, tmp_path):
+    seen = []
+    run(static_folder, tmp_path, on_result=lambda path, status, entry: seen.append((path, status)))
+    assert sorted(seen) == [('images/hero.png', 'encoded'), ('uploads/home/bowl.jpg', 'encoded'),
+                            ('uploads/home/bowl.png', 'encoded')]
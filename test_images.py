@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for responsive image derivatives
+"""
+
+import os
+
+import pytest
+from flask import render_template_string
+from PIL import Image
+
+from app_factory import register_template_filters
+from db import db
+from db.models import ImageDerivative
+from utils.images import (
+    available_formats, delete_derivatives, generate_derivatives, image_sources, invalidate_image_derivatives,
+    process_upload, srcset, target_widths
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_snapshot():
+    invalidate_image_derivatives()
+    yield
+    invalidate_image_derivatives()
+
+
+@pytest.fixture
+def static_folder(app, tmp_path):
+    folder = tmp_path / 'static'
+    (folder / 'uploads' / 'home').mkdir(parents=True)
+    app.static_folder = str(folder)
+    return folder
+
+
+def make_image(static_folder, path, size=(2000, 1000), mode='RGBA'):
+    Image.new(mode, size, (120, 80, 200, 128) if mode == 'RGBA' else (120, 80, 200)).save(static_folder / path)
+    return path
+
+
+def test_target_widths():
+    assert target_widths(2000) == [480, 768, 1280, 1920]
+    assert target_widths(1000) == [480, 768]
+    assert target_widths(300) == [300]
+
+
+def test_generates_every_width_and_format(static_folder):
+    source = make_image(static_folder, 'uploads/home/hero.png')
+    derivatives = generate_derivatives(str(static_folder), source)
+    db.session.commit()
+
+    formats = available_formats()
+    assert 'jpeg' in formats and 'webp' in formats
+    assert len(derivatives) == 4 * len(formats)
+    for derivative in derivatives:
+        path = static_folder / derivative.path
+        with Image.open(path) as image:
+            assert image.size == (derivative.width, derivative.height)
+        assert derivative.height == derivative.width // 2
+        assert derivative.file_size == os.path.getsize(path)
+        assert derivative.path.startswith('uploads/home/derivatives/hero-png-')
+
+    jpeg = next(d for d in derivatives if d.format == 'jpeg' and d.width == 480)
+    with Image.open(static_folder / jpeg.path) as image:
+        assert image.mode == 'RGB'  # Alpha flattened
+
+
+def test_regenerating_replaces_rows(static_folder):
+    source = make_image(static_folder, 'uploads/home/hero.png')
+    generate_derivatives(str(static_folder), source, formats=['jpeg'])
+    db.session.commit()
+    make_image(static_folder, source, size=(600, 600))
+    generate_derivatives(str(static_folder), source, formats=['jpeg'])
+    db.session.commit()
+    assert [(d.width, d.height) for d in ImageDerivative.query.all()] == [(480, 480)]
+
+
+def test_unreadable_upload_does_not_raise(static_folder):
+    (static_folder / 'uploads' / 'home' / 'broken.jpg').write_bytes(b'not an image')
+    assert process_upload(str(static_folder), 'uploads/home/broken.jpg') == []
+
+
+def test_template_helpers(app, static_folder):
+    source = make_image(static_folder, 'uploads/home/hero.jpg', size=(1000, 500), mode='RGB')
+    with app.test_request_context():
+        assert srcset(source) == ''
+        assert image_sources(source) == []
+
+        generate_derivatives(str(static_folder), source, formats=['webp', 'jpeg'])
+        db.session.commit()
+
+        assert srcset(source) == ('/static/uploads/home/derivatives/hero-jpg-480w.jpg 480w, '
+                                  '/static/uploads/home/derivatives/hero-jpg-768w.jpg 768w')
+        assert image_sources(source) == [{
+            'type': 'image/webp',
+            'srcset': ('/static/uploads/home/derivatives/hero-jpg-480w.webp 480w, '
+                       '/static/uploads/home/derivatives/hero-jpg-768w.webp 768w')
+        }]
+
+        register_template_filters(app)
+        html = render_template_string("{{ srcset(path) }}|{{ image_sources(path)|length }}", path=source)
+        assert html.endswith('768w|1')
+
+        # Deleting the rows bumps the version, so the cached snapshot is dropped
+        assert delete_derivatives(source) == 4
+        db.session.commit()
+        assert srcset(source) == ''
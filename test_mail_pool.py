@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests for the pooled SMTP transport against a local aiosmtpd server
+"""
+
+import smtplib
+import socket
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from flask import Flask
+from flask_mail import Message
+
+from utils.mail_pool import PooledMail
+
+aiosmtpd_controller = pytest.importorskip('aiosmtpd.controller')
+
+
+class RecordingHandler:
+    """Collects delivered messages and the SMTP session each arrived on"""
+
+    def __init__(self):
+        self.messages = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith('refused'):
+            return '550 No such user'
+        envelope.rcpt_tos.append(address)
+        return '250 OK'
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append((id(session), envelope.rcpt_tos[0]))
+        return '250 Message accepted for delivery'
+
+    @property
+    def sessions(self):
+        return {session for session, _ in self.messages}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = aiosmtpd_controller.Controller(handler, hostname='127.0.0.1', port=free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+@pytest.fixture
+def mail_app(smtp_server):
+    controller, _ = smtp_server
+    app = Flask(__name__)
+    app.config.update(
+        MAIL_SERVER='127.0.0.1',
+        MAIL_PORT=controller.port,
+        MAIL_USE_TLS=False,
+        MAIL_SUPPRESS_SEND=False,
+        MAIL_DEFAULT_SENDER='studio@example.com',
+        MAIL_TIMEOUT=5,
+        MAIL_POOL_SIZE=2,
+    )
+    app.mail = PooledMail(app)
+    with app.app_context():
+        yield app
+    app.extensions['mail_pool'].close_all()
+
+
+def message(i):
+    return Message(subject=f'Message {i}', recipients=[f'user{i}@example.com'], body='Hello')
+
+
+def test_sends_reuse_one_session(mail_app, smtp_server):
+    _, handler = smtp_server
+    for i in range(5):
+        mail_app.mail.send(message(i))
+
+    assert [rcpt for _, rcpt in handler.messages] == [f'user{i}@example.com' for i in range(5)]
+    assert len(handler.sessions) == 1
+    assert mail_app.extensions['mail_pool'].opened == 1
+
+
+def test_send_batch_uses_one_session(mail_app, smtp_server):
+    _, handler = smtp_server
+    assert mail_app.mail.send_batch([message(i) for i in range(3)]) == [None, None, None]
+
+    assert len(handler.messages) == 3
+    assert len(handler.sessions) == 1
+
+
+def test_rejected_message_does_not_stop_the_batch(mail_app, smtp_server):
+    _, handler = smtp_server
+    refused = Message(subject='Hi', recipients=['refused@example.com'], body='Hello')
+    errors = mail_app.mail.send_batch([message(0), refused, message(2)])
+
+    assert errors[0] is None and errors[2] is None
+    assert isinstance(errors[1], smtplib.SMTPRecipientsRefused)
+    assert [rcpt for _, rcpt in handler.messages] == ['user0@example.com', 'user2@example.com']
+    assert len(handler.sessions) == 1
+
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        mail_app.mail.send(refused)
+
+
+def test_dropped_session_is_replaced(mail_app, smtp_server):
+    _, handler = smtp_server
+    pool = mail_app.extensions['mail_pool']
+    mail_app.mail.send(message(0))
+
+    # Simulate the server closing the idle session
+    host = pool.acquire()
+    host.close()
+    pool.release(host)
+
+    mail_app.mail.send(message(1))
+    assert [rcpt for _, rcpt in handler.messages] == ['user0@example.com', 'user1@example.com']
+    assert len(handler.sessions) == 2
+    assert pool.opened == 2
+
+
+def test_concurrent_sends_are_bounded_by_pool_size(mail_app, smtp_server):
+    _, handler = smtp_server
+
+    def send(i):
+        with mail_app.app_context():
+            mail_app.mail.send(message(i))
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        list(executor.map(send, range(20)))
+
+    assert len(handler.messages) == 20
+    assert len(handler.sessions) <= 2
+    assert mail_app.extensions['mail_pool'].opened <= 2
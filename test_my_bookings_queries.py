@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Query-count tests: booking listings must not issue a query per booking
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from db import db
+from db.models import Booking, Service
+
+
+def add_history(count, email='client@example.com'):
+    services = [Service(name=f'Service {i}', price=50 + i, duration=60) for i in range(3)]
+    db.session.add_all(services)
+    db.session.flush()
+
+    base = datetime(2025, 1, 1, 9, 0)
+    db.session.add_all(
+        Booking(
+            user_name='Client', email=email, num_people=1,
+            start_time=base + timedelta(days=i), end_time=base + timedelta(days=i, hours=1),
+            service_id=services[i % 3].id if i % 4 else None
+        )
+        for i in range(count)
+    )
+    db.session.commit()
+    db.session.expunge_all()
+
+
+@pytest.mark.parametrize('history', [1, 10, 60])
+def test_my_bookings_search_is_one_query(client, assert_num_queries, history):
+    add_history(history)
+
+    with assert_num_queries(1):
+        response = client.get('/booking/my-bookings/search?email=client@example.com')
+
+    bookings = response.get_json()
+    assert len(bookings) == history
+    assert bookings == sorted(bookings, key=lambda b: b['start_time'], reverse=True)
+    for booking in bookings:
+        if booking['service']:
+            assert booking['service']['name'].startswith('Service ')
+            assert booking['service']['duration'] == 60
+    assert any(booking['service'] is None for booking in bookings)
+
+
+@pytest.mark.parametrize('history', [1, 60])
+def test_booking_events_query_count_is_constant(client, assert_num_queries, history):
+    add_history(history)
+
+    # Version lookup + one windowed select
+    with assert_num_queries(2):
+        response = client.get('/booking/events?start=2025-01-01&end=2025-04-01')
+    assert len(response.get_json()) == min(history, 90)
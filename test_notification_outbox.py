@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Tests for the durable notification outbox
+"""
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+import utils.notifications as notifications
+from db import db
+from db.models import Booking, NotificationJob
+from utils.notifications import (
+    NotificationWorker, claim_due_jobs, drain_outbox, enqueue_email, enqueue_sms
+)
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """Replace the real senders with recorders"""
+    messages = []
+    monkeypatch.setitem(notifications.SENDERS, 'email', lambda app, payload: messages.append(('email', payload)))
+    monkeypatch.setitem(notifications.SENDERS, 'sms', lambda app, payload: messages.append(('sms', payload)))
+    return messages
+
+
+def test_booking_post_queues_emails_instead_of_threads(app, client, sent):
+    app.config.update(MAIL_USERNAME='studio@example.com', MAIL_PASSWORD='secret')
+
+    response = client.post('/booking/events', json={
+        "user_name": "Ana", "email": "ana@example.com",
+        "start_time": "2025-09-10T09:00:00", "end_time": "2025-09-10T10:00:00"
+    })
+    booking_id = response.get_json()['id']
+
+    jobs = {job.dedup_key: job for job in NotificationJob.query.all()}
+    assert set(jobs) == {f"booking:{booking_id}:confirmation:email", f"booking:{booking_id}:admin:email"}
+    assert all(job.status == 'pending' for job in jobs.values())
+    assert sent == []
+
+    assert drain_outbox(app) == 2
+    assert sorted(payload['recipients'][0] for _, payload in sent) == ['ana@example.com', 'dambazolbayar@gmail.com']
+    db.session.expire_all()
+    assert all(job.status == 'sent' for job in NotificationJob.query.all())
+
+    client.post(f'/booking/events/{booking_id}/cancel')
+    assert drain_outbox(app) == 1
+    assert sent[-1][1]['subject'].startswith('🚫 Booking Cancellation')
+
+
+def test_waitlisted_booking_is_not_confirmed(app, client, sent, monkeypatch):
+    app.config.update(MAIL_USERNAME='studio@example.com', MAIL_PASSWORD='secret')
+    monkeypatch.setattr('routes.booking.get_sms_status', lambda: {'client_configured': True})
+    slot = {"start_time": "2025-09-10T09:00:00", "end_time": "2025-09-10T10:00:00"}
+    client.post('/booking/events', json={"user_name": "Group", "email": "group@example.com", "num_people": 10, **slot})
+    drain_outbox(app)
+    sent.clear()
+
+    response = client.post('/booking/events', json={
+        "user_name": "Ana", "email": "ana@example.com", "phone": "+15550000000", **slot
+    })
+    booking_id = response.get_json()['id']
+    assert 'waitlist' in response.get_json()['message']
+
+    jobs = {job.dedup_key for job in NotificationJob.query.filter(NotificationJob.dedup_key.like(f'booking:{booking_id}:%'))}
+    assert jobs == {f"booking:{booking_id}:waitlist:email", f"booking:{booking_id}:admin:email",
+                    f"booking:{booking_id}:waitlist:sms"}
+    assert drain_outbox(app) == 3
+    customer = [payload for kind, payload in sent if kind == 'sms' or payload['recipients'] == ['ana@example.com']]
+    assert len(customer) == 2
+    for payload in customer:
+        text = payload.get('message') or payload['subject'] + payload['body']
+        assert 'waitlist' in text.lower()
+        assert 'confirmed' not in text.replace('not confirmed', '')
+
+
+def test_booking_and_its_notifications_commit_together(app, client, monkeypatch):
+    app.config.update(MAIL_USERNAME='studio@example.com', MAIL_PASSWORD='secret')
+
+    def failing_enqueue(*args, **kwargs):
+        raise RuntimeError('outbox unavailable')
+
+    monkeypatch.setattr('routes.booking.enqueue_email', failing_enqueue)
+    response = client.post('/booking/events', json={
+        "user_name": "Ana", "email": "ana@example.com",
+        "start_time": "2025-09-10T09:00:00", "end_time": "2025-09-10T10:00:00"
+    })
+
+    # No confirmed booking is left behind without its confirmation jobs
+    assert response.status_code == 500
+    assert Booking.query.count() == 0
+    assert NotificationJob.query.count() == 0
+
+
+def test_enqueue_is_idempotent(app, sent):
+    for _ in range(3):
+        enqueue_sms('reminder:1', '+15550000000', 'See you soon')
+        db.session.commit()
+
+    assert NotificationJob.query.count() == 1
+    assert drain_outbox(app) == 1
+    enqueue_sms('reminder:1', '+15550000000', 'See you soon')
+    db.session.commit()
+    assert drain_outbox(app) == 0
+    assert len(sent) == 1
+
+
+def test_failed_delivery_backs_off_exponentially(app, monkeypatch):
+    app.config.update(NOTIFICATION_MAX_ATTEMPTS=3, NOTIFICATION_RETRY_BASE_SECONDS=10)
+
+    def broken(app, payload):
+        raise ConnectionError('SMTP down')
+
+    monkeypatch.setitem(notifications.SENDERS, 'email', broken)
+    enqueue_email('flaky', 'Hi', ['a@example.com'], 'Body')
+    db.session.commit()
+
+    delays = []
+    for _ in range(3):
+        job = NotificationJob.query.one()
+        job.next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+        db.session.commit()
+
+        before = datetime.utcnow()
+        assert drain_outbox(app) == 0
+        db.session.expire_all()
+        job = NotificationJob.query.one()
+        delays.append(round((job.next_attempt_at - before).total_seconds()))
+
+    assert job.status == 'failed'
+    assert job.attempts == 3
+    assert 'SMTP down' in job.last_error
+    assert delays[:2] == [10, 20]
+
+
+def test_expired_claims_are_recovered(app, sent):
+    enqueue_email('orphan', 'Hi', ['a@example.com'], 'Body')
+    db.session.commit()
+
+    # A worker claims the job and dies before finishing it
+    assert claim_due_jobs(10) == [NotificationJob.query.one().id]
+    assert claim_due_jobs(10) == []
+
+    later = datetime.utcnow() + timedelta(seconds=notifications.CLAIM_SECONDS + 1)
+    assert len(claim_due_jobs(10, now=later)) == 1
+
+
+def test_emails_are_sent_in_batches(app, monkeypatch):
+    batches = []
+
+    def send_batch(app, payloads):
+        batches.append([payload['recipients'][0] for payload in payloads])
+        return [None if 'bounce' not in payload['recipients'][0] else ValueError('bounced') for payload in payloads]
+
+    monkeypatch.setitem(notifications.BATCH_SENDERS, notifications.SENDERS['email'], send_batch)
+    monkeypatch.setitem(notifications.SENDERS, 'sms', lambda app, payload: None)
+    app.config['NOTIFICATION_BATCH_SIZE'] = 3
+    for i in range(4):
+        enqueue_email(f'news:{i}', 'Hi', ['bounce@example.com' if i == 1 else f'{i}@example.com'], 'Body')
+    enqueue_sms('reminder:1', '+15550000000', 'See you soon')
+    db.session.commit()
+
+    assert drain_outbox(app) == 4
+    assert batches == [['0@example.com', 'bounce@example.com', '2@example.com'], ['3@example.com']]
+    db.session.expire_all()
+    bounced = NotificationJob.query.filter_by(dedup_key='news:1').one()
+    assert bounced.status == 'pending' and 'bounced' in bounced.last_error
+    assert NotificationJob.query.filter_by(status='sent').count() == 4
+
+
+def test_worker_pool_is_bounded(app, monkeypatch):
+    active = 0
+    peak = 0
+    delivered = []
+    lock = threading.Lock()
+
+    def slow_send(app, payload):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+            delivered.append(payload['message'])
+
+    monkeypatch.setitem(notifications.SENDERS, 'sms', slow_send)
+    for i in range(20):
+        enqueue_sms(f'bulk:{i}', '+15550000000', f'message {i}')
+    db.session.commit()
+
+    worker = NotificationWorker(app, max_workers=3, poll_seconds=0.05)
+    worker.start()
+    deadline = time.time() + 10
+    while len(delivered) < 20 and time.time() < deadline:
+        time.sleep(0.05)
+    worker.stop(timeout=5)
+
+    assert sorted(delivered) == sorted(f'message {i}' for i in range(20))
+    assert peak <= 3
+    db.session.expire_all()
+    assert NotificationJob.query.filter_by(status='sent').count() == 20
+    assert json.loads(NotificationJob.query.first().payload)['to_number'] == '+15550000000'
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Query plan regression suite for the booking hot paths
+Runs EXPLAIN QUERY PLAN on every statement a hot path sends and fails on full table scans
+"""
+
+import re
+from datetime import datetime, timedelta
+
+import pytest
+
+import routes.send_sms as send_sms
+from db import db
+from db.models import Booking
+from utils.reminders import dispatch_due_reminders
+
+HOT_TABLES = ('booking', 'slot_occupancy', 'content_versions', 'notification_outbox')
+FULL_SCAN = re.compile(r'^SCAN (TABLE )?(%s)\b' % '|'.join(HOT_TABLES))
+
+
+def full_scans(statements):
+    """EXPLAIN QUERY PLAN each recorded statement and return the ones that scan a hot table"""
+    scans = []
+    with db.engine.connect() as connection:
+        for statement, parameters in statements:
+            if not statement.lstrip().upper().startswith(('SELECT', 'INSERT', 'UPDATE', 'DELETE')):
+                continue
+            plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            details = [row[3] for row in plan]
+            if any(FULL_SCAN.match(detail) for detail in details):
+                scans.append((statement, details))
+    return scans
+
+
+@pytest.fixture
+def seeded(app):
+    base = datetime(2025, 9, 1, 8, 30)
+    db.session.add_all(
+        Booking(
+            user_name=f'Seed {i}', email=f'seed{i % 25}@example.com', num_people=1 + i % 3,
+            start_time=base + timedelta(days=i % 30, minutes=30 * (i % 12)),
+            end_time=base + timedelta(days=i % 30, minutes=30 * (i % 12) + 60),
+            status=('pending', 'confirmed', 'cancelled')[i % 3]
+        )
+        for i in range(300)
+    )
+    db.session.commit()
+
+
+HOT_REQUESTS = [
+    ('get', '/booking/available-slots?date=2025-09-10', None),
+    ('get', '/booking/available-range?start=2025-09-01&end=2025-09-30', None),
+    ('get', '/booking/events?start=2025-09-01T00:00:00&end=2025-10-06T00:00:00', None),
+    ('get', '/booking/my-bookings/search?email=seed7@example.com', None),
+    ('post', '/booking/events', {"user_name": "Plan", "email": "plan@example.com",
+                                 "start_time": "2025-09-10T09:00:00", "end_time": "2025-09-10T10:00:00"}),
+    ('post', '/booking/events', {"user_name": "Plan", "email": "plan@example.com",
+                                 "start_time": "2025-09-10T09:10:00", "end_time": "2025-09-10T10:10:00"}),
+    ('post', '/booking/events/5/cancel', None),
+]
+
+
+@pytest.mark.parametrize('method,url,payload', HOT_REQUESTS)
+def test_hot_request_uses_indexes(client, seeded, record_queries, method, url, payload):
+    with record_queries() as statements:
+        response = getattr(client, method)(url, json=payload) if payload else getattr(client, method)(url)
+    assert response.status_code < 400
+    assert statements
+    assert full_scans(statements) == []
+
+
+def test_reminder_scan_uses_indexes(app, seeded, record_queries, monkeypatch):
+    monkeypatch.setattr(send_sms, 'client', object())
+    for booking in Booking.query.limit(20):
+        booking.phone_number = '5550001111'
+    db.session.commit()
+
+    with record_queries() as statements:
+        dispatch_due_reminders(app, now=datetime(2025, 9, 1, 8, 0))
+    assert statements
+    assert full_scans(statements) == []
+
+
+def test_suite_detects_full_scans(app, seeded, record_queries):
+    with record_queries() as statements:
+        Booking.query.filter(Booking.user_name == 'Seed 1').all()
+    assert full_scans(statements)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Tests for the de-duplicated, multi-stage SMS reminders and their heap scheduler
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+import routes.send_sms as send_sms
+import utils.notifications as notifications
+from db import db
+from db.models import Booking, NotificationJob
+from utils.notifications import drain_outbox
+from utils.reminders import dispatch_due_reminders, reminder_dedup_key
+from utils.scheduler import ReminderScheduler
+
+NOW = datetime(2025, 9, 10, 8, 45)
+
+
+@pytest.fixture(autouse=True)
+def twilio_configured(app, monkeypatch):
+    monkeypatch.setattr(send_sms, 'client', object())
+    app.config['REMINDER_OFFSETS_MINUTES'] = [1440, 120, 30]
+
+
+def add_booking(minutes_ahead, phone='5550001111', status='pending', name='Ana', now=NOW, created_at=None):
+    start = now + timedelta(minutes=minutes_ahead)
+    booking = Booking(user_name=name, email='ana@example.com', phone_number=phone, status=status,
+                      start_time=start, end_time=start + timedelta(hours=1),
+                      created_at=created_at or now - timedelta(days=7))
+    db.session.add(booking)
+    db.session.commit()
+    return booking
+
+
+def queued_keys():
+    return {job.dedup_key for job in NotificationJob.query.all()}
+
+
+def test_each_booking_gets_its_current_stage(app):
+    soon = add_booking(20)
+    today = add_booking(100)
+    tomorrow = add_booking(20 * 60)
+    add_booking(3 * 24 * 60)
+    add_booking(20, phone=None)
+    add_booking(20, status='cancelled')
+    add_booking(20, status='waitlist')
+    add_booking(-10)
+
+    assert dispatch_due_reminders(app, now=NOW) == 3
+    assert queued_keys() == {
+        reminder_dedup_key(soon.id, 30, soon.start_time),
+        reminder_dedup_key(today.id, 120, today.start_time),
+        reminder_dedup_key(tomorrow.id, 1440, tomorrow.start_time),
+    }
+
+    # Nothing new until the next stage comes due
+    assert dispatch_due_reminders(app, now=NOW + timedelta(minutes=5)) == 0
+    assert dispatch_due_reminders(app, now=NOW + timedelta(minutes=75)) == 1
+    assert reminder_dedup_key(today.id, 30, today.start_time) in queued_keys()
+
+
+def test_stages_before_the_booking_was_made_are_skipped(app):
+    add_booking(20 * 60, created_at=NOW - timedelta(minutes=10))
+    assert dispatch_due_reminders(app, now=NOW) == 0
+
+
+def test_overlapping_runs_never_double_queue(app):
+    for i in range(30):
+        add_booking(5 + i % 25, name=f'Client {i}')
+
+    results = []
+
+    def run():
+        results.append(dispatch_due_reminders(app, now=NOW))
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(results) == 30
+    assert NotificationJob.query.count() == 30
+
+
+def test_rescheduled_booking_gets_a_new_reminder(app):
+    booking = add_booking(20)
+    assert dispatch_due_reminders(app, now=NOW) == 1
+
+    booking.start_time += timedelta(minutes=5)
+    booking.end_time += timedelta(minutes=5)
+    db.session.commit()
+    assert dispatch_due_reminders(app, now=NOW) == 1
+
+
+def test_queued_reminders_are_sent_once(app, monkeypatch):
+    sent = []
+    monkeypatch.setitem(notifications.SENDERS, 'sms', lambda app, payload: sent.append(payload))
+    add_booking(20, name='Bold')
+
+    dispatch_due_reminders(app, now=NOW)
+    dispatch_due_reminders(app, now=NOW)
+    assert drain_outbox(app) == 1
+    dispatch_due_reminders(app, now=NOW + timedelta(minutes=5))
+    assert drain_outbox(app) == 0
+
+    assert len(sent) == 1
+    assert sent[0]['to_number'] == '5550001111'
+    assert sent[0]['message'].startswith('Hello Bold')
+
+
+def test_nothing_is_queued_without_twilio(app, monkeypatch):
+    monkeypatch.setattr(send_sms, 'client', None)
+    add_booking(20)
+    assert dispatch_due_reminders(app, now=NOW) == 0
+    assert NotificationJob.query.count() == 0
+
+
+def test_scheduler_sleeps_until_the_next_stage(app, record_queries):
+    booking = add_booking(180)
+    scheduler = ReminderScheduler(app, replan_seconds=86400)
+
+    # The 24 h stage is already due; the 2 h stage fires an hour from now
+    assert scheduler.run_once(now=NOW) == 3600
+    assert queued_keys() == {reminder_dedup_key(booking.id, 1440, booking.start_time)}
+
+    # Waking early does nothing and touches no tables
+    with record_queries() as statements:
+        assert scheduler.run_once(now=NOW + timedelta(minutes=10)) == 3000
+    assert statements == []
+
+    assert scheduler.run_once(now=NOW + timedelta(minutes=60)) == 5400
+    assert reminder_dedup_key(booking.id, 120, booking.start_time) in queued_keys()
+
+
+def test_notify_replans_the_heap(app):
+    scheduler = ReminderScheduler(app, replan_seconds=86400)
+    assert scheduler.run_once(now=NOW) == 86400
+
+    booking = add_booking(40, created_at=NOW)
+    scheduler.notify(booking)
+    assert scheduler.next_fire_time() == NOW + timedelta(minutes=10)
+
+    booking.status = 'cancelled'
+    db.session.commit()
+    scheduler.notify(booking)
+    assert scheduler.run_once(now=NOW) == 86400
+    assert scheduler.next_fire_time() is None
+
+
+def test_scheduler_thread_dispatches_due_reminders(app):
+    now = datetime.utcnow()
+    booking = add_booking(10, now=now)
+
+    scheduler = ReminderScheduler(app)
+    scheduler.start()
+    deadline = time.time() + 5
+    while not queued_keys() and time.time() < deadline:
+        time.sleep(0.05)
+        db.session.rollback()
+    scheduler.stop(timeout=5)
+
+    assert queued_keys() == {reminder_dedup_key(booking.id, 30, booking.start_time)}
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for the versioned site settings snapshot
+"""
+
+import pytest
+from sqlalchemy import update
+
+import utils.site_settings as site_settings
+from db import db
+from db.models import SiteSetting
+from utils.content_versions import bump_content_versions
+from utils.site_settings import create_or_update_setting, get_site_settings, invalidate_site_settings
+
+
+@pytest.fixture(autouse=True)
+def settings(app):
+    invalidate_site_settings()
+    db.session.add_all([
+        SiteSetting(key='site_title', value='Serenity', language='ENG'),
+        SiteSetting(key='phone', value='555-0100', language='ENG'),
+        SiteSetting(key='site_title', value='Амар амгалан', language='MON'),
+    ])
+    db.session.commit()
+    yield
+    invalidate_site_settings()
+
+
+def test_languages_fall_back_to_english():
+    assert dict(get_site_settings('ENG')) == {'site_title': 'Serenity', 'phone': '555-0100'}
+    assert dict(get_site_settings('MON')) == {'site_title': 'Амар амгалан', 'phone': '555-0100'}
+    assert get_site_settings('XX') is get_site_settings('ENG')
+
+
+def test_snapshot_is_read_only():
+    with pytest.raises(TypeError):
+        get_site_settings('ENG')['site_title'] = 'Changed'
+
+
+def test_unchanged_settings_cost_one_version_lookup(record_queries):
+    get_site_settings('ENG')
+    with record_queries() as statements:
+        get_site_settings('ENG')
+        get_site_settings('MON')
+    assert len(statements) == 2
+    assert all('content_versions' in statement for statement, _ in statements)
+
+
+def test_write_through_invalidation():
+    get_site_settings('ENG')
+    create_or_update_setting('phone', '555-0199', 'ENG')
+    assert site_settings._snapshot is None
+    db.session.commit()
+
+    assert get_site_settings('ENG')['phone'] == '555-0199'
+    assert get_site_settings('MON')['phone'] == '555-0199'
+
+
+def test_orm_edits_bump_the_version():
+    get_site_settings('MON')
+    setting = SiteSetting.query.filter_by(key='site_title', language='MON').one()
+    setting.value = 'Шинэ'
+    db.session.commit()
+    assert get_site_settings('MON')['site_title'] == 'Шинэ'
+
+
+def test_edits_from_another_process_are_detected():
+    assert get_site_settings('ENG')['site_title'] == 'Serenity'
+
+    # Another worker process changes a setting on its own connection
+    with db.engine.begin() as connection:
+        table = SiteSetting.__table__
+        connection.execute(update(table).where(table.c.key == 'site_title', table.c.language == 'ENG')
+                           .values(value='Renamed'))
+        bump_content_versions(connection, {'site_settings'})
+
+    assert get_site_settings('ENG')['site_title'] == 'Renamed'
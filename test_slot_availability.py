@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for the slot availability engine and the date-range index
+"""
+
+from datetime import datetime, date, timedelta
+
+from db import db
+from db.models import Booking
+from utils.slot_availability import day_slot_times, sweep_slot_occupancy, BookingIntervalIndex, get_day_availability
+
+
+def add_booking(start, end, num_people, status='pending'):
+    booking = Booking(
+        user_name='Test', email='test@example.com', num_people=num_people,
+        start_time=start, end_time=end, status=status
+    )
+    db.session.add(booking)
+    return booking
+
+
+def naive_slot_occupancy(slot_time):
+    """Per-slot query the booking route used before the sweep-line engine"""
+    bookings = Booking.query.filter(
+        Booking.start_time <= slot_time,
+        Booking.end_time > slot_time,
+        Booking.status != 'cancelled'
+    ).all()
+    return sum(b.num_people for b in bookings), len(bookings)
+
+
+def test_day_slot_times():
+    slots = day_slot_times(date(2025, 9, 10))
+    assert slots[0] == datetime(2025, 9, 10, 8, 30)
+    assert slots[-1] == datetime(2025, 9, 10, 14, 0)
+    assert len(slots) == 12
+
+
+def test_sweep_matches_per_slot_queries(app):
+    day = date(2025, 9, 10)
+    add_booking(datetime(2025, 9, 10, 8, 0), datetime(2025, 9, 10, 9, 0), 2)
+    add_booking(datetime(2025, 9, 10, 9, 0), datetime(2025, 9, 10, 10, 30), 4)
+    add_booking(datetime(2025, 9, 10, 9, 30), datetime(2025, 9, 10, 10, 0), 5)
+    add_booking(datetime(2025, 9, 10, 10, 0), datetime(2025, 9, 10, 11, 0), 3, status='cancelled')
+    add_booking(datetime(2025, 9, 9, 23, 0), datetime(2025, 9, 10, 14, 30), 1)
+    add_booking(datetime(2025, 9, 10, 14, 0), datetime(2025, 9, 10, 15, 0), 6)
+    add_booking(datetime(2025, 9, 11, 9, 0), datetime(2025, 9, 11, 10, 0), 7)
+    db.session.commit()
+
+    slot_times = day_slot_times(day)
+    intervals = [(b.start_time, b.end_time, b.num_people)
+                 for b in Booking.query.filter(Booking.status != 'cancelled')]
+    assert sweep_slot_occupancy(intervals, slot_times) == [
+        naive_slot_occupancy(slot_time) for slot_time in slot_times
+    ]
+
+
+def test_available_slots_endpoint(client):
+    add_booking(datetime(2025, 9, 10, 9, 30), datetime(2025, 9, 10, 10, 30), 10)
+    db.session.commit()
+
+    response = client.get('/booking/available-slots?date=2025-09-10')
+    assert response.status_code == 200
+    slots = {slot['time']: slot for slot in response.get_json()}
+
+    assert slots['2025-09-10T09:30:00'] == {
+        "time": '2025-09-10T09:30:00',
+        "timeString": '9:30 AM',
+        "totalPeople": 10,
+        "availableSpots": 0,
+        "isFullyBooked": True,
+        "bookingCount": 1,
+        "available": True
+    }
+    assert slots['2025-09-10T10:30:00']['totalPeople'] == 0
+    assert slots['2025-09-10T10:30:00']['availableSpots'] == 10
+
+
+def test_available_slots_requires_date(client):
+    response = client.get('/booking/available-slots')
+    assert response.status_code == 400
+
+
+def test_interval_index_matches_sweep():
+    base = datetime(2025, 9, 1, 8, 0)
+    intervals = [
+        (base + timedelta(minutes=30 * i), base + timedelta(minutes=30 * i + 30 * (i % 5 + 1)), i % 4 + 1)
+        for i in range(200)
+    ]
+    slot_times = [base + timedelta(minutes=15 * i) for i in range(500)]
+
+    index = BookingIntervalIndex(intervals)
+    assert len(index) == 200
+    assert [index.occupancy_at(t) for t in slot_times] == sweep_slot_occupancy(intervals, slot_times)
+
+
+def test_available_range_endpoint(client):
+    add_booking(datetime(2025, 9, 10, 9, 0), datetime(2025, 9, 10, 10, 0), 10)
+    add_booking(datetime(2025, 9, 11, 23, 0), datetime(2025, 9, 12, 9, 0), 3)
+    db.session.commit()
+
+    response = client.get('/booking/available-range?start=2025-09-01&end=2025-09-30&service_id=1')
+    assert response.status_code == 200
+    data = response.get_json()
+    days = {day['date']: day for day in data['days']}
+
+    assert len(days) == 30
+    assert days['2025-09-10']['fullyBookedSlots'] == 2
+    assert days['2025-09-12']['slots'][0]['totalPeople'] == 3
+    for day in ('2025-09-10', '2025-09-12', '2025-09-20'):
+        assert days[day]['slots'] == get_day_availability(date.fromisoformat(day))
+
+
+def test_available_range_validates_bounds(client):
+    assert client.get('/booking/available-range?start=2025-09-01').status_code == 400
+    assert client.get('/booking/available-range?start=2025-09-10&end=2025-09-01').status_code == 400
+    assert client.get('/booking/available-range?start=2025-01-01&end=2025-12-31').status_code == 400
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the materialized slot_occupancy table
+"""
+
+from datetime import datetime
+
+from db import db
+from db.models import Booking, SlotOccupancy
+from utils.slot_occupancy import get_slot_occupancy, occupied_slot_times, rebuild_slot_occupancy
+
+
+def snapshot():
+    return {row.slot_start: (row.total_people, row.booking_count)
+            for row in SlotOccupancy.query.all() if row.booking_count}
+
+
+def rebuilt_snapshot():
+    rebuild_slot_occupancy()
+    db.session.flush()
+    return snapshot()
+
+
+def post_booking(client, start, end, num_people):
+    return client.post('/booking/events', json={
+        "user_name": "Test",
+        "email": "test@example.com",
+        "start_time": start,
+        "end_time": end,
+        "num_people": num_people
+    })
+
+
+def test_occupied_slot_times():
+    assert occupied_slot_times(datetime(2025, 9, 10, 9, 0), datetime(2025, 9, 10, 10, 0)) == [
+        datetime(2025, 9, 10, 9, 0), datetime(2025, 9, 10, 9, 30)
+    ]
+    assert occupied_slot_times(datetime(2025, 9, 10, 9, 10), datetime(2025, 9, 10, 10, 5)) == [
+        datetime(2025, 9, 10, 9, 30), datetime(2025, 9, 10, 10, 0)
+    ]
+    assert occupied_slot_times(datetime(2025, 9, 10, 9, 0), datetime(2025, 9, 10, 9, 0)) == []
+
+
+def test_booking_post_updates_occupancy(client):
+    response = post_booking(client, '2025-09-10T09:00:00', '2025-09-10T10:00:00', 4)
+    assert response.status_code == 201
+    assert response.get_json()['totalPeople'] == 4
+
+    response = post_booking(client, '2025-09-10T09:30:00', '2025-09-10T10:30:00', 5)
+    assert response.get_json()['totalPeople'] == 9
+    assert response.get_json()['availableSpots'] == 1
+
+    assert get_slot_occupancy(datetime(2025, 9, 10, 9, 0)) == (4, 1)
+    assert get_slot_occupancy(datetime(2025, 9, 10, 9, 30)) == (9, 2)
+    assert get_slot_occupancy(datetime(2025, 9, 10, 10, 0)) == (5, 1)
+    assert get_slot_occupancy(datetime(2025, 9, 10, 9, 45)) == (9, 2)
+
+
+def test_cancel_releases_occupancy(client):
+    booking_id = post_booking(client, '2025-09-10T09:00:00', '2025-09-10T10:00:00', 6).get_json()['id']
+
+    response = client.post(f'/booking/events/{booking_id}/cancel')
+    assert response.status_code == 200
+    assert get_slot_occupancy(datetime(2025, 9, 10, 9, 0)) == (0, 0)
+
+    slots = client.get('/booking/available-slots?date=2025-09-10').get_json()
+    assert all(slot['availableSpots'] == 10 for slot in slots)
+
+
+def test_admin_style_edits_stay_consistent(app):
+    first = Booking(user_name='A', email='a@example.com', num_people=3,
+                    start_time=datetime(2025, 9, 10, 9, 0), end_time=datetime(2025, 9, 10, 10, 0))
+    second = Booking(user_name='B', email='b@example.com', num_people=2,
+                     start_time=datetime(2025, 9, 10, 9, 30), end_time=datetime(2025, 9, 10, 11, 0))
+    db.session.add_all([first, second])
+    db.session.commit()
+    assert snapshot() == rebuilt_snapshot()
+
+    # Move, resize and re-count a booking as the admin edit forms do
+    first.start_time = datetime(2025, 9, 10, 12, 0)
+    first.end_time = datetime(2025, 9, 10, 13, 30)
+    first.num_people = 7
+    db.session.commit()
+    assert snapshot() == rebuilt_snapshot()
+    assert get_slot_occupancy(datetime(2025, 9, 10, 12, 30)) == (7, 1)
+
+    second.status = 'cancelled'
+    db.session.commit()
+    second.status = 'confirmed'
+    db.session.commit()
+    assert snapshot() == rebuilt_snapshot()
+
+    db.session.delete(first)
+    db.session.commit()
+    assert snapshot() == rebuilt_snapshot()
+    assert get_slot_occupancy(datetime(2025, 9, 10, 12, 30)) == (0, 0)
+
+
+def test_over_capacity_booking_goes_to_waitlist(client):
+    post_booking(client, '2025-09-10T09:00:00', '2025-09-10T10:00:00', 8)
+
+    response = post_booking(client, '2025-09-10T08:30:00', '2025-09-10T09:30:00', 3)
+    data = response.get_json()
+    assert response.status_code == 201
+    assert data['status'] == 'waitlist'
+    assert data['isFullyBooked'] is True
+    assert data['totalPeople'] == 8
+
+    # The waitlisted party holds no capacity anywhere it overlaps
+    assert get_slot_occupancy(datetime(2025, 9, 10, 8, 30)) == (0, 0)
+    assert get_slot_occupancy(datetime(2025, 9, 10, 9, 0)) == (8, 1)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched Twilio sender against a local fake Twilio API
+"""
+
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+import routes.send_sms as send_sms
+from routes.send_sms import TokenBucket, TwilioBatchSender, normalize_phone_number
+
+REJECTED_NUMBER = '+15550009999'
+
+
+class FakeTwilioHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, so connection reuse is observable
+
+    def do_POST(self):
+        form = {key: values[0] for key, values in
+                parse_qs(self.rfile.read(int(self.headers['Content-Length'])).decode()).items()}
+        self.server.requests.append({
+            'path': self.path,
+            'client_port': self.client_address[1],
+            'auth': self.headers.get('Authorization'),
+            'form': form,
+        })
+
+        if form['To'] == REJECTED_NUMBER:
+            status, body = 400, {'code': 21211, 'message': "The 'To' number is not valid."}
+        else:
+            status, body = 201, {'sid': f"SM{len(self.server.requests):04d}", 'status': 'queued'}
+
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_twilio():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeTwilioHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_sender(server, rate=1000):
+    return TwilioBatchSender('AC123', 'secret', '+15550000000',
+                             api_base=f"http://127.0.0.1:{server.server_address[1]}",
+                             messages_per_second=rate)
+
+
+def test_normalize_phone_number_is_cached():
+    normalize_phone_number.cache_clear()
+    assert normalize_phone_number('(555) 123-4567') == '+15551234567'
+    assert normalize_phone_number('1-555-123-4567') == '+15551234567'
+    assert normalize_phone_number('+976 9911 2233') == '+97699112233'
+    assert normalize_phone_number('12345') is None
+    assert normalize_phone_number('') is None
+
+    normalize_phone_number('(555) 123-4567')
+    assert normalize_phone_number.cache_info().hits == 1
+
+
+def test_batch_reports_per_message_outcomes(fake_twilio):
+    outcomes = make_sender(fake_twilio).send_batch([
+        ('555-123-4567', 'Reminder'),
+        ('(555) 123 4567', 'Reminder'),  # Same number, same body
+        ('555-123-4567', 'Different body'),
+        ('not a number', 'Reminder'),
+        (REJECTED_NUMBER, 'Reminder'),
+        ('+1 555 765 4321', 'Reminder'),
+    ])
+
+    assert [outcome['status'] for outcome in outcomes] == ['sent', 'duplicate', 'sent', 'invalid', 'failed', 'sent']
+    assert outcomes[0]['sid'] == 'SM0001'
+    assert outcomes[0]['normalized'] == '+15551234567'
+    assert '21211' in outcomes[4]['error']
+
+    requests = fake_twilio.requests
+    assert [request['form']['To'] for request in requests] == [
+        '+15551234567', '+15551234567', REJECTED_NUMBER, '+15557654321'
+    ]
+    assert requests[0]['path'] == '/2010-04-01/Accounts/AC123/Messages.json'
+    assert requests[0]['form']['From'] == '+15550000000'
+    assert requests[0]['auth'] == 'Basic ' + base64.b64encode(b'AC123:secret').decode()
+
+
+def test_batch_reuses_one_connection(fake_twilio):
+    make_sender(fake_twilio).send_batch([(f'555-000-{i:04d}', 'Hi') for i in range(10)])
+
+    assert len(fake_twilio.requests) == 10
+    assert len({request['client_port'] for request in fake_twilio.requests}) == 1
+
+
+def test_batch_respects_rate_limit(fake_twilio):
+    started = time.monotonic()
+    make_sender(fake_twilio, rate=20).send_batch([(f'555-000-{i:04d}', 'Hi') for i in range(6)])
+
+    # One token up front, then one every 50 ms
+    assert time.monotonic() - started >= 0.24
+
+
+@pytest.mark.parametrize('rate', [0, -1])
+def test_rate_must_be_positive(rate):
+    with pytest.raises(ValueError, match='messages_per_second'):
+        TwilioBatchSender('AC123', 'secret', '+15550000000', messages_per_second=rate)
+
+
+def test_token_bucket_allows_bursts_up_to_capacity():
+    bucket = TokenBucket(rate=1, capacity=3)
+    started = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - started < 0.1
+
+
+def test_send_sms_reminder_uses_the_shared_sender(fake_twilio, monkeypatch):
+    monkeypatch.setattr(send_sms, 'client', object())
+    monkeypatch.setattr(send_sms, '_batch_sender', make_sender(fake_twilio))
+
+    assert send_sms.send_sms_reminder('555-123-4567', 'See you soon') is True
+    assert send_sms.send_sms_reminder(REJECTED_NUMBER, 'See you soon') is False
+    assert send_sms.send_sms_reminder('', 'See you soon') is False
+    assert len(fake_twilio.requests) == 2
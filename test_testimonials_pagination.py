@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Tests for keyset pagination of published testimonials
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from db import db
+from db import models
+from features.testimonials.testimonials import testimony_bp
+from utils.testimonials import decode_cursor, get_testimonial_page, parse_page_size
+
+NOW = datetime(2025, 10, 1, 12, 0)
+
+
+@pytest.fixture
+def testimonials(app):
+    """25 approved (every third featured, ten sharing one timestamp) and 5 pending"""
+    rows = []
+    for i in range(25):
+        created_at = NOW if i < 10 else NOW - timedelta(hours=i)
+        rows.append(models.Testimonial(client_name=f'Client {i}', testimonial_text=f'Text {i}', rating=5,
+                                       is_approved=True, is_featured=i % 3 == 0, created_at=created_at))
+    for i in range(5):
+        rows.append(models.Testimonial(client_name=f'Pending {i}', testimonial_text='...', rating=4,
+                                       is_approved=False, created_at=NOW + timedelta(hours=1)))
+    # Server-side default timestamp (no microseconds in the stored text)
+    rows.append(models.Testimonial(client_name='Defaulted', testimonial_text='...', rating=5, is_approved=True))
+    db.session.add_all(rows)
+    db.session.commit()
+    return rows
+
+
+def walk(featured_only=False, limit=4):
+    names, cursor = [], None
+    while True:
+        page, cursor = get_testimonial_page(cursor, limit, featured_only)
+        assert len(page) <= limit
+        names.extend(t.client_name for t in page)
+        if cursor is None:
+            return names
+
+
+def test_pages_cover_everything_once_in_order(testimonials):
+    expected = [t.client_name for t in sorted(
+        (t for t in testimonials if t.is_approved),
+        key=lambda t: (t.created_at, t.id), reverse=True
+    )]
+    assert walk() == expected
+    assert walk(limit=1) == expected
+    assert walk(limit=50) == expected
+
+
+def test_featured_pages(testimonials):
+    names = walk(featured_only=True)
+    assert names == [f'Client {i}' for i in (9, 6, 3, 0, 12, 15, 18, 21, 24)]
+
+
+def test_last_page_has_no_cursor(testimonials):
+    page, cursor = get_testimonial_page(limit=26)
+    assert len(page) == 26 and cursor is None
+
+
+def test_invalid_cursor():
+    with pytest.raises(ValueError):
+        decode_cursor('not-a-cursor')
+
+
+def test_page_size_is_clamped():
+    assert parse_page_size(None) == 12
+    assert parse_page_size('abc') == 12
+    assert parse_page_size('0') == 1
+    assert parse_page_size('1000') == 50
+
+
+def test_pages_use_an_index_without_sorting(testimonials):
+    plan_rows = db.session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT id FROM testimonials WHERE is_approved = 1 AND is_featured = 1 "
+        "AND created_at <= '2025-10-01 12:00:00' ORDER BY created_at DESC, id DESC LIMIT 5"
+    )).all()
+    plan = ' '.join(row[-1] for row in plan_rows)
+    assert 'ix_testimonials_approved_featured_created_at' in plan
+    assert 'TEMP B-TREE' not in plan
+    plan_rows = db.session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT id FROM testimonials WHERE is_approved = 1 "
+        "ORDER BY created_at DESC, id DESC LIMIT 5"
+    )).all()
+    plan = ' '.join(row[-1] for row in plan_rows)
+    assert 'ix_testimonials_approved_created_at' in plan
+    assert 'TEMP B-TREE' not in plan
+
+
+@pytest.fixture
+def api(app, testimonials):
+    app.register_blueprint(testimony_bp)
+    return app.test_client()
+
+
+def test_approved_api_links_to_next_page(api):
+    response = api.get('/testimonials/api/approved?limit=10')
+    assert response.status_code == 200
+    assert len(response.get_json()) == 10
+    assert 'rel="next"' in response.headers['Link']
+
+    next_url = response.headers['Link'].split('>')[0].lstrip('<')
+    second = api.get(next_url).get_json()
+    assert {t['id'] for t in second}.isdisjoint(t['id'] for t in response.get_json())
+
+
+def test_list_apis_are_unpaginated_by_default(api):
+    approved = api.get('/testimonials/api/approved')
+    assert len(approved.get_json()) == 26 and 'Link' not in approved.headers
+    assert len(api.get('/testimonials/api/featured').get_json()) == 9
+
+    from features.testimonials.testimonials import get_approved_testimonials, get_featured_testimonials
+    assert len(get_approved_testimonials()) == 26
+    assert len(get_featured_testimonials()) == 9
+    assert len(get_approved_testimonials(limit=5)) == 5
+
+
+def test_more_api(api):
+    first = api.get('/testimonials/api/more?limit=20').get_json()
+    assert len(first['testimonials']) == 20 and first['next_cursor']
+    rest = api.get(f"/testimonials/api/more?limit=20&after={first['next_cursor']}").get_json()
+    assert len(rest['testimonials']) == 6 and rest['next_cursor'] is None
+    assert 'stars' in rest['testimonials'][0]
+
+
+def test_bad_cursor_is_rejected(api):
+    assert api.get('/testimonials/api/more?after=garbage').status_code == 400
+    assert api.get('/testimonials/api/featured?after=garbage').status_code == 400
+
+
+def test_fallback_blueprint_serves_the_carousel(app, testimonials):
+    from routes.main import testimonials_more_url
+    from routes.testimony import get_approved_testimonial_page, get_approved_testimonials, testimony_bp as fallback_bp
+
+    app.register_blueprint(fallback_bp)
+    with app.test_request_context():
+        assert testimonials_more_url() == '/testimonials/api/more'
+
+    first, cursor = get_approved_testimonial_page(limit=20)
+    assert get_approved_testimonials(limit=20) == first
+    assert len(get_approved_testimonials()) == 26
+    rest = app.test_client().get(f'/testimonials/api/more?after={cursor}').get_json()
+    assert len(rest['testimonials']) == 6 and rest['next_cursor'] is None
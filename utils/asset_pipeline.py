@@ -0,0 +1,363 @@
+"""
+Static asset build and precompressed serving
+build_bundles() concatenates each page's CSS/JS into a minified bundle under static/dist/
+and writes .gz (and, with the Brotli package, .br) variants of every stylesheet and
+script. init_precompressed() then answers static requests with the smallest variant the
+client's Accept-Encoding allows, so no compression happens at request time
+"""
+
+import gzip
+import mimetypes
+import os
+import re
+
+from flask import current_app, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # Optional: without it only .gz variants are written
+    brotli = None
+
+DIST_DIR = 'dist'
+PRECOMPRESS_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.txt')
+
+# Bundle name (under static/dist/) -> source files (under static/), in page load order
+BUNDLES = {
+    'site.bundle.css': ['styles.css'],
+    'home.bundle.js': ['auth.js', 'home.js'],
+    'testimony.bundle.js': ['home.js'],
+    'book.bundle.css': ['book.css'],
+    'book.bundle.js': ['book.js'],
+}
+
+# Content-Encoding -> file suffix, in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+# --- Minifiers ---
+
+CSS_TOKENS = re.compile(r'/\*.*?\*/|"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|[^"\'/]+|/', re.S)
+
+
+def minify_css(source):
+    """Drop comments and redundant whitespace; strings are left untouched"""
+    parts = []
+    code = []  # Whether each part is minified CSS (not a string or comment)
+    for token in CSS_TOKENS.findall(source):
+        if token.startswith('/*'):
+            if token.startswith('/*!'):  # Licence comments stay
+                parts.append(token)
+                code.append(False)
+            continue
+        if token[0] in '"\'':
+            parts.append(token)
+            code.append(False)
+            continue
+        token = re.sub(r'\s+', ' ', token)
+        token = re.sub(r'\s*([{};,>])\s*', r'\1', token)
+        token = re.sub(r':\s+', ':', token)
+        token = token.replace(';}', '}')
+        if token.startswith('}') and code and code[-1] and parts[-1].endswith(';'):
+            parts[-1] = parts[-1][:-1]  # The ; and } were split by a dropped comment
+        parts.append(token)
+        code.append(True)
+    return ''.join(parts).strip()
+
+
+WORD_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$\\')
+REGEX_PREFIX_CHARS = frozenset('(,=:[!&|?{};+-*%<>~^')
+REGEX_PREFIX_WORDS = frozenset(('return', 'typeof', 'case', 'do', 'else', 'in', 'instanceof', 'new',
+                                'delete', 'void', 'throw', 'yield', 'await'))
+
+
+def _skip_string(source, i, quote):
+    """Index just past the string literal starting at source[i]"""
+    i += 1
+    while i < len(source):
+        if source[i] == '\\':
+            i += 2
+        elif source[i] == quote:
+            return i + 1
+        elif source[i] == '\n' and quote != '`':
+            return i  # Unterminated; let the browser report it
+        elif quote == '`' and source.startswith('${', i):
+            i = _skip_template_expression(source, i + 2)
+        else:
+            i += 1
+    return i
+
+
+def _skip_template_expression(source, i):
+    """Index just past the } closing a template literal's ${ expression"""
+    depth = 0
+    while i < len(source):
+        c = source[i]
+        if c in '"\'`':
+            i = _skip_string(source, i, c)
+            continue
+        if c == '{':
+            depth += 1
+        elif c == '}':
+            if depth == 0:
+                return i + 1
+            depth -= 1
+        i += 1
+    return i
+
+
+def _skip_regex(source, i):
+    """Index just past the regular expression literal (and flags) starting at source[i]"""
+    i += 1
+    in_class = False
+    while i < len(source) and source[i] != '\n':
+        c = source[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '[':
+            in_class = True
+        elif c == ']':
+            in_class = False
+        elif c == '/' and not in_class:
+            i += 1
+            while i < len(source) and source[i] in WORD_CHARS:
+                i += 1
+            return i
+        i += 1
+    return i
+
+
+def minify_js(source):
+    """
+    Drop comments, indentation and blank lines
+
+    Deliberately conservative: line breaks between statements are kept (so
+    automatic semicolon insertion behaves exactly as before) and strings,
+    template literals and regular expressions are copied verbatim.
+    """
+    out = []
+    i = 0
+    n = len(source)
+    last = ''  # Last significant character written
+    word = ''  # Identifier or keyword ending at `last`
+    pending = ''  # Whitespace seen since `last`: '', ' ' or '\n'
+
+    def emit(text, next_char):
+        nonlocal pending
+        if pending == '\n' and out:
+            out.append('\n')
+        elif pending == ' ' and (
+            (last in WORD_CHARS and next_char in WORD_CHARS) or (last in '+-' and next_char == last)
+        ):
+            out.append(' ')
+        pending = ''
+        out.append(text)
+
+    while i < n:
+        c = source[i]
+        if c in ' \t\r\f\v\n':
+            if c == '\n' or pending == '\n':
+                pending = '\n'
+            else:
+                pending = ' '
+            i += 1
+        elif source.startswith('//', i):
+            end = source.find('\n', i)
+            i = n if end == -1 else end
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            end = n if end == -1 else end + 2
+            if not pending:
+                pending = '\n' if '\n' in source[i:end] else ' '
+            i = end
+        elif c in '"\'`':
+            end = _skip_string(source, i, c)
+            emit(source[i:end], c)
+            last, word = c, ''
+            i = end
+        elif c == '/' and (not last or last in REGEX_PREFIX_CHARS or word in REGEX_PREFIX_WORDS):
+            end = _skip_regex(source, i)
+            emit(source[i:end], c)
+            last, word = '/', ''
+            i = end
+        else:
+            joined = not pending and last in WORD_CHARS
+            emit(c, c)
+            if c in WORD_CHARS:
+                word = word + c if joined else c
+            else:
+                word = ''
+            last = c
+            i += 1
+    return ''.join(out).strip() + '\n'
+
+
+# --- Build ---
+
+def _write(path, data):
+    """
+    Write bytes atomically, so a running server never serves a half-written file
+
+    Always rewritten, even when unchanged: serving compares mtimes against the sources
+    (URLs use content hashes, so a fresh mtime alone never changes a fingerprint).
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def precompress(path):
+    """
+    Write path.gz (and path.br when Brotli is installed) next to a file
+
+    Returns:
+        dict: suffix -> compressed size
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    sizes = {}
+    # mtime=0 keeps the gzip output identical between builds
+    variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli:
+        variants.append(('.br', brotli.compress(data, quality=11)))
+    for suffix, compressed in variants:
+        _write(path + suffix, compressed)
+        sizes[suffix] = len(compressed)
+    return sizes
+
+
+def build_bundles(static_folder, bundles=BUNDLES):
+    """
+    Write the minified bundles into static_folder/dist
+
+    Returns:
+        dict: bundle name -> (source bytes, minified bytes)
+    """
+    dist = os.path.join(static_folder, DIST_DIR)
+    os.makedirs(dist, exist_ok=True)
+    results = {}
+    for name, sources in bundles.items():
+        minify = minify_css if name.endswith('.css') else minify_js
+        texts = []
+        for source in sources:
+            with open(os.path.join(static_folder, source), 'r', encoding='utf-8') as f:
+                texts.append(f.read())
+        # JS files are joined with ';' so one file's last statement can't run into the next
+        separator = '\n' if name.endswith('.css') else ';\n'
+        bundle = separator.join(minify(text) for text in texts)
+        _write(os.path.join(dist, name), bundle.encode('utf-8'))
+        results[name] = (sum(len(text.encode('utf-8')) for text in texts), len(bundle.encode('utf-8')))
+    return results
+
+
+def precompress_folder(folder):
+    """
+    Precompress every text asset under a static folder
+
+    Returns:
+        int: Number of files precompressed
+    """
+    count = 0
+    for root, _, files in os.walk(folder):
+        for filename in files:
+            if filename.endswith(PRECOMPRESS_EXTENSIONS):
+                precompress(os.path.join(root, filename))
+                count += 1
+    return count
+
+
+# --- Serving ---
+
+def bundle_urls(name):
+    """
+    URLs a page should load for a bundle
+
+    The built bundle when it exists and is newer than all of its sources
+    (and ASSET_BUNDLES is on), otherwise the source files themselves, so
+    development edits show up without a rebuild.
+    """
+    sources = BUNDLES[name]
+    static_folder = current_app.static_folder
+    if current_app.config.get('ASSET_BUNDLES', True):
+        try:
+            built = os.stat(os.path.join(static_folder, DIST_DIR, name)).st_mtime_ns
+            if all(os.stat(os.path.join(static_folder, source)).st_mtime_ns <= built for source in sources):
+                return [url_for('static', filename=f"{DIST_DIR}/{name}")]
+        except OSError:
+            pass
+    return [url_for('static', filename=source) for source in sources]
+
+
+def accepted_encodings(header):
+    """Content codings the client accepts (q=0 excluded)"""
+    accepted = set()
+    for part in (header or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = params.strip()
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def precompressed_variant(folder, filename, accept_encoding):
+    """
+    Best precompressed file for this request
+
+    Returns:
+        tuple: (variant filename, content coding), or None to send the original
+    """
+    path = os.path.join(folder, filename)
+    accepted = accepted_encodings(accept_encoding)
+    try:
+        original_mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    for coding, suffix in ENCODINGS:
+        if coding in accepted or '*' in accepted:
+            try:
+                # A variant older than its source is stale; ignore it until the next build
+                if os.stat(path + suffix).st_mtime_ns >= original_mtime:
+                    return filename + suffix, coding
+            except OSError:
+                continue
+    return None
+
+
+def _precompressed_view(folder_of, original_view):
+    """Wrap a static view so it prefers precompressed variants of compressible files"""
+    def view(filename):
+        folder = folder_of()
+        if not folder or not filename.endswith(PRECOMPRESS_EXTENSIONS):
+            return original_view(filename=filename)
+
+        variant = precompressed_variant(folder, filename, request.headers.get('Accept-Encoding'))
+        if variant:
+            variant_name, coding = variant
+            response = send_from_directory(folder, variant_name)
+            # Typed as the original file, not as a .gz/.br download
+            response.mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+            response.headers['Content-Encoding'] = coding
+        else:
+            response = original_view(filename=filename)
+        response.vary.add('Accept-Encoding')
+        return response
+    return view
+
+
+def init_precompressed(app):
+    """Serve .br/.gz variants from the app's and blueprints' static folders (call after registering blueprints)"""
+    if 'static' in app.view_functions:
+        app.view_functions['static'] = _precompressed_view(lambda: app.static_folder, app.view_functions['static'])
+    for name, blueprint in app.blueprints.items():
+        endpoint = f"{name}.static"
+        if endpoint in app.view_functions and blueprint.static_folder:
+            app.view_functions[endpoint] = _precompressed_view(
+                lambda blueprint=blueprint: blueprint.static_folder, app.view_functions[endpoint]
+            )
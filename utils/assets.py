@@ -0,0 +1,140 @@
+"""
+Static asset fingerprinting
+url_for('static', ...) and blueprint static URLs get a ?v=<content hash> parameter, and
+responses to fingerprinted URLs are marked immutable for a year, so repeat visitors never
+revalidate them; editing a file changes its hash and therefore its URL. Hashes are kept
+per file and re-checked with a stat(), and can be precomputed into a manifest at deploy time
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+from flask import request
+
+FINGERPRINT_PARAM = 'v'
+FINGERPRINT_LENGTH = 12
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+DEFAULT_MANIFEST = 'asset_manifest.json'  # In the instance folder
+
+
+class AssetFingerprints:
+    """Content hashes of static files, recomputed only when a file's mtime or size changes"""
+
+    def __init__(self):
+        self._hashes = {}  # absolute path -> (mtime_ns, size, hash)
+        self._lock = threading.Lock()
+
+    def fingerprint(self, path):
+        """Short content hash of the file at `path`, or None if it doesn't exist"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        cached = self._hashes.get(path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        fingerprint = digest.hexdigest()[:FINGERPRINT_LENGTH]
+        with self._lock:
+            self._hashes[path] = (stat.st_mtime_ns, stat.st_size, fingerprint)
+        return fingerprint
+
+    def load(self, entries):
+        """Seed from a manifest's {path: [mtime_ns, size, hash]}; stale entries are simply recomputed"""
+        with self._lock:
+            for path, (mtime_ns, size, fingerprint) in entries.items():
+                self._hashes[path] = (mtime_ns, size, fingerprint)
+
+    def entries(self):
+        with self._lock:
+            return {path: list(entry) for path, entry in self._hashes.items()}
+
+
+def static_folder_for(app, endpoint):
+    """Folder served by a static endpoint ('static' or '<blueprint>.static'), or None"""
+    if endpoint == 'static':
+        return app.static_folder
+    if endpoint and endpoint.endswith('.static'):
+        blueprint = app.blueprints.get(endpoint.rsplit('.', 1)[0])
+        return blueprint.static_folder if blueprint else None
+    return None
+
+
+def static_file_path(app, endpoint, filename):
+    folder = static_folder_for(app, endpoint)
+    if not folder or not filename:
+        return None
+    path = os.path.realpath(os.path.join(folder, filename))
+    # Never hash anything outside the static folder
+    return path if path.startswith(os.path.realpath(folder) + os.sep) else None
+
+
+def manifest_path(app):
+    return app.config.get('ASSET_MANIFEST') or os.path.join(app.instance_path, DEFAULT_MANIFEST)
+
+
+def build_asset_manifest(app):
+    """
+    Hash every file in the app's and blueprints' static folders and write the manifest
+
+    Returns:
+        int: Number of files fingerprinted
+    """
+    fingerprints = app.extensions['asset_fingerprints']
+    folders = {app.static_folder} | {bp.static_folder for bp in app.blueprints.values() if bp.static_folder}
+    count = 0
+    for folder in sorted(f for f in folders if f and os.path.isdir(f)):
+        for root, _, files in os.walk(folder):
+            for filename in files:
+                if fingerprints.fingerprint(os.path.realpath(os.path.join(root, filename))):
+                    count += 1
+
+    path = manifest_path(app)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(fingerprints.entries(), f, indent=1, sort_keys=True)
+    os.replace(temp_path, path)
+    return count
+
+
+def init_assets(app):
+    """Fingerprint static URLs and serve fingerprinted files with far-future caching"""
+    fingerprints = AssetFingerprints()
+    app.extensions['asset_fingerprints'] = fingerprints
+
+    path = manifest_path(app)
+    if os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                fingerprints.load(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"⚠️ [Assets] Ignoring unreadable manifest {path}: {e}")
+
+    @app.url_defaults
+    def add_fingerprint(endpoint, values):
+        if FINGERPRINT_PARAM in values:
+            return
+        file_path = static_file_path(app, endpoint, values.get('filename'))
+        fingerprint = fingerprints.fingerprint(file_path) if file_path else None
+        if fingerprint:
+            values[FINGERPRINT_PARAM] = fingerprint
+
+    @app.after_request
+    def cache_fingerprinted(response):
+        requested = request.args.get(FINGERPRINT_PARAM)
+        if requested and response.status_code in (200, 206, 304):
+            view_args = request.view_args or {}
+            file_path = static_file_path(app, request.endpoint, view_args.get('filename'))
+            # Only the current content is immutable; an outdated ?v= must not be pinned
+            if file_path and fingerprints.fingerprint(file_path) == requested:
+                response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+    return fingerprints
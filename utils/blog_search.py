@@ -0,0 +1,338 @@
+"""
+Full-text search over blog posts
+An in-memory inverted index with positional postings per field: queries are tokenized and
+stemmed like the posts, ranked by field-weighted term frequency. Bare words also match
+as prefixes of indexed words ("breathin" -> breathing) while "quoted phrases" must appear
+word for word. Each new index version reuses the analysis of every unchanged post,
+so edits made through blog_manager.py only re-index the posts they touched
+"""
+
+import html
+import math
+import re
+from bisect import bisect_left
+from functools import lru_cache
+
+# Matches in a title count five times as much as the same match in the body
+FIELD_WEIGHTS = {'title': 5.0, 'tags': 3.0, 'excerpt': 2.0, 'content': 1.0}
+MIN_PREFIX_LENGTH = 3  # Shortest unquoted word also matched as a prefix ("breathin" -> breathing)
+MAX_PREFIX_TERMS = 50  # Completions searched per word, shortest first (broad prefixes like "the" stay cheap)
+
+TAG = re.compile(r'<[^>]+>')
+WORD = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+QUERY_PART = re.compile(r'"([^"]*)"|(\S+)')
+
+
+# --- Porter stemmer (M. F. Porter, 1980) ---
+
+def _is_consonant(word, i):
+    if word[i] in 'aeiou':
+        return False
+    if word[i] == 'y':
+        return i == 0 or not _is_consonant(word, i - 1)
+    return True
+
+
+def _measure(stem):
+    """Number of vowel-consonant sequences in `stem` (Porter's m)"""
+    m = 0
+    previous_vowel = False
+    for i in range(len(stem)):
+        consonant = _is_consonant(stem, i)
+        if consonant and previous_vowel:
+            m += 1
+        previous_vowel = not consonant
+    return m
+
+
+def _has_vowel(stem):
+    return any(not _is_consonant(stem, i) for i in range(len(stem)))
+
+
+def _ends_double_consonant(word):
+    return len(word) > 1 and word[-1] == word[-2] and _is_consonant(word, len(word) - 1)
+
+
+def _ends_cvc(word):
+    return (len(word) > 2 and _is_consonant(word, len(word) - 3) and not _is_consonant(word, len(word) - 2)
+            and _is_consonant(word, len(word) - 1) and word[-1] not in 'wxy')
+
+
+def _replace(word, rules, min_measure):
+    """Apply the first matching (suffix, replacement) rule whose stem has measure > min_measure"""
+    for suffix, replacement in rules:
+        if word.endswith(suffix):
+            stem = word[:-len(suffix)]
+            return stem + replacement if _measure(stem) > min_measure else word
+    return word
+
+
+STEP2 = (('ational', 'ate'), ('tional', 'tion'), ('enci', 'ence'), ('anci', 'ance'), ('izer', 'ize'),
+         ('bli', 'ble'), ('alli', 'al'), ('entli', 'ent'), ('eli', 'e'), ('ousli', 'ous'), ('ization', 'ize'),
+         ('ation', 'ate'), ('ator', 'ate'), ('alism', 'al'), ('iveness', 'ive'), ('fulness', 'ful'),
+         ('ousness', 'ous'), ('aliti', 'al'), ('iviti', 'ive'), ('biliti', 'ble'), ('logi', 'log'))
+STEP3 = (('icate', 'ic'), ('ative', ''), ('alize', 'al'), ('iciti', 'ic'), ('ical', 'ic'), ('ful', ''),
+         ('ness', ''))
+STEP4 = ('al', 'ance', 'ence', 'er', 'ic', 'able', 'ible', 'ant', 'ement', 'ment', 'ent', 'ion', 'ou',
+         'ism', 'ate', 'iti', 'ous', 'ive', 'ize')
+
+
+@lru_cache(maxsize=65536)  # A blog's vocabulary is small; most words repeat
+def stem(word):
+    """Reduce an English word to its Porter stem ("healing", "heals" -> "heal")"""
+    if len(word) <= 2:
+        return word
+
+    # Step 1a: plurals
+    if word.endswith('sses') or word.endswith('ies'):
+        word = word[:-2]
+    elif word.endswith('s') and not word.endswith('ss'):
+        word = word[:-1]
+
+    # Step 1b: -ed / -ing
+    if word.endswith('eed'):
+        if _measure(word[:-3]) > 0:
+            word = word[:-1]
+    else:
+        for suffix in ('ed', 'ing'):
+            if word.endswith(suffix) and _has_vowel(word[:-len(suffix)]):
+                word = word[:-len(suffix)]
+                if word.endswith(('at', 'bl', 'iz')):
+                    word += 'e'
+                elif _ends_double_consonant(word) and word[-1] not in 'lsz':
+                    word = word[:-1]
+                elif _measure(word) == 1 and _ends_cvc(word):
+                    word += 'e'
+                break
+
+    # Step 1c: y -> i
+    if word.endswith('y') and _has_vowel(word[:-1]):
+        word = word[:-1] + 'i'
+
+    word = _replace(word, STEP2, 0)
+    word = _replace(word, STEP3, 0)
+
+    # Step 4: strip remaining suffixes from long stems
+    for suffix in sorted(STEP4, key=len, reverse=True):
+        if word.endswith(suffix):
+            stem_ = word[:-len(suffix)]
+            if _measure(stem_) > 1 and (suffix != 'ion' or stem_.endswith(('s', 't'))):
+                word = stem_
+            break
+
+    # Step 5: final -e and -ll
+    if word.endswith('e'):
+        stem_ = word[:-1]
+        if _measure(stem_) > 1 or (_measure(stem_) == 1 and not _ends_cvc(stem_)):
+            word = stem_
+    if word.endswith('ll') and _measure(word) > 1:
+        word = word[:-1]
+    return word
+
+
+def tokenize(text):
+    """Lower-cased words of `text`, with HTML tags and entities removed"""
+    return WORD.findall(html.unescape(TAG.sub(' ', text or '')).lower())
+
+
+def words(text):
+    """Lower-cased words of `text` as they are stemmed (apostrophes dropped), in order"""
+    return [token.replace("'", '') for token in tokenize(text)]
+
+
+def analyze(text):
+    """Stemmed terms of `text`, in order"""
+    return [stem(word) for word in words(text)]
+
+
+# --- Index ---
+
+def post_fields(post):
+    """Searchable text of a post, by field"""
+    return {
+        'title': post.get('title', ''),
+        'tags': ' '.join(post.get('tags', [])),
+        'excerpt': post.get('excerpt', ''),
+        'content': post.get('content', '')
+    }
+
+
+def analyze_post(post):
+    """
+    Returns:
+        dict: term -> {field: [positions]}
+    """
+    terms = {}
+    for field, text in post_fields(post).items():
+        for position, term in enumerate(analyze(text)):
+            terms.setdefault(term, {}).setdefault(field, []).append(position)
+    return terms
+
+
+def post_words(post):
+    """Every distinct unstemmed word of a post (for prefix matching)"""
+    return frozenset(word for text in post_fields(post).values() for word in words(text))
+
+
+class SearchIndex:
+    """Immutable inverted index; build() derives a new version from the previous one"""
+
+    def __init__(self, documents, postings, word_counts):
+        self.documents = documents  # post id -> (fields fingerprint, analyze_post() result, post_words())
+        self.postings = postings  # term -> {post id: {field: [positions]}}
+        self.word_counts = word_counts  # unstemmed word -> number of posts containing it
+        self.vocabulary = sorted(postings)  # Stems, for prefix matches
+        self.words = sorted(word_counts)  # Unstemmed words, for prefix matches
+
+    @classmethod
+    def build(cls, posts, previous=None):
+        """
+        Index `posts`, re-analysing only posts that are new or changed since `previous`
+
+        Only the posting lists of terms that belong to changed posts are copied;
+        `previous` itself is left untouched, so readers of it are unaffected.
+        """
+        old_documents = previous.documents if previous else {}
+        postings = dict(previous.postings) if previous else {}
+        word_counts = dict(previous.word_counts) if previous else {}
+        copied = set()
+
+        def count_words(document_words, delta):
+            for word in document_words:
+                word_counts[word] = word_counts.get(word, 0) + delta
+                if not word_counts[word]:
+                    del word_counts[word]
+
+        def posting_list(term):
+            if term not in copied:
+                postings[term] = dict(postings.get(term, {}))
+                copied.add(term)
+            return postings[term]
+
+        documents = {}
+        for post in posts:
+            fingerprint = tuple(post_fields(post).values())
+            old = old_documents.get(post['id'])
+            if old and old[0] == fingerprint:
+                documents[post['id']] = old
+                continue
+            if old:
+                for term in old[1]:
+                    del posting_list(term)[post['id']]
+                count_words(old[2], -1)
+            terms = analyze_post(post)
+            for term, fields in terms.items():
+                posting_list(term)[post['id']] = fields
+            new_words = post_words(post)
+            count_words(new_words, 1)
+            documents[post['id']] = (fingerprint, terms, new_words)
+
+        for post_id, (_, terms, old_words) in old_documents.items():
+            if post_id not in documents:
+                for term in terms:
+                    posting_list(term).pop(post_id, None)
+                count_words(old_words, -1)
+
+        for term in copied:
+            if not postings[term]:
+                del postings[term]
+        return cls(documents, postings, word_counts)
+
+    def _idf(self, term_postings):
+        return math.log(1 + len(self.documents) / len(term_postings))
+
+    @staticmethod
+    def _with_prefix(sorted_words, prefix):
+        for i in range(bisect_left(sorted_words, prefix), len(sorted_words)):
+            if not sorted_words[i].startswith(prefix):
+                break
+            yield sorted_words[i]
+
+    def _expand(self, word, term):
+        """
+        Postings for stem `term`, plus every indexed term that `word` (as typed)
+        or `term` is a prefix of: "breathin" finds breathing, "heal" finds healthy
+        """
+        completions = set()
+        if len(word) >= MIN_PREFIX_LENGTH:
+            completions.update(stem(match) for match in self._with_prefix(self.words, word))
+            completions.update(self._with_prefix(self.vocabulary, term))
+        completions.discard(term)
+        terms = [term] + sorted(completions, key=lambda completion: (len(completion), completion))[:MAX_PREFIX_TERMS]
+        return [self.postings[term] for term in terms if term in self.postings]
+
+    def _has_words(self, post_id, words):
+        """Whether a post contains each of `words` as written, not just words sharing their stems"""
+        return self.documents[post_id][2].issuperset(words)
+
+    def _phrase_matches(self, terms):
+        """
+        Returns:
+            dict: post id -> {field: number of times the phrase occurs}
+        """
+        lists = [self.postings.get(term) for term in terms]
+        if not all(lists):
+            return {}
+        matches = {}
+        for post_id in set.intersection(*(set(postings) for postings in lists)):
+            for field, starts in lists[0][post_id].items():
+                count = sum(
+                    1 for start in starts
+                    if all(start + offset in lists[offset][post_id].get(field, ())
+                           for offset in range(1, len(terms)))
+                )
+                if count:
+                    matches.setdefault(post_id, {})[field] = count
+        return matches
+
+    def search(self, query):
+        """
+        Post ids matching every word and "quoted phrase" of `query`, best first
+
+        Returns:
+            list: (score, post id) pairs
+        """
+        clauses = []  # Each clause: {post id: score contribution}
+        for phrase, word in QUERY_PART.findall(query):
+            query_words = words(phrase or word)
+            terms = [stem(query_word) for query_word in query_words]
+            if not terms:
+                continue
+            if phrase and len(terms) > 1:
+                matches = self._phrase_matches(terms)
+                matches = {post_id: fields for post_id, fields in matches.items()
+                           if self._has_words(post_id, query_words)}
+                idf = sum(self._idf(self.postings[term]) for term in terms) if matches else 0
+                clauses.append({
+                    post_id: idf * sum(FIELD_WEIGHTS[field] * (1 + math.log(count)) for field, count in fields.items())
+                    for post_id, fields in matches.items()
+                })
+                continue
+            for query_word, term in zip(query_words, terms):
+                scores = {}
+                if phrase:  # Quoted words match exactly, as typed
+                    expanded = [{post_id: fields for post_id, fields in self.postings.get(term, {}).items()
+                                 if self._has_words(post_id, query_words)}]
+                else:
+                    expanded = self._expand(query_word, term)
+                for term_postings in expanded:
+                    if not term_postings:
+                        continue
+                    idf = self._idf(term_postings)
+                    for post_id, fields in term_postings.items():
+                        scores[post_id] = scores.get(post_id, 0) + idf * sum(
+                            FIELD_WEIGHTS[field] * (1 + math.log(len(positions)))
+                            for field, positions in fields.items()
+                        )
+                clauses.append(scores)
+
+        if not clauses:
+            return []
+        clauses.sort(key=len)  # Intersect from the rarest clause
+        candidates = set(clauses[0])
+        for clause in clauses[1:]:
+            candidates &= clause.keys()
+            if not candidates:
+                return []
+        return sorted(((sum(clause[post_id] for clause in clauses), post_id) for post_id in candidates),
+                      key=lambda result: -result[0])
@@ -0,0 +1,247 @@
+"""
+Indexed blog post store
+Posts are loaded once into in-memory indexes (by slug, category, tag and published date)
+and reloaded only when the backing file changes on disk, so blog requests are dictionary
+lookups instead of a JSON parse, filter and sort each time. The backing file is either the
+blog_data.json document or, optionally, a SQLite database of posts
+"""
+
+import json
+import math
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from types import MappingProxyType
+
+from utils.blog_search import SearchIndex
+
+API_POST_FIELDS = ('id', 'title', 'slug', 'excerpt', 'author', 'published_date', 'tags', 'read_time')
+RELATED_POSTS = 3  # Related posts kept per post
+CATEGORY_WEIGHT = 0.25  # Score for sharing a category, on top of the 0..1 tag similarity
+
+
+def related_posts_graph(published, by_tag, by_category, k=RELATED_POSTS):
+    """
+    Top-k related posts for every published post
+
+    Candidates are only posts sharing a tag or the category (found through the
+    tag and category maps, not by comparing every pair). They are scored by
+    IDF-weighted Jaccard similarity of their tags, so rare shared tags count for
+    more than common ones, plus CATEGORY_WEIGHT for the same category. Ties go
+    to the newer post.
+
+    Returns:
+        dict: post id -> tuple of posts, best first
+    """
+    idf = {tag: math.log(1 + len(published) / len(posts)) for tag, posts in by_tag.items()}
+    recency = {post['id']: rank for rank, post in enumerate(published)}
+    tags_of = {post['id']: {tag.lower() for tag in post.get('tags', [])} for post in published}
+
+    graph = {}
+    for post in published:
+        tags = tags_of[post['id']]
+        candidates = {}
+        for tag in tags:
+            for other in by_tag[tag]:
+                candidates[other['id']] = other
+        for other in by_category.get(post.get('category'), ()):
+            candidates[other['id']] = other
+        candidates.pop(post['id'], None)
+
+        scored = []
+        for other_id, other in candidates.items():
+            other_tags = tags_of[other_id]
+            union = sum(idf[tag] for tag in tags | other_tags)
+            score = sum(idf[tag] for tag in tags & other_tags) / union if union else 0.0
+            if other.get('category') == post.get('category'):
+                score += CATEGORY_WEIGHT
+            scored.append((-score, recency[other_id], other))
+        scored.sort(key=lambda entry: entry[:2])
+        graph[post['id']] = tuple(other for _, _, other in scored[:k])
+    return graph
+
+
+class BlogIndex:
+    """Immutable lookup tables over one version of the blog posts"""
+
+    def __init__(self, posts, previous=None):
+        """
+        Args:
+            posts (list): Post dicts in file order
+            previous (BlogIndex): Prior version; its search index is updated rather than rebuilt
+        """
+        self.posts = tuple(posts)  # Every post, in file order
+
+        # Newest first; the sort is stable, so posts sharing a date keep file order
+        published = [post for post in self.posts if post.get('published', False)]
+        published.sort(key=lambda post: post['published_date'], reverse=True)
+        self.published = tuple(published)
+
+        by_category = {}
+        by_tag = {}
+        for post in self.published:
+            by_category.setdefault(post.get('category'), []).append(post)
+            for tag in {tag.lower() for tag in post.get('tags', [])}:
+                by_tag.setdefault(tag, []).append(post)
+
+        self.by_id = MappingProxyType({post['id']: post for post in self.published})
+        self.by_slug = MappingProxyType({post['slug']: post for post in self.published})
+        self.by_category = MappingProxyType({key: tuple(posts) for key, posts in by_category.items()})
+        self.by_tag = MappingProxyType({key: tuple(posts) for key, posts in by_tag.items()})
+        # /blog/api/posts lists published posts in file order, without their content
+        self.api_posts = tuple(
+            {field: post[field] for field in API_POST_FIELDS}
+            for post in self.posts if post.get('published', False)
+        )
+        self.related = MappingProxyType(related_posts_graph(self.published, by_tag, by_category))
+        self.search_index = SearchIndex.build(self.published, previous.search_index if previous else None)
+        self._recency = {post['id']: rank for rank, post in enumerate(self.published)}
+
+    def get_post(self, slug):
+        """Published post with this slug, or None"""
+        return self.by_slug.get(slug)
+
+    def posts_in_category(self, category):
+        return self.by_category.get(category, ())
+
+    def posts_tagged(self, tag):
+        """Published posts carrying `tag` (case-insensitive), newest first"""
+        return self.by_tag.get(tag.lower(), ())
+
+    def related_posts(self, post):
+        """Precomputed most related published posts, best first"""
+        return self.related.get(post['id'], ())
+
+    def search(self, query):
+        """Published posts matching `query` (see utils/blog_search.py), best first, ties newest first"""
+        results = self.search_index.search(query)
+        results.sort(key=lambda result: (-result[0], self._recency[result[1]]))
+        return [self.by_id[post_id] for _, post_id in results]
+
+
+def file_signature(*paths):
+    """(mtime_ns, size) of each existing path; changes whenever any of them is rewritten"""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            signature.append(None)
+        else:
+            signature.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+class BlogStore:
+    """Base class: keeps one BlogIndex and rebuilds it when signature() changes"""
+
+    def __init__(self):
+        self._index = None
+        self._signature = None
+        self._lock = threading.Lock()
+
+    def signature(self):
+        raise NotImplementedError
+
+    def load_posts(self):
+        raise NotImplementedError
+
+    def get_index(self):
+        """Current BlogIndex; costs one stat() unless the backing file changed"""
+        signature = self.signature()
+        index = self._index
+        if index is not None and signature == self._signature:
+            return index
+
+        with self._lock:
+            if self._index is None or signature != self._signature:
+                self._index = BlogIndex(self.load_posts(), self._index)
+                self._signature = signature
+                print(f"📝 [Blog] Indexed {len(self._index.published)} published posts")
+            return self._index
+
+    def invalidate(self):
+        """Force a reload on the next get_index() (e.g. after a same-second rewrite)"""
+        with self._lock:
+            self._signature = None
+
+
+class JsonBlogStore(BlogStore):
+    """Posts from a blog_data.json document ({"posts": [...]})"""
+
+    def __init__(self, path, default=None):
+        """
+        Args:
+            path (str): JSON file; it may not exist yet
+            default (callable): Returns the data to serve while the file is missing
+        """
+        super().__init__()
+        self.path = path
+        self.default = default
+
+    def signature(self):
+        return file_signature(self.path)
+
+    def load_posts(self):
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as f:
+                return json.load(f).get('posts', [])
+        return self.default()['posts'] if self.default else []
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blog_posts (
+    id INTEGER PRIMARY KEY,
+    slug TEXT NOT NULL UNIQUE,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+"""
+
+
+class SqliteBlogStore(BlogStore):
+    """Posts from a SQLite database (one JSON document per row, in `position` order)"""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+
+    def signature(self):
+        # In WAL mode committed writes land in the -wal file before a checkpoint
+        return file_signature(self.path, self.path + '-wal')
+
+    def load_posts(self):
+        if not os.path.exists(self.path):
+            return []
+        # Read-only, so loading never touches the file it is watching
+        with closing(sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)) as conn:
+            try:
+                rows = conn.execute("SELECT data FROM blog_posts ORDER BY position").fetchall()
+            except sqlite3.OperationalError:
+                return []  # No posts written yet
+        return [json.loads(data) for (data,) in rows]
+
+
+def write_posts_to_sqlite(path, posts):
+    """Replace the posts in a SQLite blog database (e.g. to migrate from blog_data.json)"""
+    with closing(sqlite3.connect(path)) as conn, conn:
+        conn.executescript(SQLITE_SCHEMA)
+        conn.execute("DELETE FROM blog_posts")
+        conn.executemany(
+            "INSERT INTO blog_posts (id, slug, position, data) VALUES (?, ?, ?, ?)",
+            [(post['id'], post['slug'], position, json.dumps(post)) for position, post in enumerate(posts)]
+        )
+
+
+def create_blog_store(config, default=None):
+    """
+    Build the store selected by BLOG_STORE ('json', the default, or 'sqlite')
+
+    Args:
+        config (dict): App config (BLOG_STORE, BLOG_DATA_FILE, BLOG_DB_FILE)
+        default (callable): Fallback data for a missing JSON file
+    """
+    if config.get('BLOG_STORE', 'json') == 'sqlite':
+        return SqliteBlogStore(config.get('BLOG_DB_FILE', 'blog.sqlite'))
+    return JsonBlogStore(config.get('BLOG_DATA_FILE', 'blog_data.json'), default)
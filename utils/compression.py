@@ -0,0 +1,204 @@
+"""
+Response compression middleware
+Wraps the WSGI app and gzip/brotli-compresses text responses (HTML, JSON, CSS, JS, ...)
+above a size threshold. Bodies with a strong ETag are compressed once and kept in a small
+LRU cache keyed by URL and ETag, so revalidated pages like /booking/events and the blog
+API cost one compression per content change. Streaming responses (no Content-Length),
+responses that already carry a Content-Encoding (the cached home page, precompressed
+static files) and HEAD requests pass through untouched
+"""
+
+import gzip
+import threading
+from collections import OrderedDict
+
+from werkzeug.datastructures import Headers
+
+try:
+    import brotli
+except ImportError:  # Optional: without it responses are gzip-only
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/json', 'application/javascript', 'application/xml', 'application/rss+xml',
+    'application/atom+xml', 'application/manifest+json', 'image/svg+xml'
+)
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # Per-request compression; build_assets.py uses 11 for static files
+
+
+def compress(body, coding, level=GZIP_LEVEL):
+    if coding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, level, mtime=0)
+
+
+def choose_coding(accept_encoding):
+    """Content coding to use for a request's Accept-Encoding header, or None"""
+    accepted = {}
+    for part in (accept_encoding or '').lower().split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding.strip()] = quality
+    for coding in (('br', 'gzip') if brotli else ('gzip',)):
+        if accepted.get(coding, accepted.get('*', 0)) > 0:
+            return coding
+    return None
+
+
+def coded_etag(etag, coding):
+    """ETag of the compressed representation ("abc" -> "abc-gzip"), as utils/page_cache.py does"""
+    return f'{etag[:-1]}-{coding}"' if etag.endswith('"') else etag
+
+
+def add_vary(headers):
+    vary = headers.get('Vary')
+    if not vary:
+        headers['Vary'] = 'Accept-Encoding'
+    elif 'accept-encoding' not in vary.lower() and vary.strip() != '*':
+        headers['Vary'] = f"{vary}, Accept-Encoding"
+
+
+def split_etags(header):
+    return [tag.strip() for tag in header.split(',')]
+
+
+def with_app_etags(if_none_match, coding):
+    """
+    Add the app's own ETag for every coded one in an If-None-Match header
+
+    The coded tags stay too: views that compress by themselves (utils/page_cache.py)
+    issue and compare "abc-gzip" directly.
+    """
+    suffix = f'-{coding}"'
+    tags = split_etags(if_none_match)
+    app_tags = [f'{tag[:-len(suffix)]}"' for tag in tags if tag.endswith(suffix)]
+    return ', '.join(tags + app_tags)
+
+
+class CompressionMiddleware:
+    """WSGI middleware compressing eligible responses with the best coding the client accepts"""
+
+    def __init__(self, app, min_size=1024, level=GZIP_LEVEL, cache_entries=256):
+        self.app = app
+        self.min_size = min_size
+        self.level = level
+        self.cache_entries = cache_entries
+        self._cache = OrderedDict()  # (url, etag, coding) -> compressed body
+        self._lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        if environ.get('REQUEST_METHOD') == 'HEAD':
+            return self.app(environ, start_response)
+        coding = choose_coding(environ.get('HTTP_ACCEPT_ENCODING'))
+
+        # A client revalidating a compressed copy sends our coded ETag; let the app see its own
+        if_none_match = environ.get('HTTP_IF_NONE_MATCH', '')
+        if coding and if_none_match:
+            environ['HTTP_IF_NONE_MATCH'] = with_app_etags(if_none_match, coding)
+
+        captured = []
+
+        def write(data):
+            raise RuntimeError('CompressionMiddleware does not support the WSGI write() callable')
+
+        def capture(status, headers, exc_info=None):
+            # Held back until the body has been looked at
+            captured[:] = [status, Headers(headers), exc_info]
+            return write
+
+        body = self.app(environ, capture)
+        status, headers, exc_info = captured
+
+        if not self._compressible(status, headers):
+            etag = headers.get('ETag')
+            if status.startswith('304') and coding and etag and coded_etag(etag, coding) in split_etags(if_none_match):
+                # Not Modified for a copy we compressed: answer with the ETag the client holds
+                headers['ETag'] = coded_etag(etag, coding)
+                add_vary(headers)
+            elif self._compressible_type(headers):
+                add_vary(headers)
+            start_response(status, headers.to_wsgi_list(), exc_info)
+            return body
+
+        add_vary(headers)
+        if not coding or int(headers.get('Content-Length')) < self.min_size:
+            start_response(status, headers.to_wsgi_list(), exc_info)
+            return body
+
+        etag = headers.get('ETag')
+        cacheable = etag and not etag.startswith('W/')
+        key = (environ.get('PATH_INFO', ''), environ.get('QUERY_STRING', ''), etag, coding)
+        compressed = self._cached(key) if cacheable else None
+        if compressed is None:
+            try:
+                data = b''.join(body)
+            finally:
+                if hasattr(body, 'close'):
+                    body.close()
+            compressed = compress(data, coding, self.level)
+            if len(compressed) >= len(data):
+                start_response(status, headers.to_wsgi_list(), exc_info)
+                return [data]
+            if cacheable:
+                self._store(key, compressed)
+        elif hasattr(body, 'close'):
+            body.close()
+
+        headers['Content-Encoding'] = coding
+        headers['Content-Length'] = str(len(compressed))
+        if etag:
+            headers['ETag'] = coded_etag(etag, coding)
+        start_response(status, headers.to_wsgi_list(), exc_info)
+        return [compressed]
+
+    def _compressible_type(self, headers):
+        content_type = (headers.get('Content-Type') or '').lower()
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    def _compressible(self, status, headers):
+        return (
+            status.startswith('200')
+            and self._compressible_type(headers)
+            and not headers.get('Content-Encoding')
+            and headers.get('Content-Length') is not None  # Streaming responses pass through
+            and 'no-transform' not in (headers.get('Cache-Control') or '').lower()
+        )
+
+    def _cached(self, key):
+        with self._lock:
+            compressed = self._cache.get(key)
+            if compressed is not None:
+                self._cache.move_to_end(key)
+            return compressed
+
+    def _store(self, key, compressed):
+        with self._lock:
+            self._cache[key] = compressed
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+def init_compression(app):
+    """Wrap app.wsgi_app in the compression middleware (configured by COMPRESS_* settings)"""
+    middleware = CompressionMiddleware(
+        app.wsgi_app,
+        min_size=app.config.get('COMPRESS_MIN_SIZE', 1024),
+        level=app.config.get('COMPRESS_LEVEL', GZIP_LEVEL),
+        cache_entries=app.config.get('COMPRESS_CACHE_ENTRIES', 256),
+    )
+    app.wsgi_app = middleware
+    app.extensions['compression'] = middleware
+    return middleware
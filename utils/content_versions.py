@@ -0,0 +1,94 @@
+"""
+Content version counters
+Bumps a per-model version row in content_versions whenever a tracked model changes,
+so caches and HTTP validators can detect staleness with one primary-key lookup
+"""
+
+from datetime import datetime
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from db import db
+from db.models import ContentVersion
+
+# Model class -> version name, filled by track_model_versions()
+TRACKED_MODELS = {}
+
+
+def track_model_versions(model, name):
+    """Bump the `name` version whenever an instance of `model` is inserted, updated or deleted"""
+    TRACKED_MODELS[model] = name
+
+
+def bump_content_versions(session, names):
+    """Increment the given version counters on the session's connection"""
+    table = ContentVersion.__table__
+    now = datetime.utcnow()
+    for name in sorted(names):
+        stmt = sqlite_insert(table).values(name=name, version=1, updated_at=now)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['name'],
+            set_={'version': table.c.version + 1, 'updated_at': stmt.excluded.updated_at}
+        )
+        session.execute(stmt)
+
+
+def get_content_version(name):
+    """
+    Get the current version of a tracked model without loading any ORM objects
+
+    Returns:
+        tuple: (version, updated_at); (0, None) before the first change
+    """
+    table = ContentVersion.__table__
+    row = db.session.execute(
+        select(table.c.version, table.c.updated_at).where(table.c.name == name)
+    ).one_or_none()
+    return (row.version, row.updated_at) if row else (0, None)
+
+
+def get_content_versions(names):
+    """
+    Get several versions in one primary-key lookup
+
+    Returns:
+        tuple: The version of each name, in the given order (0 before the first change)
+    """
+    table = ContentVersion.__table__
+    rows = dict(db.session.execute(
+        select(table.c.name, table.c.version).where(table.c.name.in_(list(names)))
+    ).all())
+    return tuple(rows.get(name, 0) for name in names)
+
+
+def _bump_changed_models(session, flush_context, instances):
+    """before_flush hook: bump the version of every tracked model touched by this flush"""
+    names = set()
+    for obj in list(session.new) + list(session.deleted):
+        name = TRACKED_MODELS.get(type(obj))
+        if name:
+            names.add(name)
+    for obj in session.dirty:
+        name = TRACKED_MODELS.get(type(obj))
+        if name and session.is_modified(obj):
+            names.add(name)
+
+    if names:
+        bump_content_versions(session, names)
+
+
+def init_content_versions():
+    """Register the version tracker on the application session (idempotent)"""
+    from db.models import AboutImage, Booking, EmailTemplate, ImageDerivative, Service, SiteSetting, Testimonial
+
+    track_model_versions(Booking, 'bookings')
+    track_model_versions(EmailTemplate, 'email_templates')
+    track_model_versions(SiteSetting, 'site_settings')
+    track_model_versions(Service, 'services')
+    track_model_versions(Testimonial, 'testimonials')
+    track_model_versions(AboutImage, 'about_images')
+    track_model_versions(ImageDerivative, 'image_derivatives')
+
+    if not event.contains(db.session, 'before_flush', _bump_changed_models):
+        event.listen(db.session, 'before_flush', _bump_changed_models)
@@ -0,0 +1,115 @@
+"""
+Compiled email template rendering
+EmailTemplate subjects and bodies are compiled once into a format plan and rendered in a
+single pass; compiled templates are cached by (id, updated_at) and revalidated against the
+'email_templates' content version, so admin edits take effect immediately
+"""
+
+import re
+import threading
+
+from db.models import EmailTemplate
+from utils.content_versions import get_content_version
+
+PLACEHOLDER = re.compile(r'\{([A-Za-z_][A-Za-z0-9_]*)\}')
+
+# name -> (content version, CompiledEmailTemplate or None)
+_templates_by_name = {}
+# (template id, updated_at) -> CompiledEmailTemplate
+_compiled = {}
+_lock = threading.Lock()
+
+
+def compile_template(text):
+    """
+    Split a template into its literal text and {placeholder} names
+
+    Returns:
+        tuple: (literals, names) with len(literals) == len(names) + 1
+    """
+    literals = []
+    names = []
+    position = 0
+    for match in PLACEHOLDER.finditer(text or ''):
+        literals.append(text[position:match.start()])
+        names.append(match.group(1))
+        position = match.end()
+    literals.append((text or '')[position:])
+    return tuple(literals), tuple(names)
+
+
+def render_compiled(plan, values):
+    """Fill a compiled template in one pass; unknown placeholders are left as written"""
+    literals, names = plan
+    parts = [literals[0]]
+    for name, literal in zip(names, literals[1:]):
+        value = values.get(name)
+        parts.append('{%s}' % name if value is None else str(value))
+        parts.append(literal)
+    return ''.join(parts)
+
+
+class CompiledEmailTemplate:
+    """An EmailTemplate's subject and body, compiled for rendering"""
+
+    __slots__ = ('id', 'name', 'updated_at', 'source', 'subject_plan', 'body_plan')
+
+    def __init__(self, template):
+        self.id = template.id
+        self.name = template.name
+        self.updated_at = template.updated_at
+        self.source = (template.subject, template.body)
+        self.subject_plan = compile_template(template.subject)
+        self.body_plan = compile_template(template.body)
+
+    def render(self, values):
+        """Returns: tuple: (subject, body)"""
+        return render_compiled(self.subject_plan, values), render_compiled(self.body_plan, values)
+
+
+def get_email_template(name):
+    """
+    Get the compiled template called `name`, or None if there is none
+
+    While no template has changed this costs a single primary-key lookup of
+    the content version; the template row itself is only reloaded after an edit.
+    """
+    version = get_content_version('email_templates')[0]
+    cached = _templates_by_name.get(name)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    template = EmailTemplate.query.filter_by(name=name).first()
+    compiled = None
+    if template:
+        key = (template.id, template.updated_at)
+        compiled = _compiled.get(key)
+        # updated_at has one-second resolution, so also check the text itself
+        if compiled is None or compiled.source != (template.subject, template.body):
+            compiled = CompiledEmailTemplate(template)
+            with _lock:
+                # Drop plans for older versions of the same template
+                for stale in [k for k in _compiled if k[0] == template.id]:
+                    del _compiled[stale]
+                _compiled[key] = compiled
+
+    _templates_by_name[name] = (version, compiled)
+    return compiled
+
+
+def render_email_template(name, values):
+    """
+    Render the template called `name` with `values` ({placeholder name: value})
+
+    Returns:
+        tuple: (subject, body), or None if the template doesn't exist
+    """
+    compiled = get_email_template(name)
+    return compiled.render(values) if compiled else None
+
+
+def invalidate_email_templates():
+    """Forget every compiled template (call after editing templates)"""
+    with _lock:
+        _templates_by_name.clear()
+        _compiled.clear()
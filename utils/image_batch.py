@@ -0,0 +1,183 @@
+"""
+Batch re-encoding of the static image library
+Walks image trees under the static folder and writes the same resized AVIF/WebP/JPEG
+derivatives as uploads get (utils/images.py), spreading the encoding over a process pool.
+A manifest of content hashes lets reruns skip every file that hasn't changed, and the
+derivatives of originals deleted since the last run are removed
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from utils.images import DERIVATIVE_DIR, DERIVATIVE_WIDTHS, FORMATS, available_formats, encode_derivatives
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+DEFAULT_TREES = ('images', 'uploads')
+
+
+def find_images(static_folder, trees=DEFAULT_TREES):
+    """Paths (relative to static_folder, '/'-separated) of every original image in the trees"""
+    paths = []
+    for tree in trees:
+        for root, dirs, files in os.walk(os.path.join(static_folder, tree)):
+            dirs[:] = sorted(d for d in dirs if d != DERIVATIVE_DIR)
+            for filename in sorted(files):
+                if filename.lower().endswith(IMAGE_EXTENSIONS):
+                    paths.append(os.path.relpath(os.path.join(root, filename), static_folder).replace(os.sep, '/'))
+    return paths
+
+
+def file_hash(path):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def encoding_settings(widths, formats):
+    """What the derivatives depend on besides the source; a change re-encodes everything"""
+    return {'widths': list(widths), 'formats': {name: FORMATS[name][2] for name in formats}}
+
+
+def load_manifest(path):
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            return json.load(f)
+    return {'settings': None, 'files': {}}
+
+
+def save_manifest(path, manifest):
+    """Write atomically, so an interrupted run never leaves a truncated manifest"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def process_image(static_folder, source_path, previous, widths, formats):
+    """
+    Worker: hash one image and re-encode it unless the manifest entry still matches
+
+    Args:
+        previous (dict): This file's manifest entry from the last run, or None
+
+    Returns:
+        tuple: (source_path, status, manifest entry or error message) with status
+            'skipped', 'encoded' or 'failed'
+    """
+    try:
+        source_file = os.path.join(static_folder, source_path)
+        digest = file_hash(source_file)
+        if previous and previous['sha256'] == digest and all(
+            os.path.exists(os.path.join(static_folder, derivative['path'])) for derivative in previous['derivatives']
+        ):
+            return source_path, 'skipped', previous
+
+        derivatives = encode_derivatives(static_folder, source_path, widths, formats)
+        return source_path, 'encoded', {
+            'sha256': digest,
+            'original_size': os.path.getsize(source_file),
+            'derivatives': derivatives
+        }
+    except Exception as e:
+        return source_path, 'failed', f"{type(e).__name__}: {e}"
+
+
+def in_trees(source_path, trees):
+    return any(source_path.startswith(f"{tree.strip('/')}/") for tree in trees)
+
+
+def remove_derivative_files(static_folder, entry):
+    """Delete the derivative files listed in a manifest entry (already missing ones are ignored)"""
+    for derivative in entry['derivatives']:
+        try:
+            os.remove(os.path.join(static_folder, derivative['path']))
+        except FileNotFoundError:
+            pass
+
+
+def best_full_size(entry):
+    """Smallest file among the widest derivatives (what a large screen downloads)"""
+    widest = max(derivative['width'] for derivative in entry['derivatives'])
+    return min(derivative['file_size'] for derivative in entry['derivatives'] if derivative['width'] == widest)
+
+
+def run_batch(static_folder, manifest_path, trees=DEFAULT_TREES, widths=DERIVATIVE_WIDTHS, formats=None,
+              workers=None, on_result=None, on_removed=None):
+    """
+    Re-encode every changed image under the trees
+
+    Args:
+        on_result (callable): Called in this process as on_result(source_path, status, entry)
+            for each file, e.g. to record the derivatives in the database
+        on_removed (callable): Called in this process as on_removed(source_path) for each
+            original deleted since the last run, after its derivative files are removed
+
+    Returns:
+        dict: Report with encoded/skipped/failed/removed paths and original vs. derivative byte totals
+    """
+    formats = list(formats or available_formats())
+    settings = encoding_settings(widths, formats)
+    manifest = load_manifest(manifest_path)
+    previous_files = manifest['files'] if manifest.get('settings') == settings else {}
+
+    report = {'encoded': [], 'skipped': [], 'failed': {}, 'removed': [], 'original_bytes': 0, 'full_size_bytes': 0}
+    sources = find_images(static_folder, trees)
+    # Entries outside the trees being processed are carried over untouched
+    files = {path: entry for path, entry in previous_files.items() if not in_trees(path, trees)}
+
+    current = set(sources)
+    for source_path, entry in sorted(manifest['files'].items()):
+        if in_trees(source_path, trees) and source_path not in current:
+            remove_derivative_files(static_folder, entry)
+            report['removed'].append(source_path)
+            print(f"🗑️ [Images] {source_path}: original deleted, derivatives removed")
+            if on_removed:
+                on_removed(source_path)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(process_image, static_folder, path, previous_files.get(path), widths, formats)
+            for path in sources
+        ]
+        for future in as_completed(futures):
+            source_path, status, result = future.result()
+            if status == 'failed':
+                report['failed'][source_path] = result
+                print(f"❌ [Images] {source_path}: {result}")
+                continue
+
+            files[source_path] = result
+            report[status].append(source_path)
+            report['original_bytes'] += result['original_size']
+            report['full_size_bytes'] += best_full_size(result)
+            if status == 'encoded':
+                print(f"🖼️ [Images] {source_path}: {result['original_size']:,} -> {best_full_size(result):,} bytes")
+            if on_result:
+                on_result(source_path, status, result)
+
+    save_manifest(manifest_path, {'settings': settings, 'files': files})
+    report['encoded'].sort()
+    report['skipped'].sort()
+    report['saved_bytes'] = report['original_bytes'] - report['full_size_bytes']
+    return report
+
+
+def format_report(report):
+    """Human-readable summary of run_batch()'s report"""
+    original = report['original_bytes']
+    saved = report['saved_bytes']
+    percent = saved / original * 100 if original else 0
+    lines = [
+        f"📊 Encoded {len(report['encoded'])}, skipped {len(report['skipped'])} unchanged, "
+        f"{len(report['failed'])} failed, {len(report['removed'])} removed",
+        f"   Originals:              {original / 1e6:8.2f} MB",
+        f"   Full-width derivatives: {report['full_size_bytes'] / 1e6:8.2f} MB",
+        f"   Saved:                  {saved / 1e6:8.2f} MB ({percent:.0f}%)",
+    ]
+    return '\n'.join(lines)
@@ -0,0 +1,212 @@
+"""
+Responsive image derivatives
+Uploaded images are resized to a few standard widths and re-encoded as AVIF, WebP and
+JPEG next to the original (under derivatives/). Their paths and sizes are recorded in
+image_derivatives, and the srcset() / image_sources() template helpers let browsers pick
+the smallest file that fits the screen
+"""
+
+import os
+import threading
+
+from flask import url_for
+from PIL import Image, ImageOps, features
+
+from db import db
+from db.models import ImageDerivative
+from utils.content_versions import get_content_version
+
+DERIVATIVE_WIDTHS = (480, 768, 1280, 1920)
+DERIVATIVE_DIR = 'derivatives'
+
+# format -> (file extension, MIME type, Pillow save options); newest formats first
+FORMATS = {
+    'avif': ('avif', 'image/avif', {'quality': 55, 'speed': 6}),
+    'webp': ('webp', 'image/webp', {'quality': 78, 'method': 4}),
+    'jpeg': ('jpg', 'image/jpeg', {'quality': 80, 'optimize': True, 'progressive': True}),
+}
+
+# (content version, {source path: {format: ((width, url path), ...)}}), built by _load_snapshot()
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def available_formats():
+    """Formats this Pillow build can encode (AVIF needs libavif)"""
+    return [name for name in FORMATS if name == 'jpeg' or features.check(name)]
+
+
+def target_widths(original_width, widths=DERIVATIVE_WIDTHS):
+    """Widths to generate: every standard width below the original, or the original if it is smaller"""
+    sizes = [width for width in widths if width < original_width]
+    return sizes or [original_width]
+
+
+def _prepare(image, image_format):
+    """Mode the encoder accepts; JPEG has no alpha, so transparency is flattened onto white"""
+    if image_format == 'jpeg':
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel('A'))
+            return background
+        return image.convert('RGB')
+    return image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+
+
+def encode_derivatives(static_folder, source_path, widths=DERIVATIVE_WIDTHS, formats=None):
+    """
+    Write resized copies of an image (files only; safe to run in a worker process)
+
+    Args:
+        static_folder (str): Absolute path of the app's static folder
+        source_path (str): Original image, relative to static_folder (e.g. 'uploads/home/hero.jpg')
+
+    Returns:
+        list: dicts with format, width, height, path (relative to static_folder) and file_size
+    """
+    source_file = os.path.join(static_folder, source_path)
+    directory, filename = os.path.split(source_path)
+    # The source extension stays in the name, so photo.png and photo.jpg don't collide
+    name, source_extension = os.path.splitext(filename)
+    name = f"{name}-{source_extension.lstrip('.').lower()}" if source_extension else name
+    prefix = f"{directory}/{DERIVATIVE_DIR}" if directory else DERIVATIVE_DIR
+    os.makedirs(os.path.join(static_folder, prefix), exist_ok=True)
+
+    with Image.open(source_file) as original:
+        image = ImageOps.exif_transpose(original)  # Phone photos are often stored sideways
+        image.load()
+
+    derivatives = []
+    for width in target_widths(image.width, widths):
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for image_format in formats or available_formats():
+            extension, _, options = FORMATS[image_format]
+            path = f"{prefix}/{name}-{width}w.{extension}"
+            output_file = os.path.join(static_folder, path)
+            _prepare(resized, image_format).save(output_file, format=image_format.upper(), **options)
+            derivatives.append({
+                'format': image_format,
+                'width': width,
+                'height': height,
+                'path': path,
+                'file_size': os.path.getsize(output_file)
+            })
+    return derivatives
+
+
+def record_derivatives(source_path, derivatives):
+    """
+    Replace the image_derivatives rows of one source (the caller commits)
+
+    Returns:
+        list: The new ImageDerivative rows
+    """
+    ImageDerivative.query.filter_by(source_path=source_path).delete()
+    rows = [ImageDerivative(source_path=source_path, **derivative) for derivative in derivatives]
+    db.session.add_all(rows)
+    return rows
+
+
+def delete_derivatives(source_path):
+    """
+    Delete the image_derivatives rows of a source whose original is gone (the caller commits)
+
+    Rows are deleted one by one through the session, so the image_derivatives
+    content version is bumped and every process drops its srcset snapshot.
+
+    Returns:
+        int: Number of rows deleted
+    """
+    rows = ImageDerivative.query.filter_by(source_path=source_path).all()
+    for row in rows:
+        db.session.delete(row)
+    return len(rows)
+
+
+def generate_derivatives(static_folder, source_path, widths=DERIVATIVE_WIDTHS, formats=None):
+    """
+    Write resized copies of an image and record them (the caller commits)
+
+    Existing derivatives of the same source are replaced.
+
+    Returns:
+        list: The new ImageDerivative rows
+    """
+    rows = record_derivatives(source_path, encode_derivatives(static_folder, source_path, widths, formats))
+    print(f"🖼️ [Images] {source_path}: {len(rows)} derivatives")
+    return rows
+
+
+def process_upload(static_folder, source_path):
+    """
+    Generate derivatives for a fresh upload without failing the upload itself
+
+    Returns:
+        list: The new ImageDerivative rows ([] if the file could not be processed)
+    """
+    try:
+        return generate_derivatives(static_folder, source_path)
+    except Exception as e:
+        print(f"⚠️ [Images] Could not create derivatives for {source_path}: {e}")
+        return []
+
+
+def _load_snapshot(version):
+    rows = db.session.query(
+        ImageDerivative.source_path, ImageDerivative.format, ImageDerivative.width, ImageDerivative.path
+    ).order_by(ImageDerivative.width).all()
+    by_source = {}
+    for source_path, image_format, width, path in rows:
+        by_source.setdefault(source_path, {}).setdefault(image_format, []).append((width, path))
+    return version, {
+        source: {image_format: tuple(entries) for image_format, entries in formats.items()}
+        for source, formats in by_source.items()
+    }
+
+
+def get_derivatives(source_path):
+    """
+    Derivatives of one image, from a per-process snapshot of image_derivatives
+
+    Returns:
+        dict: format -> ((width, path), ...) in ascending width; {} if there are none
+    """
+    global _snapshot
+
+    version = get_content_version('image_derivatives')[0]
+    snapshot = _snapshot
+    if snapshot is None or snapshot[0] != version:
+        snapshot = _load_snapshot(version)
+        with _snapshot_lock:
+            _snapshot = snapshot
+    return snapshot[1].get(source_path, {})
+
+
+def invalidate_image_derivatives():
+    """Drop this process's derivative snapshot"""
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
+
+
+def srcset(source_path, image_format='jpeg'):
+    """srcset attribute value for one format, e.g. '/static/...-480w.jpg 480w, ...'; '' if none"""
+    entries = get_derivatives(source_path).get(image_format, ())
+    return ', '.join(f"{url_for('static', filename=path)} {width}w" for width, path in entries)
+
+
+def image_sources(source_path):
+    """
+    <source> entries for a <picture>, best format first (the <img> keeps the JPEG srcset)
+
+    Returns:
+        list: dicts with 'type' and 'srcset'
+    """
+    derivatives = get_derivatives(source_path)
+    return [
+        {'type': FORMATS[image_format][1], 'srcset': srcset(source_path, image_format)}
+        for image_format in FORMATS
+        if image_format != 'jpeg' and image_format in derivatives
+    ]
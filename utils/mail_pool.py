@@ -0,0 +1,192 @@
+"""
+Pooled SMTP transport for Flask-Mail
+Keeps a few authenticated SMTP sessions open and reuses them across sends, instead of
+paying for a TCP + STARTTLS + AUTH handshake on every message
+"""
+
+import atexit
+import smtplib
+import threading
+import time
+from collections import deque
+
+from flask import current_app
+from flask_mail import Connection, Mail
+
+DEFAULT_POOL_SIZE = 2  # Open SMTP sessions per process
+DEFAULT_MAX_IDLE_SECONDS = 120  # Close sessions idle longer than this; servers drop them anyway
+PROBE_AFTER_SECONDS = 10  # NOOP a session idle longer than this before reusing it
+
+# Errors that mean the session is unusable and should be replaced
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, TimeoutError)
+
+
+class SMTPConnectionPool:
+    """Bounded pool of logged-in smtplib sessions for one Flask-Mail configuration"""
+
+    def __init__(self, mail_state, size=DEFAULT_POOL_SIZE, max_idle=DEFAULT_MAX_IDLE_SECONDS, timeout=None):
+        self.mail_state = mail_state
+        self.size = size
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self._idle = deque()  # (host, last_used), most recently used on the right
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self.opened = 0  # Sessions opened so far, for logging and tests
+
+    def open_host(self):
+        """Open and authenticate a new session (Flask-Mail's host setup, plus a socket timeout)"""
+        mail = self.mail_state
+        smtp_class = smtplib.SMTP_SSL if mail.use_ssl else smtplib.SMTP
+        if self.timeout:
+            host = smtp_class(mail.server, mail.port, timeout=self.timeout)
+        else:
+            host = smtp_class(mail.server, mail.port)
+        host.set_debuglevel(int(mail.debug))
+        if mail.use_tls:
+            host.starttls()
+        if mail.username and mail.password:
+            host.login(mail.username, mail.password)
+
+        self.opened += 1
+        print(f"📧 [Mail] Opened pooled SMTP session to {mail.server}:{mail.port}")
+        return host
+
+    def acquire(self):
+        """Borrow a live session, opening one if none is idle; blocks while all are in use"""
+        self._slots.acquire()
+        try:
+            while True:
+                with self._lock:
+                    item = self._idle.pop() if self._idle else None
+                if item is None:
+                    return self.open_host()
+
+                host, last_used = item
+                idle_for = time.monotonic() - last_used
+                if idle_for > self.max_idle or (idle_for > PROBE_AFTER_SECONDS and not self._is_alive(host)):
+                    self._close(host)
+                    continue
+                return host
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, host):
+        """Return a healthy session for reuse"""
+        with self._lock:
+            self._idle.append((host, time.monotonic()))
+        self._slots.release()
+
+    def discard(self, host):
+        """Drop a broken session and free its slot"""
+        self._close(host)
+        self._slots.release()
+
+    def close_all(self):
+        """QUIT every idle session (called at exit)"""
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for host, _ in idle:
+            self._close(host)
+
+    @staticmethod
+    def _is_alive(host):
+        try:
+            return host.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    @staticmethod
+    def _close(host):
+        try:
+            host.quit()
+        except (smtplib.SMTPException, OSError):
+            host.close()
+
+
+class PooledConnection(Connection):
+    """Flask-Mail connection that borrows its session from the pool instead of opening one"""
+
+    def __init__(self, mail_state, pool):
+        super().__init__(mail_state)
+        self.pool = pool
+
+    def __enter__(self):
+        self.host = None if self.mail.suppress else self.pool.acquire()
+        self.num_emails = 0
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if self.host is None:
+            return
+        if exc_type is not None and issubclass(exc_type, CONNECTION_ERRORS + (smtplib.SMTPResponseException,)):
+            self.pool.discard(self.host)
+        else:
+            self.pool.release(self.host)
+        self.host = None
+
+    def configure_host(self):
+        # Flask-Mail reconnects here after MAIL_MAX_EMAILS messages
+        return self.pool.open_host()
+
+
+class PooledMail(Mail):
+    """
+    Drop-in Flask-Mail extension backed by an SMTPConnectionPool
+
+    `send()` reuses a pooled session and `send_batch()` sends several messages over
+    one session (the outbox worker batches the emails it claims). A message that hits
+    a dropped session is retried once on a fresh one.
+    """
+
+    def init_app(self, app):
+        state = super().init_app(app)
+        pool = SMTPConnectionPool(
+            state,
+            size=app.config.get('MAIL_POOL_SIZE', DEFAULT_POOL_SIZE),
+            max_idle=app.config.get('MAIL_POOL_MAX_IDLE_SECONDS', DEFAULT_MAX_IDLE_SECONDS),
+            timeout=app.config.get('MAIL_TIMEOUT')
+        )
+        app.extensions['mail_pool'] = pool
+        atexit.register(pool.close_all)
+        return state
+
+    def connect(self):
+        app = getattr(self, 'app', None) or current_app
+        return PooledConnection(app.extensions['mail'], app.extensions['mail_pool'])
+
+    def send(self, message):
+        error = self.send_batch([message])[0]
+        if error:
+            raise error
+
+    def send_batch(self, messages):
+        """
+        Send messages in order over one pooled session
+
+        A message the server rejects (e.g. a refused recipient) doesn't stop the batch.
+
+        Returns:
+            list: One outcome per message, in order: None if sent, else the exception
+        """
+        errors = [None] * len(messages)
+        pending = deque(range(len(messages)))
+        for attempt in (1, 2):
+            try:
+                with self.connect() as connection:
+                    while pending:
+                        try:
+                            messages[pending[0]].send(connection)
+                        except CONNECTION_ERRORS:
+                            raise
+                        except Exception as e:
+                            errors[pending[0]] = e
+                        pending.popleft()
+                return errors
+            except CONNECTION_ERRORS as e:
+                if attempt == 2:
+                    for index in pending:
+                        errors[index] = e
+                    return errors
+                print(f"⚠️ [Mail] SMTP session dropped ({e}), reconnecting")
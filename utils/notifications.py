@@ -0,0 +1,372 @@
+"""
+Durable notification outbox
+Emails and SMS are written to the notification_outbox table and delivered by a bounded
+worker pool with exponential-backoff retries, so they survive restarts and never tie up
+the request that created them. Claimed emails go out in batches over one pooled SMTP session
+"""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+
+from flask_mail import Message
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from db import db
+from db.models import NotificationJob
+
+DEFAULT_WORKERS = 4  # Concurrent deliveries per process
+DEFAULT_BATCH_SIZE = 10  # Emails sent over one pooled SMTP session per delivery
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_RETRY_BASE_SECONDS = 30  # Retry delays: 30 s, 60 s, 120 s, ...
+DEFAULT_POLL_SECONDS = 15  # Fallback poll for retries and jobs left by other processes
+CLAIM_SECONDS = 300  # A claimed job is handed to another worker if not finished by then
+
+
+def enqueue_notification(dedup_key, channel, payload):
+    """
+    Add a message to the outbox in the current transaction (the caller commits)
+
+    Enqueueing the same dedup_key twice is a no-op, so retried requests and
+    repeated calls never produce duplicate messages.
+
+    Returns:
+        bool: True if a new job was added, False if the key was already queued
+    """
+    stmt = sqlite_insert(NotificationJob.__table__).values(
+        dedup_key=dedup_key,
+        channel=channel,
+        payload=json.dumps(payload),
+        status='pending',
+        attempts=0,
+        next_attempt_at=datetime.utcnow(),
+        created_at=datetime.utcnow()
+    ).on_conflict_do_nothing(index_elements=['dedup_key'])
+    return db.session.execute(stmt).rowcount == 1
+
+
+def enqueue_email(dedup_key, subject, recipients, body, sender=None):
+    """Queue an email; sender defaults to MAIL_DEFAULT_SENDER at delivery time"""
+    return enqueue_notification(dedup_key, 'email', {
+        'subject': subject,
+        'recipients': list(recipients),
+        'body': body,
+        'sender': sender
+    })
+
+
+def enqueue_sms(dedup_key, to_number, message):
+    """Queue an SMS"""
+    return enqueue_notification(dedup_key, 'sms', {'to_number': to_number, 'message': message})
+
+
+def get_notification_statuses(dedup_keys):
+    """
+    Look up delivery progress for the given dedup keys (unique-index lookups only)
+
+    Returns:
+        dict: dedup_key -> {'status', 'attempts', 'sent_at'}; keys never enqueued are omitted
+    """
+    table = NotificationJob.__table__
+    rows = db.session.execute(
+        select(table.c.dedup_key, table.c.status, table.c.attempts, table.c.sent_at)
+        .where(table.c.dedup_key.in_(list(dedup_keys)))
+    ).all()
+    return {
+        row.dedup_key: {
+            'status': row.status,
+            'attempts': row.attempts,
+            'sent_at': row.sent_at.isoformat() if row.sent_at else None
+        }
+        for row in rows
+    }
+
+
+def _email_message(app, payload):
+    return Message(
+        subject=payload['subject'],
+        recipients=payload['recipients'],
+        sender=payload.get('sender') or app.config.get('MAIL_DEFAULT_SENDER'),
+        body=payload['body']
+    )
+
+
+def _send_email(app, payload):
+    app.mail.send(_email_message(app, payload))
+
+
+def _send_email_batch(app, payloads):
+    return app.mail.send_batch([_email_message(app, payload) for payload in payloads])
+
+
+def _send_sms(app, payload):
+    from routes.send_sms import send_sms_reminder
+
+    if not send_sms_reminder(payload['to_number'], payload['message']):
+        raise RuntimeError(f"SMS to {payload['to_number']} was not sent")
+
+
+# Channel -> delivery function(app, payload); raising means "retry later"
+SENDERS = {
+    'email': _send_email,
+    'sms': _send_sms,
+}
+
+# Sender -> its batch version, function(app, payloads) returning one exception (or None
+# when sent) per payload. Channels whose sender has none are delivered a job at a time
+BATCH_SENDERS = {
+    _send_email: _send_email_batch,
+}
+
+
+def _due_condition(now):
+    table = NotificationJob.__table__
+    return or_(
+        and_(table.c.status == 'pending', table.c.next_attempt_at <= now),
+        and_(table.c.status == 'sending', table.c.locked_until < now)
+    )
+
+
+def claim_due_jobs(limit, now=None):
+    """
+    Atomically claim up to `limit` due jobs for this worker
+
+    Each claim is a conditional UPDATE, so concurrent workers and processes
+    never deliver the same job at the same time.
+
+    Returns:
+        list: Claimed job ids
+    """
+    now = now or datetime.utcnow()
+    table = NotificationJob.__table__
+
+    candidates = db.session.execute(
+        select(table.c.id).where(_due_condition(now)).order_by(table.c.next_attempt_at).limit(limit)
+    ).scalars().all()
+
+    claimed = []
+    for job_id in candidates:
+        result = db.session.execute(
+            update(table)
+            .where(table.c.id == job_id, _due_condition(now))
+            .values(status='sending', locked_until=now + timedelta(seconds=CLAIM_SECONDS))
+        )
+        if result.rowcount == 1:
+            claimed.append(job_id)
+    db.session.commit()
+    return claimed
+
+
+def _claimed_job(job_id):
+    job = db.session.get(NotificationJob, job_id)
+    return job if job and job.status == 'sending' else None
+
+
+def deliver_job(app, job_id):
+    """
+    Send one claimed job and record the outcome
+
+    Failures are retried with exponential backoff until the attempt limit,
+    after which the job is marked failed.
+
+    Returns:
+        bool: True if the message was sent
+    """
+    job = _claimed_job(job_id)
+    if not job:
+        return False
+
+    try:
+        SENDERS[job.channel](app, json.loads(job.payload))
+    except Exception as e:
+        return _record_outcome(app, job, e)
+    return _record_outcome(app, job, None)
+
+
+def deliver_batch(app, job_ids):
+    """
+    Send claimed jobs of one channel in one call to its batch sender (e.g. emails
+    over one SMTP session) and record each outcome, as deliver_job() does
+
+    Returns:
+        int: Number of messages sent
+    """
+    jobs = [job for job in map(_claimed_job, job_ids) if job]
+    if not jobs:
+        return 0
+
+    try:
+        errors = BATCH_SENDERS[SENDERS[jobs[0].channel]](app, [json.loads(job.payload) for job in jobs])
+    except Exception as e:
+        errors = [e] * len(jobs)
+    return sum(1 for job, error in zip(jobs, errors) if _record_outcome(app, job, error))
+
+
+def _record_outcome(app, job, error):
+    """Mark a delivered job sent, or schedule its retry; returns True if it was sent"""
+    if error is not None:
+        job.attempts += 1
+        job.last_error = f"{type(error).__name__}: {error}"
+        job.locked_until = None
+        max_attempts = app.config.get('NOTIFICATION_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS)
+        if job.attempts >= max_attempts:
+            job.status = 'failed'
+            print(f"❌ [Outbox] Giving up on {job.dedup_key} after {job.attempts} attempts: {error}")
+        else:
+            base = app.config.get('NOTIFICATION_RETRY_BASE_SECONDS', DEFAULT_RETRY_BASE_SECONDS)
+            job.status = 'pending'
+            job.next_attempt_at = datetime.utcnow() + timedelta(seconds=base * 2 ** (job.attempts - 1))
+            print(f"⚠️ [Outbox] {job.dedup_key} failed (attempt {job.attempts}), retrying at {job.next_attempt_at}: {error}")
+        db.session.commit()
+        return False
+
+    job.attempts += 1
+    job.status = 'sent'
+    job.sent_at = datetime.utcnow()
+    job.locked_until = None
+    job.last_error = None
+    db.session.commit()
+    print(f"✅ [Outbox] Sent {job.dedup_key}")
+    return True
+
+
+def delivery_tasks(job_ids, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Split claimed jobs into units of delivery
+
+    Returns:
+        list: (job ids, batched) pairs; jobs of channels with a batch sender come in
+            groups of up to batch_size, every other job on its own
+    """
+    table = NotificationJob.__table__
+    channels = dict(db.session.execute(
+        select(table.c.id, table.c.channel).where(table.c.id.in_(list(job_ids)))
+    ).all())
+
+    tasks = []
+    batches = {}
+    for job_id in job_ids:
+        channel = channels.get(job_id)
+        if SENDERS.get(channel) not in BATCH_SENDERS:
+            tasks.append(([job_id], False))
+            continue
+        batch = batches.setdefault(channel, [])
+        batch.append(job_id)
+        if len(batch) == batch_size:
+            tasks.append((batch, True))
+            batches[channel] = []
+    tasks.extend((batch, True) for batch in batches.values() if batch)
+    return tasks
+
+
+def deliver_task(app, job_ids, batched):
+    """Deliver one delivery_tasks() entry; returns the number of messages sent"""
+    if batched:
+        return deliver_batch(app, job_ids)
+    return sum(1 for job_id in job_ids if deliver_job(app, job_id))
+
+
+def drain_outbox(app, limit=100):
+    """
+    Deliver due jobs synchronously in the calling thread
+
+    Useful for scripts, tests and manual retries.
+
+    Returns:
+        int: Number of messages sent
+    """
+    sent = 0
+    with app.app_context():
+        while True:
+            job_ids = claim_due_jobs(limit)
+            if not job_ids:
+                return sent
+            batch_size = app.config.get('NOTIFICATION_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+            for task_ids, batched in delivery_tasks(job_ids, batch_size):
+                sent += deliver_task(app, task_ids, batched)
+
+
+class NotificationWorker:
+    """Background dispatcher feeding due outbox jobs to a fixed-size thread pool"""
+
+    def __init__(self, app, max_workers=DEFAULT_WORKERS, poll_seconds=DEFAULT_POLL_SECONDS,
+                 batch_size=DEFAULT_BATCH_SIZE):
+        self.app = app
+        self.max_workers = max_workers
+        self.poll_seconds = poll_seconds
+        self.batch_size = batch_size
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='notification')
+        self._thread = threading.Thread(target=self._run, name='notification-dispatcher', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        print(f"📬 Notification worker started ({self.max_workers} senders)")
+
+    def wake(self):
+        """Check the outbox now instead of at the next poll"""
+        self._wake.set()
+
+    def stop(self, timeout=None):
+        """Stop polling and wait for in-flight deliveries to finish"""
+        self._stopped.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        self._pool.shutdown(wait=True)
+
+    def _deliver(self, job_ids, batched):
+        with self.app.app_context():
+            try:
+                deliver_task(self.app, job_ids, batched)
+            finally:
+                db.session.remove()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.clear()
+            try:
+                with self.app.app_context():
+                    # Enough for every sender to get a full email batch
+                    job_ids = claim_due_jobs(self.max_workers * self.batch_size)
+                    tasks = delivery_tasks(job_ids, self.batch_size)
+                    db.session.remove()
+            except Exception as e:
+                print(f"❌ [Outbox] Failed to claim jobs: {e}")
+                tasks = []
+
+            if tasks:
+                wait([self._pool.submit(self._deliver, job_ids, batched) for job_ids, batched in tasks])
+                continue  # A full claim may mean more are due
+
+            self._wake.wait(self.poll_seconds)
+
+
+def init_notifications(app):
+    """
+    Start the outbox worker for this process unless disabled (e.g. under tests)
+
+    Called by the server entry points only (flask_app.py, start_server.py, start_app.py):
+    scripts and migrations that build the app must never deliver messages.
+    """
+    if app.testing or not app.config.get('NOTIFICATION_WORKER_ENABLED', True):
+        return None
+
+    worker = NotificationWorker(
+        app,
+        max_workers=app.config.get('NOTIFICATION_WORKERS', DEFAULT_WORKERS),
+        poll_seconds=app.config.get('NOTIFICATION_POLL_SECONDS', DEFAULT_POLL_SECONDS),
+        batch_size=app.config.get('NOTIFICATION_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    )
+    app.extensions['notification_worker'] = worker
+    worker.start()
+    return worker
+
+
+def wake_notification_worker(app):
+    """Tell this process's worker that new jobs were committed"""
+    worker = app.extensions.get('notification_worker')
+    if worker:
+        worker.wake()
@@ -0,0 +1,82 @@
+"""
+Rendered page cache
+Keeps fully rendered pages (plain and gzip-compressed) keyed by page and content
+versions, and answers with strong ETags so repeat visitors get 304s
+"""
+
+import gzip
+import threading
+
+from flask import make_response, request
+from werkzeug.http import generate_etag
+
+from utils.content_versions import get_content_versions
+
+GZIP_LEVEL = 6
+
+
+class CachedPage:
+    """One rendered page in both encodings, with a strong ETag for each"""
+
+    __slots__ = ('versions', 'body', 'etag', 'gzip_body', 'gzip_etag')
+
+    def __init__(self, versions, html):
+        self.versions = versions
+        self.body = html.encode('utf-8')
+        self.etag = generate_etag(self.body)
+        self.gzip_body = gzip.compress(self.body, GZIP_LEVEL, mtime=0)
+        self.gzip_etag = f"{self.etag}-gzip"  # A different encoding is a different representation
+
+
+# key -> CachedPage
+_pages = {}
+_lock = threading.Lock()
+
+
+def get_cached_page(key, version_names, render):
+    """
+    Return the cached page for `key`, re-rendering it if any content version changed
+
+    Args:
+        key: Hashable cache key, e.g. ('home', 'ENG')
+        version_names: content_versions names the page depends on
+        render: Callable returning the page HTML
+
+    Returns:
+        CachedPage
+    """
+    # Read the versions before rendering, so a concurrent edit can only make the page look stale
+    versions = get_content_versions(version_names)
+    page = _pages.get(key)
+    if page is None or page.versions != versions:
+        page = CachedPage(versions, render())
+        with _lock:
+            _pages[key] = page
+    return page
+
+
+def cached_page_response(page):
+    """Serve a CachedPage for the current request, negotiating gzip and honouring If-None-Match"""
+    if request.accept_encodings['gzip']:
+        body, etag, encoding = page.gzip_body, page.gzip_etag, 'gzip'
+    else:
+        body, etag, encoding = page.body, page.etag, None
+
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+    else:
+        response = make_response(body)
+        response.content_type = 'text/html; charset=utf-8'
+        if encoding:
+            response.content_encoding = encoding
+
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    response.cache_control.no_cache = True  # Always revalidate; edits must show up at once
+    return response
+
+
+def invalidate_page_cache():
+    """Drop every cached page in this process"""
+    with _lock:
+        _pages.clear()
@@ -0,0 +1,144 @@
+"""
+SMS reminder dispatcher
+Queues reminders for each configured stage (e.g. 24 h, 2 h and 30 min before) into the
+notification outbox. The outbox's unique dedup_key is the per-booking reminder state, so
+overlapping runs and multiple processes can never queue, and therefore never send, the
+same reminder twice
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import String, cast, func, literal, or_, select
+from sqlalchemy.orm import load_only
+
+from db import db
+from db.models import Booking, NotificationJob
+from routes.send_sms import format_booking_reminder_sms, get_sms_status
+from utils.notifications import enqueue_sms, wake_notification_worker
+from utils.slot_occupancy import INACTIVE_STATUSES
+
+DEFAULT_REMINDER_OFFSETS = (1440, 120, 30)  # Minutes before the appointment
+REMINDER_KEY_TIME_FORMAT = '%Y%m%d%H%M'
+
+
+def get_reminder_offsets(app):
+    """Configured reminder offsets in minutes, largest first"""
+    offsets = app.config.get('REMINDER_OFFSETS_MINUTES') or DEFAULT_REMINDER_OFFSETS
+    return sorted({int(offset) for offset in offsets}, reverse=True)
+
+
+def reminder_fire_time(start_time, offset, created_at=None):
+    """
+    When the `offset` reminder for a booking is due, or None if it never is
+
+    A stage that had already passed when the booking was made is skipped; the
+    booking confirmation covers it.
+    """
+    fire_time = start_time - timedelta(minutes=offset)
+    if created_at and fire_time < created_at:
+        return None
+    return fire_time
+
+
+def reminder_dedup_key(booking_id, offset, start_time):
+    """
+    Outbox key for one reminder stage of a booking
+
+    The start time is part of the key, so a rescheduled booking gets fresh reminders.
+    """
+    return f"booking:{booking_id}:reminder:{offset}:{start_time.strftime(REMINDER_KEY_TIME_FORMAT)}:sms"
+
+
+def _reminder_dedup_key_sql(offset):
+    """The same key as reminder_dedup_key(), computed in SQL for the NOT EXISTS check"""
+    return (
+        literal('booking:') + cast(Booking.id, String) + f':reminder:{offset}:'
+        + func.strftime(REMINDER_KEY_TIME_FORMAT, Booking.start_time) + ':sms'
+    )
+
+
+def select_due_reminders(offset, next_offset=0, now=None):
+    """
+    Bookings whose `offset` reminder is due and not yet queued
+
+    A booking is due for this stage once its fire time has passed, until the
+    next (shorter) stage takes over at `next_offset`, so a run that is late or
+    skipped sends only the most recent stage. The start_time range uses
+    ix_booking_start_time_end_time and the "already queued" check is a
+    unique-index lookup on notification_outbox.dedup_key.
+    """
+    now = now or datetime.utcnow()
+    outbox = NotificationJob.__table__
+    already_queued = select(outbox.c.id).where(outbox.c.dedup_key == _reminder_dedup_key_sql(offset)).exists()
+
+    return Booking.query.options(
+        load_only(Booking.id, Booking.user_name, Booking.phone_number, Booking.start_time)
+    ).filter(
+        Booking.start_time > now + timedelta(minutes=next_offset),
+        Booking.start_time <= now + timedelta(minutes=offset),
+        Booking.status.notin_(INACTIVE_STATUSES),
+        Booking.phone_number.isnot(None),
+        Booking.phone_number != '',
+        or_(Booking.created_at.is_(None),
+            Booking.created_at <= func.datetime(Booking.start_time, f'-{offset} minutes')),
+        ~already_queued
+    ).order_by(Booking.start_time).all()
+
+
+def dispatch_due_reminders(app, now=None):
+    """
+    Queue every due reminder stage and wake the notification worker
+
+    Sending happens on the outbox's bounded worker pool with retries, so this
+    returns quickly however many bookings the day has.
+
+    Returns:
+        int: Number of reminders newly queued by this run
+    """
+    with app.app_context():
+        if not get_sms_status()['client_configured']:
+            print("Twilio client not configured. Skipping reminder check.")
+            return 0
+
+        offsets = get_reminder_offsets(app)
+        queued = 0
+        for offset, next_offset in zip(offsets, offsets[1:] + [0]):
+            for booking in select_due_reminders(offset, next_offset, now):
+                message = format_booking_reminder_sms(booking.user_name, booking.start_time)
+                key = reminder_dedup_key(booking.id, offset, booking.start_time)
+                if enqueue_sms(key, booking.phone_number, message):
+                    queued += 1
+        db.session.commit()
+
+        if queued:
+            print(f"📋 [Reminders] Queued {queued} reminders")
+            wake_notification_worker(app)
+        return queued
+
+
+def load_upcoming_reminders(app, now=None, horizon=timedelta(days=2)):
+    """
+    Fire times of every reminder stage for bookings starting within the horizon
+
+    Returns:
+        list: (fire_time, booking_id, offset) tuples, for ReminderScheduler's heap
+    """
+    now = now or datetime.utcnow()
+    offsets = get_reminder_offsets(app)
+    rows = db.session.execute(
+        select(Booking.id, Booking.start_time, Booking.created_at).where(
+            Booking.start_time > now,
+            Booking.start_time <= now + horizon + timedelta(minutes=offsets[0]),
+            Booking.status.notin_(INACTIVE_STATUSES),
+            Booking.phone_number.isnot(None),
+            Booking.phone_number != ''
+        )
+    ).all()
+
+    entries = []
+    for row in rows:
+        for offset in offsets:
+            fire_time = reminder_fire_time(row.start_time, offset, row.created_at)
+            if fire_time:
+                entries.append((fire_time, row.id, offset))
+    return entries
@@ -1,35 +1,126 @@
 """
-Background scheduler setup for SMS reminders
+Background scheduler for SMS reminders
+Keeps the upcoming reminder fire times in a heap and sleeps exactly until the next one,
+instead of polling the database every few minutes
 """
 
-from routes.send_sms import check_and_send_reminders
+import heapq
+import threading
+from datetime import datetime, timedelta
 
+from utils.reminders import dispatch_due_reminders, get_reminder_offsets, load_upcoming_reminders, reminder_fire_time
+from utils.slot_occupancy import INACTIVE_STATUSES
 
-def create_scheduler_function(app):
-    """Create a scheduler function with app context"""
-    
-    def check_and_send_reminders_with_context():
-        """Check for bookings that need reminders and send SMS"""
-        from db.models import Booking
-        check_and_send_reminders(app, Booking)
-    
-    return check_and_send_reminders_with_context
+REPLAN_SECONDS = 3600  # Reload the heap at least this often (picks up admin edits)
+PLAN_HORIZON = timedelta(days=2)  # How far past the largest offset to look for bookings
+RETRY_SECONDS = 60  # Back-off after an unexpected error
+
+
+class ReminderScheduler:
+    """Heap-driven reminder thread; booking routes call notify() so it wakes or re-plans"""
+
+    def __init__(self, app, replan_seconds=REPLAN_SECONDS, horizon=PLAN_HORIZON):
+        self.app = app
+        self.replan_seconds = replan_seconds
+        self.horizon = horizon
+        self._heap = []  # (fire_time, booking_id, offset)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._needs_replan = True
+        self._next_replan = None
+        self._thread = threading.Thread(target=self._run, name='reminder-scheduler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        print(f"📅 SMS reminder scheduler started - offsets {get_reminder_offsets(self.app)} minutes")
+
+    def stop(self, timeout=None):
+        self._stopped.set()
+        self._wake.set()
+        self._thread.join(timeout)
+
+    def notify(self, booking=None):
+        """
+        Tell the scheduler a booking was added, cancelled or moved
+
+        New active bookings are pushed straight onto the heap; anything else
+        (cancellations, unknown changes) triggers a re-plan from the database.
+        """
+        if booking is not None and booking.status not in INACTIVE_STATUSES and booking.phone_number:
+            with self._lock:
+                for offset in get_reminder_offsets(self.app):
+                    fire_time = reminder_fire_time(booking.start_time, offset, booking.created_at)
+                    if fire_time:
+                        heapq.heappush(self._heap, (fire_time, booking.id, offset))
+        else:
+            self._needs_replan = True
+        self._wake.set()
+
+    def next_fire_time(self):
+        with self._lock:
+            return self._heap[0][0] if self._heap else None
+
+    def replan(self, now):
+        """Rebuild the heap from the bookings table"""
+        entries = load_upcoming_reminders(self.app, now, self.horizon)
+        heapq.heapify(entries)
+        with self._lock:
+            self._heap = entries
+        self._needs_replan = False
+        self._next_replan = now + timedelta(seconds=self.replan_seconds)
+
+    def run_once(self, now=None):
+        """
+        Dispatch whatever is due and work out how long to sleep
+
+        Returns:
+            float: Seconds until the next fire time or re-plan
+        """
+        now = now or datetime.utcnow()
+        if self._needs_replan or now >= self._next_replan:
+            self.replan(now)
+
+        due = 0
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                heapq.heappop(self._heap)
+                due += 1
+        if due:
+            # The heap only says when to look; the database decides what is sent
+            dispatch_due_reminders(self.app, now)
+
+        next_time = min(filter(None, [self.next_fire_time(), self._next_replan]))
+        return max((next_time - now).total_seconds(), 0)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.clear()
+            try:
+                with self.app.app_context():
+                    delay = self.run_once()
+            except Exception as e:
+                print(f"❌ [Reminders] Scheduler error: {e}")
+                delay = RETRY_SECONDS
+            self._wake.wait(delay)
 
 
 def init_scheduler(app):
-    """Initialize the background scheduler for SMS reminders"""
+    """Start the reminder scheduler for this process"""
     try:
-        from apscheduler.schedulers.background import BackgroundScheduler
-        
-        scheduler = BackgroundScheduler()
-        reminder_function = create_scheduler_function(app)
-        scheduler.add_job(func=reminder_function, trigger="interval", minutes=5)
+        scheduler = ReminderScheduler(app)
+        app.extensions['reminder_scheduler'] = scheduler
         scheduler.start()
-        
-        print("📅 SMS reminder scheduler started - checking every 5 minutes")
         return scheduler
-        
+
     except Exception as e:
         print(f"❌ Failed to start scheduler: {e}")
         print("💡 Tip: Run the Flask app and use manual reminders instead")
         return None
+
+
+def notify_reminder_scheduler(app, booking=None):
+    """Let this process's reminder scheduler know a booking changed (no-op if none runs)"""
+    scheduler = app.extensions.get('reminder_scheduler')
+    if scheduler:
+        scheduler.notify(booking)
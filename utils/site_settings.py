@@ -1,38 +1,74 @@
 """
 Utility functions for site settings with language support
+Settings are served from a per-process snapshot that is rebuilt only when the
+'site_settings' content version changes
 """
 
+import threading
+from types import MappingProxyType
+
+from db import db
 from db.models import SiteSetting
+from utils.content_versions import get_content_version
+
+LANGUAGES = ['ENG', 'MON']
+
+# (content version, {language: read-only settings mapping}), built by _load_snapshot()
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def _load_snapshot(version):
+    """Read every setting in one query and build the merged mapping for each language"""
+    rows = db.session.query(SiteSetting.key, SiteSetting.value, SiteSetting.language).all()
+    by_language = {language: {} for language in LANGUAGES}
+    for key, value, language in rows:
+        if language in by_language:
+            by_language[language][key] = value
+    
+    snapshot = {}
+    for language, settings in by_language.items():
+        # English values fill any keys missing from other languages
+        merged = dict(by_language['ENG'])
+        merged.update(settings)
+        snapshot[language] = MappingProxyType(merged)
+    return version, snapshot
 
 
 def get_site_settings(language='ENG'):
     """
     Get site settings for a specific language with fallback to English
     
+    While settings are unchanged this costs one primary-key lookup of the
+    content version; other processes' edits are seen through that version.
+    
     Args:
         language (str): Language code ('ENG' or 'MON')
     
     Returns:
-        dict: Dictionary of setting key-value pairs
+        Mapping: Read-only mapping of setting key-value pairs
     """
-    if language not in ['ENG', 'MON']:
-        language = 'ENG'
+    global _snapshot
     
-    # Get settings for the requested language
-    site_settings = SiteSetting.query.filter_by(language=language).all()
-    settings = {setting.key: setting.value for setting in site_settings}
+    if language not in LANGUAGES:
+        language = 'ENG'
     
-    # If not English, get English settings as fallback
-    if language != 'ENG':
-        eng_settings = SiteSetting.query.filter_by(language='ENG').all()
-        eng_settings_dict = {setting.key: setting.value for setting in eng_settings}
-        
-        # Add English values for any missing keys
-        for key, value in eng_settings_dict.items():
-            if key not in settings:
-                settings[key] = value
+    # Read the version before the rows, so a concurrent edit can only make the snapshot look stale
+    version = get_content_version('site_settings')[0]
+    snapshot = _snapshot
+    if snapshot is None or snapshot[0] != version:
+        snapshot = _load_snapshot(version)
+        with _snapshot_lock:
+            _snapshot = snapshot
     
-    return settings
+    return snapshot[1][language]
+
+
+def invalidate_site_settings():
+    """Drop this process's settings snapshot (call after changing settings)"""
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
 
 
 def get_settings_by_language():
@@ -64,9 +100,7 @@ def create_or_update_setting(key, value, language='ENG', description=None):
     Returns:
         SiteSetting: The created or updated setting object
     """
-    from db import db
-    
-    if language not in ['ENG', 'MON']:
+    if language not in LANGUAGES:
         language = 'ENG'
     
     setting = SiteSetting.query.filter_by(key=key, language=language).first()
@@ -77,4 +111,5 @@ def create_or_update_setting(key, value, language='ENG', description=None):
         db.session.add(setting)
     
     setting.value = value
+    invalidate_site_settings()
     return setting
@@ -0,0 +1,193 @@
+"""
+Slot availability engine for the booking calendar
+Loads a day's bookings in one query and computes per-slot occupancy with a sweep-line,
+or indexes a whole date range for O(log n) occupancy lookups
+"""
+
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+from db.models import Booking
+from utils.slot_occupancy import get_slots_occupancy, SLOT_CAPACITY, INACTIVE_STATUSES
+
+MAX_RANGE_DAYS = 62  # Longest date range served by get_range_availability
+
+
+def day_slot_times(selected_date):
+    """
+    Get the bookable slot start times for a day (8:30 AM to 2:00 PM, 30-minute intervals)
+
+    Args:
+        selected_date (date): Day to generate slots for
+
+    Returns:
+        list: Slot start datetimes in ascending order
+    """
+    first_slot = datetime.combine(selected_date, datetime.min.time().replace(hour=8, minute=30))
+    return [first_slot + timedelta(minutes=30 * i) for i in range(12)]
+
+
+def load_overlapping_bookings(window_start, window_end):
+    """
+    Load every capacity-holding booking active at some point in [window_start, window_end]
+
+    Only the columns needed for occupancy are selected, in a single query.
+
+    Returns:
+        list: (start_time, end_time, num_people) tuples
+    """
+    rows = Booking.query.with_entities(
+        Booking.start_time, Booking.end_time, Booking.num_people
+    ).filter(
+        Booking.start_time <= window_end,
+        Booking.end_time > window_start,
+        Booking.status.notin_(INACTIVE_STATUSES)
+    ).all()
+    return [(row.start_time, row.end_time, row.num_people) for row in rows]
+
+
+def sweep_slot_occupancy(intervals, slot_times):
+    """
+    Compute occupancy at each slot time with a sweep over start/end events
+
+    A booking occupies a slot when start_time <= slot < end_time, which matches
+    the per-slot filter the booking routes have always used.
+
+    Args:
+        intervals (list): (start_time, end_time, num_people) tuples
+        slot_times (list): Slot datetimes in ascending order
+
+    Returns:
+        list: (total_people, booking_count) for each slot time
+    """
+    events = []
+    for start_time, end_time, num_people in intervals:
+        events.append((start_time, num_people, 1))
+        events.append((end_time, -num_people, -1))
+    events.sort(key=lambda event: event[0])
+
+    occupancy = []
+    total_people = 0
+    booking_count = 0
+    i = 0
+    for slot_time in slot_times:
+        # Apply every start and end that happened at or before this slot
+        while i < len(events) and events[i][0] <= slot_time:
+            total_people += events[i][1]
+            booking_count += events[i][2]
+            i += 1
+        occupancy.append((total_people, booking_count))
+
+    return occupancy
+
+
+class BookingIntervalIndex:
+    """
+    Static index over booking intervals answering occupancy-at-time queries
+
+    Start and end times are kept sorted alongside running totals of people,
+    so the occupancy at t is (everything started at or before t)
+    minus (everything ended at or before t): two binary searches per query.
+    """
+
+    def __init__(self, intervals):
+        starts = sorted((start_time, num_people) for start_time, _, num_people in intervals)
+        ends = sorted((end_time, num_people) for _, end_time, num_people in intervals)
+
+        self._start_times = [start_time for start_time, _ in starts]
+        self._end_times = [end_time for end_time, _ in ends]
+        self._start_people = self._running_totals(num_people for _, num_people in starts)
+        self._end_people = self._running_totals(num_people for _, num_people in ends)
+
+    @staticmethod
+    def _running_totals(values):
+        totals = [0]
+        for value in values:
+            totals.append(totals[-1] + value)
+        return totals
+
+    def __len__(self):
+        return len(self._start_times)
+
+    def occupancy_at(self, moment):
+        """
+        Get occupancy of bookings with start_time <= moment < end_time
+
+        Returns:
+            tuple: (total_people, booking_count)
+        """
+        started = bisect_right(self._start_times, moment)
+        ended = bisect_right(self._end_times, moment)
+        return self._start_people[started] - self._end_people[ended], started - ended
+
+
+def format_slot(slot_time, total_people, booking_count):
+    """Build the JSON payload for one slot as served by /booking/available-slots"""
+    return {
+        "time": slot_time.isoformat(),
+        "timeString": slot_time.strftime("%I:%M %p").lstrip('0'),
+        "totalPeople": total_people,
+        "availableSpots": max(0, SLOT_CAPACITY - total_people),
+        "isFullyBooked": total_people >= SLOT_CAPACITY,
+        "bookingCount": booking_count,  # Number of individual bookings
+        "available": True  # Always true - we still allow overbooking
+    }
+
+
+def get_day_availability(selected_date):
+    """
+    Get availability for every slot of a day using one database query
+
+    Reads the materialized slot_occupancy rows for the day's slots by primary key.
+
+    Args:
+        selected_date (date): Day to check
+
+    Returns:
+        list: Slot dictionaries in the /booking/available-slots JSON shape
+    """
+    slot_times = day_slot_times(selected_date)
+    occupancy = get_slots_occupancy(slot_times)
+
+    return [
+        format_slot(slot_time, *occupancy[slot_time])
+        for slot_time in slot_times
+    ]
+
+
+def get_range_availability(start_date, end_date):
+    """
+    Get availability for every slot of every day in [start_date, end_date]
+
+    All bookings touching the range are loaded in one query and indexed once;
+    each slot is then answered from the index without further queries.
+
+    Args:
+        start_date (date): First day of the range
+        end_date (date): Last day of the range (inclusive)
+
+    Returns:
+        list: One dictionary per day with summary counts and its slot list
+    """
+    first_slot = day_slot_times(start_date)[0]
+    last_slot = day_slot_times(end_date)[-1]
+    index = BookingIntervalIndex(load_overlapping_bookings(first_slot, last_slot))
+
+    days = []
+    current_date = start_date
+    while current_date <= end_date:
+        slots = []
+        for slot_time in day_slot_times(current_date):
+            total_people, booking_count = index.occupancy_at(slot_time)
+            slots.append(format_slot(slot_time, total_people, booking_count))
+
+        days.append({
+            "date": current_date.isoformat(),
+            "availableSpots": sum(slot["availableSpots"] for slot in slots),
+            "fullyBookedSlots": sum(1 for slot in slots if slot["isFullyBooked"]),
+            "isFullyBooked": all(slot["isFullyBooked"] for slot in slots),
+            "slots": slots
+        })
+        current_date += timedelta(days=1)
+
+    return days
@@ -0,0 +1,247 @@
+"""
+Materialized slot occupancy
+Keeps the slot_occupancy table in step with every Booking insert, update and delete,
+and reserves capacity for new bookings atomically
+"""
+
+from collections import Counter
+from datetime import timedelta
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from db import db
+from db.models import Booking, SlotOccupancy
+
+SLOT_MINUTES = 30  # Width of the slot grid the occupancy table is keyed on
+SLOT_CAPACITY = 10  # Maximum number of people per time slot
+INACTIVE_STATUSES = ('cancelled', 'waitlist')  # Bookings that do not hold capacity
+
+
+def _naive(moment):
+    """Drop tzinfo so keys match what SQLite stores for naive and aware datetimes alike"""
+    return moment.replace(tzinfo=None) if moment.tzinfo else moment
+
+
+def is_slot_aligned(moment):
+    """Check whether a datetime falls exactly on the slot grid"""
+    return moment.minute % SLOT_MINUTES == 0 and moment.second == 0 and moment.microsecond == 0
+
+
+def occupied_slot_times(start_time, end_time):
+    """
+    Get the grid slots a booking occupies (start_time <= slot < end_time)
+
+    Returns:
+        list: Slot start datetimes in ascending order
+    """
+    start_time, end_time = _naive(start_time), _naive(end_time)
+
+    slot = start_time.replace(minute=start_time.minute - start_time.minute % SLOT_MINUTES, second=0, microsecond=0)
+    if slot < start_time:
+        slot += timedelta(minutes=SLOT_MINUTES)
+
+    slots = []
+    while slot < end_time:
+        slots.append(slot)
+        slot += timedelta(minutes=SLOT_MINUTES)
+    return slots
+
+
+def get_slot_occupancy(slot_time):
+    """
+    Get occupancy of bookings active at slot_time
+
+    Grid-aligned times are a primary-key lookup on slot_occupancy; anything
+    else falls back to scanning the overlapping bookings.
+
+    Returns:
+        tuple: (total_people, booking_count)
+    """
+    slot_time = _naive(slot_time)
+
+    if is_slot_aligned(slot_time):
+        row = db.session.get(SlotOccupancy, slot_time)
+        return (row.total_people, row.booking_count) if row else (0, 0)
+
+    bookings = Booking.query.with_entities(Booking.num_people).filter(
+        Booking.start_time <= slot_time,
+        Booking.end_time > slot_time,
+        Booking.status.notin_(INACTIVE_STATUSES)
+    ).all()
+    return sum(b.num_people for b in bookings), len(bookings)
+
+
+def get_slots_occupancy(slot_times):
+    """
+    Get occupancy for many grid slots with one primary-key query
+
+    Returns:
+        dict: slot datetime -> (total_people, booking_count); missing slots are (0, 0)
+    """
+    slot_times = [_naive(slot_time) for slot_time in slot_times]
+    rows = SlotOccupancy.query.filter(SlotOccupancy.slot_start.in_(slot_times)).all()
+    occupancy = {row.slot_start: (row.total_people, row.booking_count) for row in rows}
+    return {slot_time: occupancy.get(slot_time, (0, 0)) for slot_time in slot_times}
+
+
+def _apply_deltas(session, people_deltas, count_deltas):
+    """Upsert additive changes into slot_occupancy on the session's connection"""
+    for slot_time in set(people_deltas) | set(count_deltas):
+        people, count = people_deltas[slot_time], count_deltas[slot_time]
+        if not people and not count:
+            continue
+
+        stmt = sqlite_insert(SlotOccupancy.__table__).values(
+            slot_start=slot_time, total_people=people, booking_count=count
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['slot_start'],
+            set_={
+                'total_people': SlotOccupancy.__table__.c.total_people + stmt.excluded.total_people,
+                'booking_count': SlotOccupancy.__table__.c.booking_count + stmt.excluded.booking_count,
+            }
+        )
+        session.execute(stmt)
+
+
+def _contribution(start_time, end_time, status, num_people):
+    """Get the (slots, people) a booking adds to occupancy, or None if it adds nothing"""
+    if status in INACTIVE_STATUSES or not start_time or not end_time:
+        return None
+    return occupied_slot_times(start_time, end_time), num_people
+
+
+def _committed_contribution(session, booking):
+    """
+    Contribution of a booking as it currently stands in the database
+
+    Read straight from the table: expired attributes that are reassigned keep
+    no record of their previous value in the ORM history.
+    """
+    table = Booking.__table__
+    row = session.execute(
+        select(table.c.start_time, table.c.end_time, table.c.status, table.c.num_people)
+        .where(table.c.id == booking.id)
+    ).one_or_none()
+    return _contribution(*row) if row else None
+
+
+def _track_booking_changes(session, flush_context, instances):
+    """before_flush hook: turn Booking changes into slot_occupancy deltas"""
+    people_deltas = Counter()
+    count_deltas = Counter()
+
+    def add(contribution, sign):
+        if not contribution:
+            return
+        slots, num_people = contribution
+        for slot_time in slots:
+            people_deltas[slot_time] += sign * num_people
+            count_deltas[slot_time] += sign
+
+    for obj in session.new:
+        if isinstance(obj, Booking):
+            # Column defaults are applied at INSERT time, after this hook runs
+            add(_contribution(obj.start_time, obj.end_time, obj.status or 'pending', obj.num_people or 1), 1)
+
+    for obj in session.dirty:
+        if isinstance(obj, Booking) and session.is_modified(obj):
+            add(_committed_contribution(session, obj), -1)
+            add(_contribution(obj.start_time, obj.end_time, obj.status, obj.num_people), 1)
+
+    for obj in session.deleted:
+        if isinstance(obj, Booking):
+            add(_committed_contribution(session, obj), -1)
+
+    if people_deltas or count_deltas:
+        _apply_deltas(session, people_deltas, count_deltas)
+
+
+def _begin_write_transaction():
+    """
+    Take SQLite's write lock before reading capacity
+
+    BEGIN IMMEDIATE makes concurrent reservations queue up behind each other,
+    so the capacity read and the insert that depends on it cannot interleave.
+    """
+    connection = db.session.connection()
+    if connection.dialect.name != 'sqlite':
+        return
+    if not connection.connection.dbapi_connection.in_transaction:
+        connection.exec_driver_sql('BEGIN IMMEDIATE')
+
+
+def reserve_booking(booking, capacity=SLOT_CAPACITY, before_commit=None):
+    """
+    Insert a booking, holding capacity only if every slot it covers has room
+
+    The capacity check and the insert run in one write transaction. A booking
+    that does not fit is still saved, with status 'waitlist', and holds no
+    capacity until an admin confirms it.
+
+    Args:
+        booking (Booking): New, unsaved booking
+        capacity (int): Maximum number of people per slot
+        before_commit (callable): Called with the flushed booking (id assigned) to add
+            rows that must commit with it, e.g. outbox notifications; if it raises,
+            the booking is rolled back too
+
+    Returns:
+        tuple: (fits, peak_people) where peak_people is the busiest slot's
+               total including this booking when it fits
+    """
+    try:
+        _begin_write_transaction()
+
+        slot_times = occupied_slot_times(booking.start_time, booking.end_time)
+        booked = [people for people, _ in get_slots_occupancy(slot_times).values()]
+        if not is_slot_aligned(_naive(booking.start_time)):
+            booked.append(get_slot_occupancy(booking.start_time)[0])
+        peak_people = max(booked, default=0)
+
+        fits = peak_people + booking.num_people <= capacity
+        booking.status = 'pending' if fits else 'waitlist'
+
+        db.session.add(booking)
+        if before_commit:
+            db.session.flush()
+            before_commit(booking)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    total_people = peak_people + booking.num_people if fits else peak_people
+    return fits, total_people
+
+
+def init_slot_occupancy():
+    """Register the Booking change tracker on the application session (idempotent)"""
+    if not event.contains(db.session, 'before_flush', _track_booking_changes):
+        event.listen(db.session, 'before_flush', _track_booking_changes)
+
+
+def rebuild_slot_occupancy():
+    """
+    Recompute slot_occupancy from scratch out of the booking table
+
+    Used to backfill existing databases; the caller commits.
+    """
+    people = Counter()
+    counts = Counter()
+    bookings = Booking.query.with_entities(
+        Booking.start_time, Booking.end_time, Booking.num_people
+    ).filter(Booking.status.notin_(INACTIVE_STATUSES)).all()
+
+    for booking in bookings:
+        for slot_time in occupied_slot_times(booking.start_time, booking.end_time):
+            people[slot_time] += booking.num_people
+            counts[slot_time] += 1
+
+    SlotOccupancy.query.delete()
+    db.session.add_all(
+        SlotOccupancy(slot_start=slot_time, total_people=people[slot_time], booking_count=counts[slot_time])
+        for slot_time in counts
+    )
+    return len(counts)
@@ -0,0 +1,135 @@
+"""
+Keyset pagination for published testimonials
+Pages are ordered newest first by (created_at, id) and continued with an opaque cursor,
+so every page costs one bounded index range scan however many testimonials exist.
+The JSON views shared by both testimonial blueprints live here too
+"""
+
+import base64
+
+from flask import jsonify, request, url_for
+from sqlalchemy import String, and_, or_, type_coerce
+
+from db import db
+from db.models import Testimonial
+
+TESTIMONIAL_PAGE_SIZE = 12
+MAX_TESTIMONIAL_PAGE_SIZE = 50
+
+# created_at compared as the stored text: server-side defaults have no microseconds,
+# so comparing against a bound datetime would not match the row itself
+_created_at_text = type_coerce(Testimonial.created_at, String)
+
+
+def encode_cursor(created_at_text, testimonial_id):
+    """Opaque cursor pointing just past a testimonial"""
+    return base64.urlsafe_b64encode(f"{created_at_text}|{testimonial_id}".encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Returns:
+        tuple: (created_at_text, id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at_text, testimonial_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit('|', 1)
+        return created_at_text, int(testimonial_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+
+def parse_page_size(value, default=TESTIMONIAL_PAGE_SIZE):
+    """Clamp a ?limit= value to 1..MAX_TESTIMONIAL_PAGE_SIZE"""
+    try:
+        return max(1, min(int(value), MAX_TESTIMONIAL_PAGE_SIZE))
+    except (TypeError, ValueError):
+        return default
+
+
+def get_testimonial_page(after=None, limit=TESTIMONIAL_PAGE_SIZE, featured_only=False):
+    """
+    One page of approved testimonials, newest first
+
+    Args:
+        after (str): Cursor from the previous page, or None for the first page
+        limit (int): Page size, or None for every remaining testimonial
+        featured_only (bool): Only featured testimonials
+
+    Returns:
+        tuple: (list of Testimonial, next cursor or None when this is the last page)
+    """
+    query = db.session.query(Testimonial, _created_at_text).filter(Testimonial.is_approved.is_(True))
+    if featured_only:
+        query = query.filter(Testimonial.is_featured.is_(True))
+
+    if after:
+        created_at_text, testimonial_id = decode_cursor(after)
+        query = query.filter(
+            _created_at_text <= created_at_text,
+            or_(_created_at_text < created_at_text,
+                and_(_created_at_text == created_at_text, Testimonial.id < testimonial_id))
+        )
+
+    query = query.order_by(Testimonial.created_at.desc(), Testimonial.id.desc())
+    if limit is None:
+        return [testimonial for testimonial, _ in query.all()], None
+
+    rows = query.limit(limit + 1).all()
+    testimonials = [testimonial for testimonial, _ in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last, last_created_at = rows[limit - 1]
+        next_cursor = encode_cursor(last_created_at, last.id)
+    return testimonials, next_cursor
+
+
+def serialize_testimonial(testimonial):
+    """JSON shape used by the testimonial API endpoints"""
+    return {
+        'id': testimonial.id,
+        'client_name': testimonial.client_name,
+        'client_title': testimonial.client_title or '',
+        'testimonial_text': testimonial.testimonial_text,
+        'rating': testimonial.rating,
+        'stars': testimonial.get_star_display(),
+        'is_featured': testimonial.is_featured,
+        'created_at': testimonial.created_at.strftime('%Y-%m-%d') if testimonial.created_at else None
+    }
+
+
+def testimonial_page_response(featured_only=False):
+    """
+    JSON list of approved testimonials for the /api/approved and /api/featured views
+
+    Every testimonial unless ?limit= or ?after= is given; then one keyset page,
+    with the next page's URL in the Link header.
+    """
+    paginated = 'limit' in request.args or 'after' in request.args
+    limit = parse_page_size(request.args.get('limit')) if paginated else None
+    try:
+        testimonials, next_cursor = get_testimonial_page(request.args.get('after'), limit, featured_only)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    response = jsonify([serialize_testimonial(t) for t in testimonials])
+    if next_cursor:
+        next_url = url_for(request.endpoint, after=next_cursor, limit=limit)
+        response.headers['Link'] = f'<{next_url}>; rel="next"'
+    return response
+
+
+def more_testimonials_response():
+    """JSON page ({'testimonials', 'next_cursor'}) for the home page carousel's /api/more views"""
+    try:
+        testimonials, next_cursor = get_testimonial_page(request.args.get('after'),
+                                                         parse_page_size(request.args.get('limit')))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify({
+        'testimonials': [serialize_testimonial(t) for t in testimonials],
+        'next_cursor': next_cursor
+    })